@@ -0,0 +1,76 @@
+"""
+Measure the memory held per Character and the cost of Character.get_stats.
+
+Run from the repository root:
+
+    python -m benchmarks.character_benchmark [--characters N]
+"""
+import gc
+import time
+import random
+import argparse
+import tracemalloc
+from typing import List
+
+from src.game.character import Character, CharacterClass, Skill
+
+
+CATALOG_SIZE = 5000
+
+
+def make_characters(count: int, seed: int = 0) -> List[Character]:
+    """Characters at various stages of progress, as a session server holds them."""
+    rng = random.Random(seed)
+    classes = list(CharacterClass)
+    skills = [skill.name for skill in Skill]
+    # Challenge names are shared with the loaded challenges of a large catalog
+    challenges = [f"Challenge {n}" for n in range(CATALOG_SIZE)]
+    characters = []
+    for i in range(count):
+        character = Character(f"Hero {i}", rng.choice(classes))
+        character.add_experience(rng.randint(0, 20000))
+        for challenge in rng.sample(challenges, rng.randint(0, 40)):
+            character.complete_challenge(challenge, skill=rng.choice(skills))
+        character.take_events()
+        characters.append(character)
+    return characters
+
+
+def measure_memory(count: int) -> float:
+    """Bytes allocated per character."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        characters = make_characters(count)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del characters
+    return used / count
+
+
+def measure_stats(characters: List[Character], rounds: int = 20) -> float:
+    """get_stats calls per second, best of several rounds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for character in characters:
+            character.get_stats()
+        best = min(best, time.perf_counter() - start)
+    return len(characters) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--characters", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{args.characters} characters")
+    print(f"{'bytes/character':<20}{measure_memory(args.characters):>12.0f}")
+    print(f"{'get_stats/s':<20}{measure_stats(make_characters(args.characters)):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare save formats: the original pretty-printed JSON against save_codec.
+
+Run from the repository root:
+
+    python -m benchmarks.save_codec_benchmark [--records N]
+"""
+import json
+import time
+import random
+import argparse
+from typing import Callable, Dict, Any, List
+
+from src.game import save_codec
+from src.game.character import Character, CharacterClass, Skill
+
+
+def make_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Save records of characters at various stages of progress."""
+    rng = random.Random(seed)
+    classes = list(CharacterClass)
+    records = []
+    for i in range(count):
+        character = Character(f"Hero {i}", rng.choice(classes))
+        character.add_experience(rng.randint(0, 20000))
+        for n in range(rng.randint(0, 40)):
+            character.complete_challenge(f"Challenge {n}", skill=rng.choice(list(Skill)).name)
+        record = character.to_dict()
+        record["timestamp"] = "2025-03-11T00:33:01.942370"
+        records.append(record)
+    return records
+
+
+def measure(records, encode: Callable, decode: Callable) -> Dict[str, float]:
+    """Time encoding and decoding every record once."""
+    start = time.perf_counter()
+    blobs = [encode(record) for record in records]
+    encoded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for blob in blobs:
+        decode(blob)
+    decoded = time.perf_counter() - start
+
+    return {
+        "bytes": sum(len(blob) for blob in blobs) / len(blobs),
+        "encode": len(records) / encoded,
+        "decode": len(records) / decoded
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    formats = {
+        "pretty JSON (old)": (
+            lambda record: json.dumps(record, indent=2).encode("utf-8"), json.loads),
+        "codec, JSON debug": (
+            lambda record: save_codec.encode(record, debug=True), save_codec.decode),
+        "codec, binary": (save_codec.encode, save_codec.decode),
+    }
+
+    print(f"{args.records} records")
+    print(f"{'format':<20}{'bytes/record':>14}{'encode/s':>12}{'decode/s':>12}")
+    for name, (encode, decode) in formats.items():
+        result = measure(records, encode, decode)
+        print(f"{name:<20}{result['bytes']:>14.0f}{result['encode']:>12.0f}{result['decode']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+from typing import Dict, List, Any, Iterable, Iterator, Optional, BinaryIO, TextIO
+import json
+import struct
+
+from src.ai.output_capture import CapturedOutput
+
+
+# Bump when fields are added so readers can still decode older records
+SCHEMA_VERSION = 2
+
+_NONE_LENGTH = 0xFFFFFFFF
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_RESULT_HEADER = struct.Struct("<BBdd")
+_CASE_HEADER = struct.Struct("<Bd")
+_OUTPUT_COUNTS = struct.Struct("<QQ")
+
+
+class _ResultMapping:
+    """
+    Dict-style access to slotted result fields.
+
+    Lets older callers keep using ``result["success"]`` or ``"error" in result``
+    while the data lives in slots. Indexing returns any field, None or not;
+    ``in`` and ``get`` treat a field set to None as absent.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key, None)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+
+class TestCaseResult(_ResultMapping):
+    """The outcome of running a solution against one test case."""
+
+    __test__ = False  # Not a pytest test class
+
+    __slots__ = ("passed", "input", "expected", "actual", "execution_time", "error", "traceback", "output")
+
+    def __init__(
+        self,
+        passed: bool,
+        input: Any = None,
+        expected: Any = None,
+        actual: Any = None,
+        execution_time: Optional[float] = None,
+        error: Optional[str] = None,
+        traceback: Optional[str] = None,
+        output: Optional[CapturedOutput] = None
+    ):
+        self.passed = passed
+        self.input = input
+        self.expected = expected
+        self.actual = actual
+        self.execution_time = execution_time
+        self.error = error
+        self.traceback = traceback
+        # Captured stdout/stderr, or None if the solution printed nothing
+        self.output = output
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict with every schema field present."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        if self.output is not None:
+            data["output"] = self.output.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestCaseResult":
+        """Build a test case result from a dict, ignoring unknown keys."""
+        result = cls(**{name: data.get(name) for name in cls.__slots__ if name != "passed"},
+                     passed=bool(data.get("passed", False)))
+        result.output = CapturedOutput.coerce(result.output)
+        return result
+
+    @classmethod
+    def coerce(cls, value: Any) -> "TestCaseResult":
+        """Return the value as a TestCaseResult, converting dicts."""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+
+class EvaluationResult(_ResultMapping):
+    """The outcome of verifying a solution against a challenge."""
+
+    __slots__ = (
+        "success", "test_cases", "feedback", "time_taken", "error", "stage",
+        "entry_point", "expected_time_complexity", "expected_space_complexity",
+        "stage_timings", "cached_stages", "pipeline_time"
+    )
+
+    def __init__(
+        self,
+        success: bool = True,
+        test_cases: Optional[List[TestCaseResult]] = None,
+        feedback: Optional[List[str]] = None,
+        time_taken: float = 0,
+        error: Optional[str] = None,
+        stage: Optional[str] = None,
+        entry_point: Optional[str] = None,
+        expected_time_complexity: Optional[str] = None,
+        expected_space_complexity: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None,
+        cached_stages: Optional[List[str]] = None,
+        pipeline_time: Optional[float] = None
+    ):
+        self.success = success
+        self.test_cases = test_cases if test_cases is not None else []
+        self.feedback = feedback if feedback is not None else []
+        self.time_taken = time_taken
+        self.error = error
+        self.stage = stage
+        self.entry_point = entry_point
+        self.expected_time_complexity = expected_time_complexity
+        self.expected_space_complexity = expected_space_complexity
+        self.stage_timings = stage_timings
+        self.cached_stages = cached_stages
+        self.pipeline_time = pipeline_time
+
+    @property
+    def passed_count(self) -> int:
+        """Number of test cases that passed."""
+        return sum(1 for tc in self.test_cases if tc.passed)
+
+    def copy(self) -> "EvaluationResult":
+        """Return a copy whose lists and dicts can be changed independently."""
+        clone = EvaluationResult()
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.test_cases = list(self.test_cases)
+        clone.feedback = list(self.feedback)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict with every schema field present."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["test_cases"] = [tc.to_dict() for tc in self.test_cases]
+        data["schema_version"] = SCHEMA_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EvaluationResult":
+        """Build an evaluation result from a dict, ignoring unknown keys."""
+        result = cls(success=bool(data.get("success", False)))
+        for name in cls.__slots__:
+            if name != "success" and data.get(name) is not None:
+                setattr(result, name, data[name])
+        result.test_cases = [TestCaseResult.coerce(tc) for tc in data.get("test_cases") or []]
+        result.feedback = list(data.get("feedback") or [])
+        return result
+
+    @classmethod
+    def coerce(cls, value: Any) -> "EvaluationResult":
+        """Return the value as an EvaluationResult, converting legacy dicts."""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    def to_json(self) -> str:
+        """Serialize to a single line of JSON."""
+        return json.dumps(self.to_dict(), default=repr, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "EvaluationResult":
+        """Deserialize from a line of JSON."""
+        return cls.from_dict(json.loads(line))
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compact binary format."""
+        buf = bytearray()
+        buf += _RESULT_HEADER.pack(
+            SCHEMA_VERSION, 1 if self.success else 0,
+            _optional_float(self.time_taken), _optional_float(self.pipeline_time))
+
+        for value in (self.error, self.stage, self.entry_point,
+                      self.expected_time_complexity, self.expected_space_complexity):
+            _pack_str(buf, value)
+
+        _pack_str_list(buf, self.feedback)
+        _pack_str_list(buf, self.cached_stages)
+
+        timings = self.stage_timings or {}
+        buf += _U32.pack(len(timings))
+        for stage, seconds in timings.items():
+            _pack_str(buf, stage)
+            buf += _F64.pack(seconds)
+
+        buf += _U32.pack(len(self.test_cases))
+        for tc in self.test_cases:
+            buf += _CASE_HEADER.pack(1 if tc.passed else 0, _optional_float(tc.execution_time))
+            for value in (tc.input, tc.expected, tc.actual):
+                _pack_str(buf, json.dumps(value, default=repr, separators=(",", ":")))
+            _pack_str(buf, tc.error)
+            _pack_str(buf, tc.traceback)
+            if tc.output is None:
+                buf += b"\x00"
+            else:
+                buf += b"\x01"
+                _pack_str(buf, tc.output.stdout)
+                _pack_str(buf, tc.output.stderr)
+                buf += _OUTPUT_COUNTS.pack(tc.output.stdout_dropped, tc.output.stderr_dropped)
+
+        return bytes(buf)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EvaluationResult":
+        """Deserialize from the compact binary format."""
+        version, success, time_taken, pipeline_time = _RESULT_HEADER.unpack_from(data, 0)
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Unsupported result schema version {version}")
+        offset = _RESULT_HEADER.size
+
+        strings = []
+        for _ in range(5):
+            value, offset = _unpack_str(data, offset)
+            strings.append(value)
+
+        feedback, offset = _unpack_str_list(data, offset)
+        cached_stages, offset = _unpack_str_list(data, offset)
+
+        (timing_count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        timings = {}
+        for _ in range(timing_count):
+            stage, offset = _unpack_str(data, offset)
+            (timings[stage],) = _F64.unpack_from(data, offset)
+            offset += _F64.size
+
+        (case_count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        test_cases = []
+        for _ in range(case_count):
+            passed, execution_time = _CASE_HEADER.unpack_from(data, offset)
+            offset += _CASE_HEADER.size
+            values = []
+            for _ in range(3):
+                value, offset = _unpack_str(data, offset)
+                values.append(json.loads(value))
+            error, offset = _unpack_str(data, offset)
+            tb, offset = _unpack_str(data, offset)
+            output = None
+            if version >= 2:
+                has_output = data[offset]
+                offset += 1
+                if has_output:
+                    stdout, offset = _unpack_str(data, offset)
+                    stderr, offset = _unpack_str(data, offset)
+                    dropped = _OUTPUT_COUNTS.unpack_from(data, offset)
+                    offset += _OUTPUT_COUNTS.size
+                    output = CapturedOutput(stdout, stderr, dropped[0], dropped[1])
+            test_cases.append(TestCaseResult(
+                bool(passed), values[0], values[1], values[2],
+                _from_optional_float(execution_time), error, tb, output))
+
+        return cls(
+            success=bool(success),
+            test_cases=test_cases,
+            feedback=feedback or [],
+            time_taken=_from_optional_float(time_taken) or 0,
+            error=strings[0],
+            stage=strings[1],
+            entry_point=strings[2],
+            expected_time_complexity=strings[3],
+            expected_space_complexity=strings[4],
+            stage_timings=timings if timing_count else None,
+            cached_stages=cached_stages,
+            pipeline_time=_from_optional_float(pipeline_time)
+        )
+
+
+def write_jsonl(results: Iterable[EvaluationResult], fp: TextIO) -> int:
+    """
+    Write results as JSON lines.
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    for result in results:
+        fp.write(result.to_json())
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def read_jsonl(fp: TextIO) -> Iterator[EvaluationResult]:
+    """Read results written by write_jsonl, one at a time."""
+    for line in fp:
+        if line.strip():
+            yield EvaluationResult.from_json(line)
+
+
+def write_binary(results: Iterable[EvaluationResult], fp: BinaryIO) -> int:
+    """
+    Write results as length-prefixed binary records.
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    for result in results:
+        record = result.to_bytes()
+        fp.write(_U32.pack(len(record)))
+        fp.write(record)
+        count += 1
+    return count
+
+
+def read_binary(fp: BinaryIO) -> Iterator[EvaluationResult]:
+    """Read results written by write_binary, one at a time."""
+    while True:
+        prefix = fp.read(_U32.size)
+        if len(prefix) < _U32.size:
+            return
+        (length,) = _U32.unpack(prefix)
+        yield EvaluationResult.from_bytes(fp.read(length))
+
+
+def _optional_float(value: Optional[float]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _from_optional_float(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def _pack_str(buf: bytearray, value: Optional[str]) -> None:
+    if value is None:
+        buf += _U32.pack(_NONE_LENGTH)
+        return
+    encoded = str(value).encode("utf-8")
+    buf += _U32.pack(len(encoded))
+    buf += encoded
+
+
+def _unpack_str(data: bytes, offset: int):
+    (length,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    if length == _NONE_LENGTH:
+        return None, offset
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _pack_str_list(buf: bytearray, values: Optional[List[str]]) -> None:
+    if values is None:
+        buf += _U32.pack(_NONE_LENGTH)
+        return
+    buf += _U32.pack(len(values))
+    for value in values:
+        _pack_str(buf, value)
+
+
+def _unpack_str_list(data: bytes, offset: int):
+    (count,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    if count == _NONE_LENGTH:
+        return None, offset
+    values = []
+    for _ in range(count):
+        value, offset = _unpack_str(data, offset)
+        values.append(value)
+    return values, offset
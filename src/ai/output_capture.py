@@ -0,0 +1,231 @@
+from typing import Any, Dict, Optional
+from collections import deque
+from contextlib import contextmanager
+import io
+import sys
+import threading
+
+
+# Enough for a few hundred lines of debugging prints per test case
+DEFAULT_MAX_OUTPUT_BYTES = 4096
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    A write-only text stream that keeps only the last ``max_bytes`` of output.
+
+    Output beyond the cap is discarded from the front, like a ring buffer,
+    and the number of discarded bytes is counted.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.dropped_bytes = 0
+        self._chunks = deque()
+
+    def writable(self) -> bool:
+        """This stream is always writable."""
+        return True
+
+    def write(self, text: str) -> int:
+        """Append text, dropping the oldest output beyond the cap."""
+        data = text.encode("utf-8", "replace")
+        length = len(data)
+
+        if length >= self.max_bytes:
+            # The new write alone fills the buffer
+            self.dropped_bytes += self.size + length - self.max_bytes
+            self._chunks.clear()
+            if self.max_bytes:
+                self._chunks.append(data[-self.max_bytes:])
+            self.size = self.max_bytes
+            return len(text)
+
+        self._chunks.append(data)
+        self.size += length
+
+        while self.size > self.max_bytes:
+            excess = self.size - self.max_bytes
+            first = self._chunks[0]
+            if len(first) <= excess:
+                self._chunks.popleft()
+                self.size -= len(first)
+                self.dropped_bytes += len(first)
+            else:
+                self._chunks[0] = first[excess:]
+                self.size -= excess
+                self.dropped_bytes += excess
+
+        return len(text)
+
+    def getvalue(self) -> str:
+        """Decode the retained output."""
+        return b"".join(self._chunks).decode("utf-8", "replace")
+
+    @property
+    def written(self) -> bool:
+        """Whether anything was written, even if all of it was dropped."""
+        return self.size > 0 or self.dropped_bytes > 0
+
+
+class CapturedOutput:
+    """
+    The stdout and stderr captured while running one test case.
+
+    Text is only decoded when it's read, so capturing stays cheap for
+    results nobody looks at.
+    """
+
+    __slots__ = ("_stdout", "_stderr", "stdout_dropped", "stderr_dropped")
+
+    def __init__(self, stdout: Any = "", stderr: Any = "", stdout_dropped: int = 0, stderr_dropped: int = 0):
+        self._stdout = stdout
+        self._stderr = stderr
+        self.stdout_dropped = stdout_dropped
+        self.stderr_dropped = stderr_dropped
+
+    @classmethod
+    def from_buffers(cls, stdout: BoundedOutput, stderr: BoundedOutput) -> Optional["CapturedOutput"]:
+        """Wrap capture buffers, or return None if nothing was written."""
+        if not stdout.written and not stderr.written:
+            return None
+        return cls(stdout, stderr, stdout.dropped_bytes, stderr.dropped_bytes)
+
+    @property
+    def stdout(self) -> str:
+        """Captured stdout text."""
+        if not isinstance(self._stdout, str):
+            self._stdout = self._stdout.getvalue()
+        return self._stdout
+
+    @property
+    def stderr(self) -> str:
+        """Captured stderr text."""
+        if not isinstance(self._stderr, str):
+            self._stderr = self._stderr.getvalue()
+        return self._stderr
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return {
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "stdout_dropped": self.stdout_dropped,
+            "stderr_dropped": self.stderr_dropped
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CapturedOutput":
+        """Build captured output from a dict."""
+        return cls(
+            data.get("stdout", ""),
+            data.get("stderr", ""),
+            data.get("stdout_dropped", 0),
+            data.get("stderr_dropped", 0)
+        )
+
+    @classmethod
+    def coerce(cls, value: Any) -> Optional["CapturedOutput"]:
+        """Return the value as CapturedOutput, converting dicts."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls.from_dict(value)
+
+
+class OutputCapture:
+    """Holds the buffers of one capture; see capture_output."""
+
+    __slots__ = ("stdout", "stderr")
+
+    def __init__(self, max_bytes: int):
+        self.stdout = BoundedOutput(max_bytes)
+        self.stderr = BoundedOutput(max_bytes)
+
+    def result(self) -> Optional[CapturedOutput]:
+        """The captured output, or None if the code printed nothing."""
+        return CapturedOutput.from_buffers(self.stdout, self.stderr)
+
+
+class ThreadRoutedOutput:
+    """
+    Stands in for sys.stdout or sys.stderr once output is captured.
+
+    Writes from a thread inside capture_output go to that thread's
+    capture buffer; every other thread, such as the autosaver or the
+    challenge watcher, keeps writing to the stream this one replaced.
+    """
+
+    def __init__(self, stream: Any, name: str):
+        """
+        Initialize the proxy.
+
+        Args:
+            stream: The stream being replaced
+            name: "stdout" or "stderr"
+        """
+        self.stream = stream
+        self.name = name
+
+    def _target(self) -> Any:
+        """The stream the calling thread's output belongs in."""
+        capture = getattr(_capturing, "capture", None)
+        if capture is not None:
+            return getattr(capture, self.name)
+        return self.stream
+
+    def write(self, text: str) -> int:
+        """Write to the calling thread's capture buffer or the real stream."""
+        target = self._target()
+        if target is None:
+            # No console, e.g. under pythonw
+            return len(text)
+        return target.write(text)
+
+    def flush(self) -> None:
+        """Flush the calling thread's stream."""
+        target = self._target()
+        if target is not None:
+            target.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        # encoding, fileno, isatty, ... come from the real stream
+        return getattr(self.stream, name)
+
+
+# The capture of the thread running in capture_output, if any
+_capturing = threading.local()
+_install_lock = threading.Lock()
+
+
+def _install_proxies() -> None:
+    """Put ThreadRoutedOutput in front of sys.stdout and sys.stderr if it isn't there."""
+    with _install_lock:
+        for name in ("stdout", "stderr"):
+            stream = getattr(sys, name)
+            if not isinstance(stream, ThreadRoutedOutput):
+                setattr(sys, name, ThreadRoutedOutput(stream, name))
+
+
+@contextmanager
+def capture_output(max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES):
+    """
+    Redirect the calling thread's stdout and stderr into bounded buffers.
+
+    Only the calling thread is redirected, so output from other threads
+    neither ends up in the buffers nor disappears from the console.
+
+    Usage:
+        with capture_output() as capture:
+            user_solution(...)
+        output = capture.result()
+    """
+    capture = OutputCapture(max_bytes)
+    _install_proxies()
+    previous = getattr(_capturing, "capture", None)
+    _capturing.capture = capture
+    try:
+        yield capture
+    finally:
+        _capturing.capture = previous
@@ -0,0 +1,224 @@
+from typing import Dict, List, Any, Callable, Optional
+import hashlib
+import json
+import os
+
+from src.ai.evaluation_result import EvaluationResult
+from src.challenges.challenge_registry import PROJECT_ROOT
+
+
+DEFAULT_GRADES_PATH = os.path.join(PROJECT_ROOT, "grades", "verdicts.json")
+
+
+def hash_test_case(test_case: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash for a single test case.
+
+    Args:
+        test_case: Test case dict (input/expected or special test code)
+
+    Returns:
+        Short hex digest that changes whenever the test case changes
+    """
+    payload = json.dumps(test_case, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def hash_source(source: str) -> str:
+    """
+    Compute a content hash of a submission's source code.
+
+    Args:
+        source: Python source code
+
+    Returns:
+        Short hex digest that changes whenever the source changes
+    """
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class GradeStore:
+    """Stores per-test-case verdicts for every graded submission."""
+
+    def __init__(self, path: str = DEFAULT_GRADES_PATH):
+        """
+        Initialize the grade store.
+
+        Args:
+            path: JSON file the verdicts are persisted to
+        """
+        self.path = path
+        self.verdicts = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load stored verdicts from disk, starting empty if there are none."""
+        if not os.path.exists(self.path):
+            self.verdicts = {}
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                self.verdicts = json.load(f)
+        except (OSError, ValueError):
+            # A corrupted store only costs a full regrade
+            self.verdicts = {}
+
+    def save(self) -> None:
+        """Write the verdicts to disk."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.verdicts, f)
+        os.replace(tmp_path, self.path)
+
+    def get_verdicts(self, challenge_id: str, submission_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get the stored verdicts of a submission, keyed by test case hash."""
+        return self.verdicts.get(challenge_id, {}).get(submission_id, {})
+
+    def set_verdicts(self, challenge_id: str, submission_id: str, verdicts: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the stored verdicts of a submission."""
+        self.verdicts.setdefault(challenge_id, {})[submission_id] = verdicts
+
+    def get_submissions(self, challenge_id: str) -> List[str]:
+        """Get the IDs of all submissions graded for a challenge."""
+        return list(self.verdicts.get(challenge_id, {}).keys())
+
+
+class Regrader:
+    """
+    Re-grades stored submissions when a challenge's test suite changes.
+
+    Only test cases whose content hash has no stored verdict are run;
+    verdicts for unchanged test cases are reused. When the submission's
+    source is known its hash is part of each verdict's key, so editing a
+    submission under the same ID runs every test case again.
+    """
+
+    def __init__(self, store: Optional[GradeStore] = None):
+        """
+        Initialize the regrader.
+
+        Args:
+            store: Grade store holding previous verdicts
+        """
+        self.store = store if store is not None else GradeStore()
+
+    def regrade(
+        self,
+        challenge,
+        submission_id: str,
+        user_solution: Callable,
+        save: bool = True,
+        source_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Regrade one submission against the challenge's current test cases.
+
+        Args:
+            challenge: The challenge whose test suite to grade against
+            submission_id: Stable identifier of the stored submission
+            user_solution: The submission's solution function
+            save: Whether to persist the updated verdicts immediately
+            source_hash: hash_source of the submission's code, if known;
+                verdicts for other code are not reused
+
+        Returns:
+            Dict with the overall verdict, per-test verdicts and how many
+            test cases were executed versus reused
+        """
+        hashes = [hash_test_case(tc) for tc in challenge.test_cases]
+        if source_hash is not None:
+            hashes = [f"{source_hash}:{h}" for h in hashes]
+        stored = self.store.get_verdicts(challenge.id, submission_id)
+
+        pending = [i for i, h in enumerate(hashes) if h not in stored]
+        fresh = self._run_cases(challenge, user_solution, [challenge.test_cases[i] for i in pending])
+
+        verdicts = {h: stored[h] for h in hashes if h in stored}
+        for i, verdict in zip(pending, fresh):
+            verdicts[hashes[i]] = verdict
+
+        # Verdicts for removed or edited test cases are dropped here
+        self.store.set_verdicts(challenge.id, submission_id, verdicts)
+        if save:
+            self.store.save()
+
+        test_cases = [verdicts[h] for h in hashes]
+        return {
+            "success": all(tc["passed"] for tc in test_cases),
+            "test_cases": test_cases,
+            "executed": len(pending),
+            "reused": len(hashes) - len(pending)
+        }
+
+    def regrade_code(self, challenge, submission_id: str, source: str, save: bool = True) -> Dict[str, Any]:
+        """
+        Regrade a stored submission from its source code.
+
+        Args:
+            challenge: The challenge whose test suite to grade against
+            submission_id: Stable identifier of the stored submission
+            source: The submission's Python source code
+            save: Whether to persist the updated verdicts immediately
+
+        Returns:
+            Dict with the regrade results, or the pipeline error if the
+            submission can't be loaded
+        """
+        from src.challenges.submission_pipeline import PipelineError, get_default_pipeline
+
+        try:
+            user_solution = get_default_pipeline().load(challenge, source)
+        except PipelineError as e:
+            return {"success": False, "error": str(e), "stage": e.stage, "test_cases": []}
+
+        return self.regrade(challenge, submission_id, user_solution, save=save, source_hash=hash_source(source))
+
+    def regrade_all(self, challenge, submissions: Dict[str, Callable]) -> Dict[str, Dict[str, Any]]:
+        """
+        Regrade a whole cohort of submissions for a challenge.
+
+        Args:
+            challenge: The challenge whose test suite to grade against
+            submissions: Dict mapping submission IDs to solution functions
+
+        Returns:
+            Dict mapping submission IDs to their regrade results
+        """
+        results = {}
+        for submission_id, user_solution in submissions.items():
+            results[submission_id] = self.regrade(challenge, submission_id, user_solution, save=False)
+
+        self.store.save()
+        return results
+
+    def _run_cases(self, challenge, user_solution: Callable, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run a subset of the challenge's test cases through its own verifier.
+
+        Args:
+            challenge: The challenge to verify with
+            user_solution: The submission's solution function
+            test_cases: The test cases that need a fresh verdict
+
+        Returns:
+            One verdict dict per test case, in order
+        """
+        if not test_cases:
+            return []
+
+        try:
+            results = EvaluationResult.coerce(
+                challenge.with_test_cases(test_cases).verify_solution(user_solution))
+        except Exception as e:
+            return [{"passed": False, "error": str(e)} for _ in test_cases]
+
+        if len(results.test_cases) != len(test_cases):
+            # The verifier doesn't report per case, so every case shares its verdict
+            return [{"passed": results.success, "error": results.error} for _ in test_cases]
+
+        return [{"passed": tc.passed, "error": tc.error} for tc in results.test_cases]
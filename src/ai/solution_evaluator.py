@@ -2,21 +2,145 @@ from typing import Dict, List, Any, Callable
 import time
 import traceback
 
+from src.ai.evaluation_result import EvaluationResult, TestCaseResult
+from src.ai.output_capture import DEFAULT_MAX_OUTPUT_BYTES, capture_output
+
+
+class PlannedTestCase:
+    """A test case compiled into pre-bound arguments and a comparator."""
+
+    __slots__ = ("input", "expected", "args", "kwargs", "matches")
+
+    def __init__(self, input: Any, expected: Any, args: tuple, kwargs: Dict[str, Any], matches: Callable[[Any], bool]):
+        self.input = input
+        self.expected = expected
+        self.args = args
+        self.kwargs = kwargs
+        self.matches = matches
+
+
+class TestCaseSnapshot:
+    """The test case dicts of a suite and the items each held, to tell when the suite changes."""
+
+    __slots__ = ("sources",)
+
+    def __init__(self, test_cases: List[Dict[str, Any]]):
+        # The dicts themselves, so their ids can't be reused
+        self.sources = [(tc, tuple(tc.items())) for tc in test_cases]
+
+    def matches(self, test_cases: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether these test cases are the snapshotted ones, unchanged.
+
+        The dicts must be the same objects holding the same keys and values;
+        setting a case's input or expected value counts as a change.
+        Values are compared by identity, so mutating a nested value in place
+        isn't noticed: replace it instead.
+        """
+        if len(test_cases) != len(self.sources):
+            return False
+        for tc, (source, items) in zip(test_cases, self.sources):
+            if tc is not source or len(tc) != len(items):
+                return False
+            for (key, value), (source_key, source_value) in zip(tc.items(), items):
+                if key is not source_key or value is not source_value:
+                    return False
+        return True
+
+
+class EvaluationPlan:
+    """A challenge's test cases, compiled once so evaluation only calls and compares."""
+
+    __slots__ = ("cases", "snapshot")
+
+    def __init__(self, cases: List[PlannedTestCase], test_cases: List[Dict[str, Any]]):
+        self.cases = cases
+        self.snapshot = TestCaseSnapshot(test_cases)
+
+    def is_compiled_from(self, test_cases: List[Dict[str, Any]]) -> bool:
+        """Check whether this plan was compiled from these test cases as they are now."""
+        return self.snapshot.matches(test_cases)
+
+
+def _build_matcher(expected: Any) -> Callable[[Any], bool]:
+    """
+    Build the comparator for one expected value.
+
+    Lists are compared order-insensitively when their elements are sortable,
+    so the expected side is sorted here rather than on every comparison.
+    """
+    if not isinstance(expected, list):
+        return lambda actual: expected == actual
+
+    try:
+        sorted_expected = sorted(expected)
+    except TypeError:
+        # If not sortable, compare as is
+        return lambda actual: expected == actual
+
+    def matches(actual: Any) -> bool:
+        if not isinstance(actual, list):
+            return expected == actual
+        if len(actual) != len(sorted_expected):
+            return False
+        try:
+            return sorted(actual) == sorted_expected
+        except TypeError:
+            return expected == actual
+
+    return matches
+
 
 class SolutionEvaluator:
     """Evaluates user solutions against test cases and provides feedback."""
     
-    def __init__(self):
-        """Initialize the solution evaluator."""
-        pass
+    def __init__(self, max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES):
+        """
+        Initialize the solution evaluator.
+        
+        Args:
+            max_output_bytes: How much of the stdout and stderr printed during
+                each test case is kept; anything beyond is dropped and counted
+        """
+        self.max_output_bytes = max_output_bytes
+    
+    @staticmethod
+    def compile_plan(test_cases: List[Dict[str, Any]]) -> EvaluationPlan:
+        """
+        Compile test cases into an evaluation plan.
+        
+        Args:
+            test_cases: List of test cases with inputs and expected outputs
+            
+        Returns:
+            EvaluationPlan with pre-bound arguments and comparators
+        """
+        cases = []
+        for tc in test_cases:
+            test_input = tc["input"]
+            if isinstance(test_input, dict):
+                # If input is a dict, use it as keyword arguments
+                args, kwargs = (), test_input
+            elif isinstance(test_input, list):
+                # If input is a list, use it as positional arguments
+                args, kwargs = tuple(test_input), {}
+            else:
+                # Otherwise, use it as a single argument
+                args, kwargs = (test_input,), {}
+            
+            cases.append(PlannedTestCase(
+                test_input, tc["expected"], args, kwargs, _build_matcher(tc["expected"])))
+        
+        return EvaluationPlan(cases, test_cases)
     
     def evaluate(
         self,
         solution_func: Callable,
-        test_cases: List[Dict[str, Any]],
+        test_cases: List[Dict[str, Any]] = None,
         expected_time_complexity: str = "O(n)",
-        expected_space_complexity: str = "O(n)"
-    ) -> Dict[str, Any]:
+        expected_space_complexity: str = "O(n)",
+        plan: EvaluationPlan = None
+    ) -> EvaluationResult:
         """
         Evaluate a solution against test cases.
         
@@ -25,38 +149,39 @@ class SolutionEvaluator:
             test_cases: List of test cases with inputs and expected outputs
             expected_time_complexity: Expected time complexity (for reference)
             expected_space_complexity: Expected space complexity (for reference)
+            plan: Precompiled plan for the test cases, compiled here if omitted
             
         Returns:
-            Dict with evaluation results
+            EvaluationResult with per-test-case results
         """
-        results = {
-            "success": True,
-            "test_cases": [],
-            "time_taken": 0,
-            "feedback": [],
-            "expected_time_complexity": expected_time_complexity,
-            "expected_space_complexity": expected_space_complexity
-        }
+        if plan is None:
+            plan = self.compile_plan(test_cases or [])
         
-        start_time = time.time()
+        results = EvaluationResult(
+            expected_time_complexity=expected_time_complexity,
+            expected_space_complexity=expected_space_complexity
+        )
+        
+        start_time = time.perf_counter()
         
         # Run each test case
-        for tc in test_cases:
-            test_result = self._run_test_case(solution_func, tc)
-            results["test_cases"].append(test_result)
+        case_results = results.test_cases
+        for case in plan.cases:
+            test_result = self._run_planned_case(solution_func, case)
+            case_results.append(test_result)
             
-            if not test_result["passed"]:
-                results["success"] = False
+            if not test_result.passed:
+                results.success = False
         
         # Calculate total time
-        results["time_taken"] = time.time() - start_time
+        results.time_taken = time.perf_counter() - start_time
         
         # Generate feedback
-        results["feedback"] = self._generate_feedback(results)
+        results.feedback = self._generate_feedback(results)
         
         return results
     
-    def _run_test_case(self, solution_func: Callable, test_case: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_test_case(self, solution_func: Callable, test_case: Dict[str, Any]) -> TestCaseResult:
         """
         Run a single test case.
         
@@ -65,46 +190,39 @@ class SolutionEvaluator:
             test_case: Dict with inputs and expected output
             
         Returns:
-            Dict with test case results
+            TestCaseResult for the test case
         """
-        result = {
-            "passed": False,
-            "input": test_case["input"],
-            "expected": test_case["expected"]
-        }
+        return self._run_planned_case(solution_func, self.compile_plan([test_case]).cases[0])
+    
+    def _run_planned_case(self, solution_func: Callable, case: PlannedTestCase) -> TestCaseResult:
+        """
+        Run a single compiled test case.
         
-        try:
-            # Time the execution
-            start_time = time.time()
-            
-            # Call the function with the input
-            if isinstance(test_case["input"], dict):
-                # If input is a dict, use it as keyword arguments
-                actual_output = solution_func(**test_case["input"])
-            elif isinstance(test_case["input"], list):
-                # If input is a list, use it as positional arguments
-                actual_output = solution_func(*test_case["input"])
-            else:
-                # Otherwise, use it as a single argument
-                actual_output = solution_func(test_case["input"])
-            
-            execution_time = time.time() - start_time
-            
-            # Check if the output matches the expected output
-            result["actual"] = actual_output
-            result["execution_time"] = execution_time
-            
-            # Compare output with expected result
-            result["passed"] = self._compare_outputs(actual_output, test_case["expected"])
-            
-            if not result["passed"]:
-                result["error"] = f"Expected {test_case['expected']}, but got {actual_output}"
+        Args:
+            solution_func: User's solution function
+            case: Compiled test case
             
-        except Exception as e:
-            result["error"] = str(e)
-            result["traceback"] = traceback.format_exc()
+        Returns:
+            TestCaseResult for the test case
+        """
+        # Anything the solution prints goes to bounded buffers, not the terminal
+        with capture_output(self.max_output_bytes) as capture:
+            try:
+                start_time = time.perf_counter()
+                actual_output = solution_func(*case.args, **case.kwargs)
+                execution_time = time.perf_counter() - start_time
+            except Exception as e:
+                return TestCaseResult(
+                    False, case.input, case.expected,
+                    error=str(e), traceback=traceback.format_exc(), output=capture.result())
         
-        return result
+        if case.matches(actual_output):
+            return TestCaseResult(True, case.input, case.expected, actual_output, execution_time,
+                                  output=capture.result())
+        
+        return TestCaseResult(
+            False, case.input, case.expected, actual_output, execution_time,
+            error=f"Expected {case.expected}, but got {actual_output}", output=capture.result())
     
     def _compare_outputs(self, actual: Any, expected: Any) -> bool:
         """
@@ -117,28 +235,9 @@ class SolutionEvaluator:
         Returns:
             True if outputs match, False otherwise
         """
-        # Handle different types of outputs
-        if isinstance(expected, list) and isinstance(actual, list):
-            # For lists, check if they have the same elements
-            if len(expected) != len(actual):
-                return False
-            
-            # Sort both lists if they're lists of comparable elements
-            try:
-                return sorted(expected) == sorted(actual)
-            except TypeError:
-                # If not sortable, compare as is
-                return expected == actual
-            
-        elif isinstance(expected, dict) and isinstance(actual, dict):
-            # For dicts, check if they have the same key-value pairs
-            return expected == actual
-            
-        else:
-            # For other types, use equality
-            return expected == actual
+        return _build_matcher(expected)(actual)
     
-    def _generate_feedback(self, results: Dict[str, Any]) -> List[str]:
+    def _generate_feedback(self, results: EvaluationResult) -> List[str]:
         """
         Generate feedback based on evaluation results.
         
@@ -151,26 +250,26 @@ class SolutionEvaluator:
         feedback = []
         
         # Check overall success
-        if results["success"]:
+        if results.success:
             feedback.append("Great job! Your solution passed all test cases.")
             
             # Add performance feedback
-            feedback.append(f"Your solution ran in {results['time_taken']:.5f} seconds.")
+            feedback.append(f"Your solution ran in {results.time_taken:.5f} seconds.")
             
         else:
             # Count failed test cases
-            failed_count = sum(1 for tc in results["test_cases"] if not tc["passed"])
-            total_count = len(results["test_cases"])
+            total_count = len(results.test_cases)
+            failed_count = total_count - results.passed_count
             
             feedback.append(f"Your solution passed {total_count - failed_count} out of {total_count} test cases.")
             
             # Add specific feedback for the first few failed test cases
-            for i, tc in enumerate(results["test_cases"]):
-                if not tc["passed"] and i < 3:  # Limit to first 3 failed cases
-                    if "error" in tc:
-                        feedback.append(f"Test case {i+1} failed: {tc['error']}")
+            for i, tc in enumerate(results.test_cases):
+                if not tc.passed and i < 3:  # Limit to first 3 failed cases
+                    if tc.error is not None:
+                        feedback.append(f"Test case {i+1} failed: {tc.error}")
                     else:
-                        feedback.append(f"Test case {i+1} failed. Input: {tc['input']}, Expected: {tc['expected']}, Got: {tc['actual']}")
+                        feedback.append(f"Test case {i+1} failed. Input: {tc.input}, Expected: {tc.expected}, Got: {tc.actual}")
         
         return feedback
 
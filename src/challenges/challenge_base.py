@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import copy
 import time
 import inspect
 
+from src.ai.evaluation_result import EvaluationResult
+from src.challenges.challenge_stats import get_stats_store
+
 
 class DifficultyLevel(Enum):
     EASY = "Easy"
@@ -35,6 +39,7 @@ class Challenge(ABC):
         solution: str = None,
         area: str = "Algorithm Forest",
         primary_skill: str = None,
+        entry_point: str = None,
     ):
         self.id = id
         self.name = name
@@ -48,11 +53,39 @@ class Challenge(ABC):
         self.solution = solution
         self.area = area
         self.primary_skill = primary_skill
+        # Name of the function or class the user's solution must define
+        self.entry_point = entry_point or id.replace("-", "_")
         
-        # Metadata for tracking
-        self.times_attempted = 0
-        self.times_completed = 0
-        self.best_time = float('inf')
+        # Attempt counters live in the per-process stats store, not on the
+        # instance, so shared challenges aren't written to after a fork
+        self._stats_key = get_stats_store().new_key()
+
+    @property
+    def times_attempted(self) -> int:
+        """How often this challenge was attempted in this process."""
+        return get_stats_store().get(self._stats_key).attempted
+
+    @times_attempted.setter
+    def times_attempted(self, value: int) -> None:
+        get_stats_store().get(self._stats_key).attempted = value
+
+    @property
+    def times_completed(self) -> int:
+        """How often this challenge was completed in this process."""
+        return get_stats_store().get(self._stats_key).completed
+
+    @times_completed.setter
+    def times_completed(self, value: int) -> None:
+        get_stats_store().get(self._stats_key).completed = value
+
+    @property
+    def best_time(self) -> float:
+        """Fastest successful attempt in this process, in seconds."""
+        return get_stats_store().get(self._stats_key).best_time
+
+    @best_time.setter
+    def best_time(self, value: float) -> None:
+        get_stats_store().get(self._stats_key).best_time = value
     
     def get_fantasy_description(self) -> str:
         """Return a fantasy-themed description of the challenge."""
@@ -79,7 +112,58 @@ Time Limit: {"None" if self.time_limit_seconds == 0 else f"{self.time_limit_seco
             return "No more hints available for this challenge."
         return self.hints[hint_level]
     
-    def attempt_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def get_test_plan(self):
+        """
+        Get the compiled evaluation plan for this challenge's test cases.
+        
+        The plan is compiled on first use and reused until a test case is
+        added, removed, replaced or has one of its values set.
+        
+        Returns:
+            EvaluationPlan for the current test cases
+        """
+        from src.ai.solution_evaluator import SolutionEvaluator
+        
+        plan = getattr(self, "_test_plan", None)
+        if plan is None or not plan.is_compiled_from(self.test_cases):
+            plan = SolutionEvaluator.compile_plan(self.test_cases)
+            self._test_plan = plan
+        return plan
+    
+    def get_suite_hash(self) -> Tuple[str, ...]:
+        """
+        Get the content hashes of this challenge's test cases.
+
+        Like the test plan, the hashes are computed once and reused until
+        a test case is added, removed, replaced or has one of its values set.
+
+        Returns:
+            hash_test_case of every test case, in order
+        """
+        from src.ai.regrader import hash_test_case
+        from src.ai.solution_evaluator import TestCaseSnapshot
+
+        cached = getattr(self, "_suite_hash", None)
+        if cached is None or not cached[0].matches(self.test_cases):
+            cached = (TestCaseSnapshot(self.test_cases), tuple(hash_test_case(tc) for tc in self.test_cases))
+            self._suite_hash = cached
+        return cached[1]
+
+    def with_test_cases(self, test_cases: List[Dict[str, Any]]) -> "Challenge":
+        """
+        Return a shallow copy of this challenge that runs only the given test cases.
+        
+        Args:
+            test_cases: Test cases the copy should verify against
+            
+        Returns:
+            A copy of the challenge sharing everything but its test cases
+        """
+        clone = copy.copy(self)
+        clone.test_cases = list(test_cases)
+        return clone
+    
+    def attempt_solution(self, user_solution: Callable) -> EvaluationResult:
         """
         Attempt a solution for this challenge. This method calls verify_solution
         which should be implemented by subclasses.
@@ -88,29 +172,29 @@ Time Limit: {"None" if self.time_limit_seconds == 0 else f"{self.time_limit_seco
             user_solution: User's solution function
             
         Returns:
-            Dict with verification results
+            EvaluationResult with verification results
         """
         try:
             # Measure the time taken
             start_time = time.time()
             
             # Verify the solution
-            results = self.verify_solution(user_solution)
+            results = EvaluationResult.coerce(self.verify_solution(user_solution))
             
             # Add the time taken
-            results["time_taken"] = time.time() - start_time
+            results.time_taken = time.time() - start_time
             
             return results
         except Exception as e:
             # Return error if something went wrong
-            return {
-                "success": False,
-                "feedback": [f"Error evaluating solution: {str(e)}"],
-                "time_taken": 0
-            }
+            return EvaluationResult(
+                success=False,
+                feedback=[f"Error evaluating solution: {str(e)}"],
+                time_taken=0
+            )
     
     @abstractmethod
-    def verify_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
         """
         Run test cases against the user's solution.
         This method should be overridden by subclasses.
@@ -119,11 +203,11 @@ Time Limit: {"None" if self.time_limit_seconds == 0 else f"{self.time_limit_seco
             user_solution: User's solution function
             
         Returns:
-            Dict with verification results
+            EvaluationResult with verification results
         """
         raise NotImplementedError("Challenge subclasses must implement verify_solution method")
     
-    def attempt(self, user_solution_code: str) -> Dict[str, Any]:
+    def attempt(self, user_solution_code: str) -> EvaluationResult:
         """
         Process a user's attempt at solving the challenge.
         
@@ -131,52 +215,19 @@ Time Limit: {"None" if self.time_limit_seconds == 0 else f"{self.time_limit_seco
             user_solution_code: String containing the user's Python code
             
         Returns:
-            Dict containing results, success/failure, time taken, etc.
+            EvaluationResult containing success/failure, time taken, etc.
         """
-        self.times_attempted += 1
-        start_time = time.time()
-        
-        # Compile the user's code
-        try:
-            user_solution_namespace = {}
-            exec(user_solution_code, user_solution_namespace)
-            
-            # Find the main function in the user's code
-            user_solution = None
-            for name, obj in user_solution_namespace.items():
-                if callable(obj) and not name.startswith('__'):
-                    user_solution = obj
-                    break
-            
-            if user_solution is None:
-                return {
-                    "success": False,
-                    "error": "No function found in your solution."
-                }
-            
-            # Run the verification
-            results = self.verify_solution(user_solution)
-            
-            # Calculate time taken
-            time_taken = time.time() - start_time
-            results["time_taken"] = time_taken
-            
-            # Check if time limit exceeded (if there is one)
-            if self.time_limit_seconds > 0 and time_taken > self.time_limit_seconds:
-                results["success"] = False
-                results["error"] = f"Time limit exceeded. Your solution took {time_taken:.2f}s, but the limit is {self.time_limit_seconds}s."
-            
-            # Update stats
-            if results.get("success", False):
-                self.times_completed += 1
-                if time_taken < self.best_time:
-                    self.best_time = time_taken
-            
-            return results
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error executing your solution: {str(e)}",
-                "time_taken": time.time() - start_time
-            }
\ No newline at end of file
+        from src.challenges.submission_pipeline import get_default_pipeline
+
+        stats = get_stats_store().get(self._stats_key)
+        stats.attempted += 1
+
+        results = get_default_pipeline().run(self, user_solution_code)
+
+        # Update stats
+        if results.success:
+            stats.completed += 1
+            if results.time_taken < stats.best_time:
+                stats.best_time = results.time_taken
+
+        return results
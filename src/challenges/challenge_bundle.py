@@ -0,0 +1,91 @@
+import os
+import sys
+import posixpath
+import threading
+import zipfile
+from typing import Callable, List
+
+
+BUNDLE_SUFFIX = ".zip"
+
+
+def is_bundle_file(name: str) -> bool:
+    """Check whether a file name is a zipped challenge bundle."""
+    return name.endswith(BUNDLE_SUFFIX)
+
+
+class ChallengeBundle:
+    """
+    A zipped collection of challenge modules and packs, used without unpacking.
+
+    Opening a bundle only reads the zip's central directory. Members are
+    decompressed one at a time when they are read, and Python modules are
+    imported straight from the archive through zipimport.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a bundle.
+
+        Args:
+            path: Path of the .zip file
+        """
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        # ZipFile shares one file handle between reads
+        self._lock = threading.Lock()
+        self.members = {
+            info.filename: info for info in self._zip.infolist()
+            if not info.is_dir() and not self._is_hidden(info.filename)
+        }
+
+    @staticmethod
+    def _is_hidden(name: str) -> bool:
+        """Skip the same names a directory scan skips (dotfiles, __init__, __pycache__)."""
+        return any(part.startswith((".", "__")) for part in name.split("/"))
+
+    def module_members(self) -> List[str]:
+        """Names of the Python modules in the bundle."""
+        return sorted(name for name in self.members if name.endswith(".py"))
+
+    def members_matching(self, predicate: Callable[[str], bool]) -> List[str]:
+        """Names of the members whose file name matches a predicate."""
+        return sorted(name for name in self.members if predicate(posixpath.basename(name)))
+
+    def read(self, name: str) -> bytes:
+        """Decompress and return one member."""
+        info = self.members.get(name)
+        if info is None:
+            raise FileNotFoundError(f"{name} is not in {self.path}")
+        with self._lock:
+            return self._zip.read(info)
+
+    def reader(self, base_dir: str = "") -> Callable[[str], bytes]:
+        """Build a reader for members relative to a directory inside the bundle."""
+        def read(name: str) -> bytes:
+            return self.read(posixpath.normpath(posixpath.join(base_dir, name)))
+        return read
+
+    @staticmethod
+    def module_name(member: str) -> str:
+        """Convert a module member path into the dotted name it's imported as."""
+        return member[:-3].replace("/", ".")
+
+    def mount(self) -> None:
+        """Make the bundle's modules importable."""
+        if self.path not in sys.path:
+            sys.path.append(self.path)
+
+    def unmount(self) -> None:
+        """Stop importing from the bundle and forget modules loaded from it."""
+        if self.path in sys.path:
+            sys.path.remove(self.path)
+        sys.path_importer_cache.pop(self.path, None)
+        for name, module in list(sys.modules.items()):
+            if (getattr(module, "__file__", None) or "").startswith(self.path + os.sep):
+                del sys.modules[name]
+
+    def close(self) -> None:
+        """Close the archive."""
+        with self._lock:
+            self._zip.close()
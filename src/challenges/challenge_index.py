@@ -0,0 +1,227 @@
+from typing import List, Iterable, Optional
+
+from src.challenges.challenge_base import DifficultyLevel, ChallengeType
+from src.challenges.challenge_registry import ChallengeMetadata
+
+
+_DIFFICULTY_ORDER = {level: i for i, level in enumerate(DifficultyLevel)}
+
+# How each supported sort order ranks a challenge
+SORT_KEYS = {
+    "difficulty": lambda meta: (_DIFFICULTY_ORDER[meta.difficulty], meta.xp_reward, meta.name),
+    "xp": lambda meta: (meta.xp_reward, meta.name),
+    "name": lambda meta: (meta.name,),
+}
+
+
+class ChallengePage:
+    """One page of challenge query results."""
+
+    __slots__ = ("items", "total", "page", "page_size")
+
+    def __init__(self, items: List[ChallengeMetadata], total: int, page: int, page_size: int):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.page_size = page_size
+
+    @property
+    def pages(self) -> int:
+        """Total number of pages."""
+        return max(1, -(-self.total // self.page_size))
+
+    @property
+    def has_next(self) -> bool:
+        return self.page + 1 < self.pages
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 0
+
+
+class ChallengeIndex:
+    """
+    In-memory index over challenge metadata for menu queries.
+
+    Challenges are bucketed by area, difficulty, type and primary skill.
+    Each bucket keeps its members presorted (per sort order, built on
+    first use), so a query walks the smallest matching bucket in order and
+    stops as soon as the requested page is full. The total match count
+    comes from a count kept per combination of bucket filters, less the
+    excluded challenges that match; only XP range queries have to walk
+    the whole bucket to count.
+    """
+
+    FIELDS = ("area", "difficulty", "challenge_type", "primary_skill")
+
+    def __init__(self, metadata: Iterable[ChallengeMetadata] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            metadata: Challenge metadata to index
+        """
+        self.entries = {}
+        # Display name -> IDs of the challenges with that name; a pack and a
+        # module can both have e.g. a "Two Sum"
+        self._name_to_ids = {}
+        self._buckets = {field: {} for field in self.FIELDS}
+        # (field, value, sort_by) -> presorted list of metadata; field None means all
+        self._sorted = {}
+        # Sorted (field, value) filters -> number of challenges matching them all
+        self._counts = {}
+        # Bumped on every change so dependents can tell their view is stale
+        self.version = 0
+
+        for meta in metadata:
+            self.add(meta)
+
+    def add(self, meta: ChallengeMetadata) -> None:
+        """Add or replace a challenge in the index."""
+        if meta.id in self.entries:
+            self.remove(meta.id)
+
+        self.entries[meta.id] = meta
+        self._name_to_ids.setdefault(meta.name, set()).add(meta.id)
+        for field in self.FIELDS:
+            self._buckets[field].setdefault(getattr(meta, field), set()).add(meta.id)
+        self._sorted.clear()
+        self._counts.clear()
+        self.version += 1
+
+    def remove(self, challenge_id: str) -> None:
+        """Remove a challenge from the index."""
+        meta = self.entries.pop(challenge_id, None)
+        if meta is None:
+            return
+
+        ids = self._name_to_ids.get(meta.name)
+        if ids is not None:
+            ids.discard(challenge_id)
+            if not ids:
+                del self._name_to_ids[meta.name]
+        for field in self.FIELDS:
+            bucket = self._buckets[field].get(getattr(meta, field))
+            if bucket is not None:
+                bucket.discard(challenge_id)
+        self._sorted.clear()
+        self._counts.clear()
+        self.version += 1
+
+    def query(
+        self,
+        area: Optional[str] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+        challenge_type: Optional[ChallengeType] = None,
+        primary_skill: Optional[str] = None,
+        min_xp: Optional[int] = None,
+        max_xp: Optional[int] = None,
+        exclude_completed: Optional[Iterable[str]] = None,
+        sort_by: str = "difficulty",
+        page: int = 0,
+        page_size: int = 10
+    ) -> ChallengePage:
+        """
+        Find challenges matching every given filter.
+
+        Args:
+            area: Only challenges in this area
+            difficulty: Only challenges of this difficulty
+            challenge_type: Only challenges of this type
+            primary_skill: Only challenges training this skill
+            min_xp: Minimum XP reward (inclusive)
+            max_xp: Maximum XP reward (inclusive)
+            exclude_completed: Names or IDs of challenges to leave out,
+                e.g. a character's completed_challenges; a name leaves out
+                every challenge with that name
+            sort_by: "difficulty", "xp" or "name"
+            page: Zero-based page number
+            page_size: Results per page
+
+        Returns:
+            ChallengePage with the requested page and the total match count
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort order '{sort_by}'")
+
+        wanted = {"area": area, "difficulty": difficulty,
+                  "challenge_type": challenge_type, "primary_skill": primary_skill}
+        filters = []
+        for field, value in wanted.items():
+            if value is not None:
+                filters.append((field, value, self._buckets[field].get(value, set())))
+
+        excluded = set()
+        for completed in exclude_completed or ():
+            ids = self._name_to_ids.get(completed)
+            if ids:
+                excluded.update(ids)
+            else:
+                excluded.add(completed)
+
+        if filters:
+            # Walk the smallest bucket in order and check the others by membership
+            filters.sort(key=lambda f: len(f[2]))
+            driver_field, driver_value, _ = filters[0]
+            ordered = self._sorted_bucket(driver_field, driver_value, sort_by)
+            others = [ids for _, _, ids in filters[1:]]
+        else:
+            ordered = self._sorted_bucket(None, None, sort_by)
+            others = []
+
+        # Without an XP range the total is known up front, so the walk can
+        # stop at the end of the page
+        counted = min_xp is None and max_xp is None
+        total = None
+        if counted:
+            total = self._count(filters) - sum(
+                1 for challenge_id in excluded
+                if challenge_id in self.entries and all(challenge_id in ids for _, _, ids in filters))
+
+        start = page * page_size
+        end = start + page_size
+        items = []
+        matched = 0
+        for meta in ordered:
+            if counted and matched >= end:
+                break
+            if meta.id in excluded:
+                continue
+            if min_xp is not None and meta.xp_reward < min_xp:
+                continue
+            if max_xp is not None and meta.xp_reward > max_xp:
+                continue
+            if others and not all(meta.id in ids for ids in others):
+                continue
+
+            if start <= matched < end:
+                items.append(meta)
+            matched += 1
+
+        return ChallengePage(items, total if counted else matched, page, page_size)
+
+    def _count(self, filters: List) -> int:
+        """Count the challenges in every filter's bucket, once per change."""
+        key = tuple(sorted((field, value) for field, value, _ in filters))
+        count = self._counts.get(key)
+        if count is None:
+            if not filters:
+                count = len(self.entries)
+            else:
+                smallest, *rest = sorted((ids for _, _, ids in filters), key=len)
+                count = sum(1 for challenge_id in smallest if all(challenge_id in ids for ids in rest))
+            self._counts[key] = count
+        return count
+
+    def _sorted_bucket(self, field: Optional[str], value, sort_by: str) -> List[ChallengeMetadata]:
+        """Get a bucket's members in sort order, sorting it once per change."""
+        key = (field, value, sort_by)
+        ordered = self._sorted.get(key)
+        if ordered is None:
+            if field is None:
+                members = self.entries.values()
+            else:
+                members = [self.entries[i] for i in self._buckets[field].get(value, ())]
+            ordered = sorted(members, key=SORT_KEYS[sort_by])
+            self._sorted[key] = ordered
+        return ordered
@@ -1,70 +1,190 @@
+import gc
 import os
-import importlib
-import inspect
-from typing import Dict, List, Any, Type
+import threading
+from typing import Dict, List, Optional
 from src.challenges.challenge_base import Challenge
+from src.challenges.challenge_registry import ChallengeMetadata, ChallengeRegistry
+from src.challenges.challenge_index import ChallengeIndex, ChallengePage
+from src.challenges.challenge_search import ChallengeSearch
+from src.challenges.challenge_recommender import ChallengeRecommender
+from src.challenges.challenge_plugins import discover_packs
 
 
 class ChallengeLoader:
     """Loads challenges from the challenges directory."""
 
-    def __init__(self):
-        """Initialize the challenge loader."""
-        self.challenges = {}
+    def __init__(
+        self,
+        registry: Optional[ChallengeRegistry] = None,
+        search: Optional[ChallengeSearch] = None,
+        discover_plugins: bool = True
+    ):
+        """
+        Initialize the challenge loader.
+
+        Args:
+            registry: Registry to load from, defaults to the on-disk catalog
+            search: Full-text index, defaults to one persisted next to the manifest
+            discover_plugins: Also load challenge packs installed through entry points
+        """
+        self.registry = registry if registry is not None else ChallengeRegistry()
+        # Only the packages' locations are read here; their modules are
+        # imported when they change or when one of their challenges is opened
+        self.plugin_packs = discover_packs() if discover_plugins else []
+        for pack in self.plugin_packs:
+            self.registry.add_package(pack.path, pack.package)
+        self.index = ChallengeIndex()
+        self.recommender = ChallengeRecommender(self.index)
+        if search is None:
+            manifest_dir = os.path.dirname(self.registry.manifest_path)
+            search = ChallengeSearch(os.path.join(manifest_dir, "search_index.json"))
+            search.load()
+        self.search = search
+        # Guards the registry and index against a ChallengeWatcher
+        # refreshing them mid-query
+        self._lock = threading.RLock()
+        self.load_challenges()
+
+    def load_challenges(self) -> List[str]:
+        """
+        Refresh the challenge catalog.
+
+        Only the manifest is read; challenge modules are imported when they
+        changed on disk or when a challenge is first requested. Cached
+        results for changed challenges are dropped. The registry and the
+        index change together, so queries never see one without the other.
+
+        Returns:
+            IDs of the challenges that were added, changed or removed
+        """
+        from src.challenges.submission_pipeline import get_default_pipeline
+
+        with self._lock:
+            changed = self.registry.refresh()
+            for challenge_id in changed:
+                meta = self.registry.get_metadata(challenge_id)
+                if meta is None:
+                    self.index.remove(challenge_id)
+                else:
+                    self.index.add(meta)
+
+            # Only challenges missing from the persisted search index are loaded
+            if self.search.sync(self.registry.entries, self.registry.get):
+                self.search.save()
+
+        pipeline = get_default_pipeline()
+        for challenge_id in changed:
+            pipeline.invalidate(challenge_id)
+        return changed
+
+    def mount(self, path: str) -> None:
+        """
+        Add a directory or zipped challenge bundle to the catalog.
+
+        Args:
+            path: Directory to scan, or path of a .zip bundle
+        """
+        if path not in self.registry.challenge_dirs:
+            self.registry.challenge_dirs.append(path)
         self.load_challenges()
 
-    def load_challenges(self) -> None:
-        """Load all challenge classes from the challenges directory."""
-        # Base directory for challenges
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        challenges_dir = os.path.join(base_dir, "challenges")
-
-        # Load algorithm challenges
-        self._load_from_dir(os.path.join(challenges_dir, "algorithms"))
-
-        # Future directories to load from:
-        # self._load_from_dir(os.path.join(challenges_dir, "data_structures"))
-        # self._load_from_dir(os.path.join(challenges_dir, "system_design"))
-        # etc.
-
-    def _load_from_dir(self, directory: str) -> None:
-        """Load challenges from a specific directory."""
-        if not os.path.exists(directory):
-            return
-
-        # Get Python files in the directory
-        for filename in os.listdir(directory):
-            if filename.endswith(".py") and not filename.startswith("__"):
-                # Convert path to module name
-                rel_path = os.path.relpath(directory, os.path.dirname(
-                    os.path.dirname(os.path.abspath(__file__))))
-                module_path = f"src.{rel_path.replace(os.sep, '.')}.{filename[:-3]}"
-
-                try:
-                    # Import the module
-                    module = importlib.import_module(module_path)
-
-                    # Find challenge classes in the module
-                    for name, obj in inspect.getmembers(module):
-                        if (inspect.isclass(obj) and
-                            issubclass(obj, Challenge) and
-                                obj != Challenge):
-
-                            # Instantiate the challenge
-                            challenge = obj()
-                            self.challenges[challenge.id] = challenge
-
-                except Exception as e:
-                    print(f"Error loading challenge from {filename}: {e}")
-
-    def get_challenge(self, challenge_id: str) -> Challenge:
-        """Get a challenge by ID."""
-        return self.challenges.get(challenge_id)
+    def get_challenge(self, challenge_id: str) -> Optional[Challenge]:
+        """Get a challenge by ID, or None if it was removed from the catalog."""
+        with self._lock:
+            return self.registry.get(challenge_id)
+
+    def get_metadata_by_area(self, area: str) -> List[ChallengeMetadata]:
+        """Get menu metadata for all challenges in an area without loading them."""
+        with self._lock:
+            return self.index.query(area=area, page_size=max(1, len(self.index.entries))).items
+
+    def query_challenges(self, **filters) -> ChallengePage:
+        """
+        Query challenge metadata; see ChallengeIndex.query for the filters.
+
+        Returns:
+            One sorted page of matching challenges
+        """
+        with self._lock:
+            return self.index.query(**filters)
+
+    def search_challenges(self, query: str, limit: int = 10) -> List[ChallengeMetadata]:
+        """
+        Full-text search over challenge names, descriptions and hints.
+
+        Args:
+            query: Words or word prefixes to look for
+            limit: Maximum number of results
+
+        Returns:
+            Metadata of the best matching challenges, best first
+        """
+        with self._lock:
+            results = self.search.search(query, limit)
+            return [self.registry.get_metadata(challenge_id) for challenge_id, _ in results
+                    if challenge_id in self.registry.entries]
+
+    def recommend_challenges(self, character, limit: int = 5) -> List[ChallengeMetadata]:
+        """
+        Get the best next challenges for a character; see ChallengeRecommender.
+
+        Args:
+            character: The player's Character
+            limit: Maximum number of recommendations
+
+        Returns:
+            Metadata of the recommended challenges, best first
+        """
+        with self._lock:
+            return self.recommender.recommend(character, limit)
+
+    def record_attempt(self, character, challenge_id: str, success: bool) -> None:
+        """Let the recommender know how an attempt went."""
+        with self._lock:
+            self.recommender.record_attempt(character, challenge_id, success)
 
     def get_challenges_by_area(self, area: str) -> List[Challenge]:
         """Get all challenges in a specific area."""
-        return [c for c in self.challenges.values() if c.area == area]
+        return [self.registry.get(meta.id) for meta in self.get_metadata_by_area(area)]
 
     def get_all_challenges(self) -> Dict[str, Challenge]:
-        """Get all loaded challenges."""
-        return self.challenges
+        """Get all challenges, loading any that haven't been loaded yet."""
+        return {meta.id: self.registry.get(meta.id) for meta in self.registry.list_metadata()}
+
+    def prepare_for_fork(self) -> int:
+        """
+        Load everything workers share and freeze it before forking them.
+
+        Every challenge is loaded and its lazily built state (test plans,
+        external test cases, menu orderings, the search term list) is
+        built up front, so workers only read these objects. ``gc.freeze()``
+        then moves them out of the collector's reach so a worker's garbage
+        collections don't touch their pages either. Attempt counters live
+        in a per-process store and start empty in each worker.
+
+        Reference counts are still written when workers use the objects,
+        so some pages do get copied; the bulk of the catalog stays shared.
+
+        Returns:
+            Number of challenges loaded
+        """
+        from src.challenges.submission_pipeline import get_default_pipeline
+
+        self.load_challenges()
+        challenges = self.get_all_challenges()
+        for challenge in challenges.values():
+            # Reading test_cases also loads test cases kept in separate files;
+            # challenges with hand-written test code don't use a plan
+            if all("input" in test_case for test_case in challenge.test_cases):
+                challenge.get_test_plan()
+            challenge.get_suite_hash()
+
+        with self._lock:
+            for area in {meta.area for meta in self.index.entries.values()}:
+                self.get_metadata_by_area(area)
+            self.search.warm()
+        get_default_pipeline()
+
+        gc.collect()
+        gc.freeze()
+        return len(challenges)
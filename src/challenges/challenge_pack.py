@@ -0,0 +1,217 @@
+import os
+import json
+from typing import Dict, List, Any, Callable, Optional
+
+from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.ai.evaluation_result import EvaluationResult
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs")
+# Only files with these suffixes are read as packs, so test case files can sit next to them
+PACK_SUFFIXES = (".pack.json", ".pack.toml")
+REQUIRED_FIELDS = ("id", "name", "description", "difficulty", "challenge_type", "xp_reward")
+
+
+class PackError(ValueError):
+    """Raised when a challenge pack can't be parsed."""
+
+
+def is_pack_file(name: str) -> bool:
+    """Check whether a file name is a challenge pack."""
+    return name.endswith(PACK_SUFFIXES)
+
+
+def parse_data(data: bytes, name: str) -> Any:
+    """
+    Parse a JSON or TOML document.
+
+    Args:
+        data: Raw file contents
+        name: File name, used to pick the format and in error messages
+
+    Returns:
+        The parsed document
+    """
+    try:
+        if name.endswith(".toml"):
+            if tomllib is None:
+                raise PackError(f"{name}: reading TOML needs Python 3.11+ or the 'tomli' package")
+            return tomllib.loads(data.decode("utf-8"))
+        return json.loads(data)
+    except PackError:
+        raise
+    except Exception as e:
+        raise PackError(f"{name}: {e}") from e
+
+
+def _coerce_enum(enum_cls, value: Any, name: str):
+    """Accept either an enum value ("Easy") or member name ("EASY")."""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        pass
+    try:
+        return enum_cls[str(value).upper().replace(" ", "_")]
+    except KeyError:
+        raise PackError(f"{name}: unknown {enum_cls.__name__} '{value}'") from None
+
+
+def _join_lines(value: Any) -> Any:
+    """Long text may be written as a list of lines."""
+    if isinstance(value, list):
+        return "\n".join(value)
+    return value
+
+
+def parse_pack(data: bytes, name: str) -> List[Dict[str, Any]]:
+    """
+    Parse a pack into normalized challenge specs.
+
+    A pack holds a ``challenges`` list and an optional ``pack`` table of
+    defaults (e.g. ``area``) applied to every challenge in it.
+
+    Args:
+        data: Raw pack contents
+        name: Pack file name
+
+    Returns:
+        One spec dict per challenge, with enums resolved and defaults applied
+    """
+    document = parse_data(data, name)
+    if not isinstance(document, dict) or not isinstance(document.get("challenges"), list):
+        raise PackError(f"{name}: a pack needs a 'challenges' list")
+
+    defaults = document.get("pack", {})
+    specs = []
+    for position, entry in enumerate(document["challenges"]):
+        spec = dict(defaults)
+        spec.update(entry)
+        where = f"{name} challenge {spec.get('id', position)}"
+
+        missing = [field for field in REQUIRED_FIELDS if field not in spec]
+        if missing:
+            raise PackError(f"{where}: missing {', '.join(missing)}")
+        if "test_cases" not in spec and "test_cases_file" not in spec:
+            raise PackError(f"{where}: needs 'test_cases' or 'test_cases_file'")
+
+        spec["difficulty"] = _coerce_enum(DifficultyLevel, spec["difficulty"], where)
+        spec["challenge_type"] = _coerce_enum(ChallengeType, spec["challenge_type"], where)
+        spec["description"] = _join_lines(spec["description"])
+        spec["solution"] = _join_lines(spec.get("solution"))
+        specs.append(spec)
+
+    return specs
+
+
+def parse_test_cases(data: bytes, name: str) -> List[Dict[str, Any]]:
+    """Parse an external test case file: a list, or a table with a ``test_cases`` list."""
+    document = parse_data(data, name)
+    if isinstance(document, dict):
+        document = document.get("test_cases")
+    if not isinstance(document, list):
+        raise PackError(f"{name}: expected a list of test cases")
+    return document
+
+
+def file_reader(base_dir: str) -> Callable[[str], bytes]:
+    """Build a reader for files next to a pack on disk."""
+    def read(name: str) -> bytes:
+        with open(os.path.join(base_dir, name), 'rb') as f:
+            return f.read()
+    return read
+
+
+def read_pack_file(path: str) -> List[Dict[str, Any]]:
+    """Read and parse a pack file from disk."""
+    with open(path, 'rb') as f:
+        return parse_pack(f.read(), path)
+
+
+class DeclarativeChallenge(Challenge):
+    """
+    A challenge defined entirely by data in a challenge pack.
+
+    Solutions are checked by the generic SolutionEvaluator. Test cases kept
+    in a separate file are only read when the challenge is first evaluated.
+    Challenges that need a custom verifier stay Python classes.
+    """
+
+    def __init__(self, spec: Dict[str, Any], read_file: Optional[Callable[[str], bytes]] = None):
+        """
+        Initialize a challenge from a pack spec.
+
+        Args:
+            spec: Normalized spec from parse_pack
+            read_file: Reads files referenced by the spec (e.g. test_cases_file),
+                given their name relative to the pack
+        """
+        super().__init__(
+            id=spec["id"],
+            name=spec["name"],
+            description=spec["description"],
+            difficulty=spec["difficulty"],
+            challenge_type=spec["challenge_type"],
+            xp_reward=spec["xp_reward"],
+            time_limit_seconds=spec.get("time_limit_seconds", 0),
+            test_cases=spec.get("test_cases"),
+            hints=spec.get("hints"),
+            solution=spec.get("solution"),
+            area=spec.get("area", "Algorithm Forest"),
+            primary_skill=spec.get("primary_skill"),
+            entry_point=spec.get("entry_point")
+        )
+        self.expected_time_complexity = spec.get("expected_time_complexity", "O(n)")
+        self.expected_space_complexity = spec.get("expected_space_complexity", "O(n)")
+        self.success_feedback = spec.get("success_feedback", [])
+        self.failure_feedback = spec.get("failure_feedback", [])
+        self._read_file = read_file
+        self._test_cases_file = None
+        if "test_cases" not in spec:
+            # Read on first use instead of the empty list set above
+            self._test_cases_file = spec["test_cases_file"]
+            self._test_cases = None
+
+    @property
+    def test_cases(self) -> List[Dict[str, Any]]:
+        """Test cases, read from the pack's test case file on first use."""
+        if self._test_cases is None:
+            if self._read_file is None:
+                raise PackError(f"{self.id}: no reader for '{self._test_cases_file}'")
+            self._test_cases = parse_test_cases(
+                self._read_file(self._test_cases_file), self._test_cases_file)
+        return self._test_cases
+
+    @test_cases.setter
+    def test_cases(self, value: List[Dict[str, Any]]) -> None:
+        self._test_cases = value
+
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
+        """
+        Run test cases against the user's solution.
+
+        Args:
+            user_solution: User's solution function
+
+        Returns:
+            EvaluationResult with verification results
+        """
+        from src.ai.solution_evaluator import SolutionEvaluator
+
+        evaluator = SolutionEvaluator()
+        results = evaluator.evaluate(
+            solution_func=user_solution,
+            plan=self.get_test_plan(),
+            expected_time_complexity=self.expected_time_complexity,
+            expected_space_complexity=self.expected_space_complexity
+        )
+
+        results.feedback.extend(self.success_feedback if results.success else self.failure_feedback)
+        return results
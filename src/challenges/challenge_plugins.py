@@ -0,0 +1,67 @@
+import importlib.util
+from importlib.metadata import entry_points
+from typing import List, Optional
+
+
+# Installed distributions register challenge packs under this entry point group, e.g.
+#   [project.entry-points."fantasy_coding_quest.challenge_packs"]
+#   dragon_pack = "dragon_pack.challenges"
+ENTRY_POINT_GROUP = "fantasy_coding_quest.challenge_packs"
+
+
+class PluginPack:
+    """A challenge package provided by an installed distribution."""
+
+    __slots__ = ("name", "package", "distribution", "path")
+
+    def __init__(self, name: str, package: str, distribution: Optional[str], path: str):
+        self.name = name
+        self.package = package
+        self.distribution = distribution
+        self.path = path
+
+
+def _entry_points(group: str) -> list:
+    """Entry points in a group, on both the old and new importlib.metadata APIs."""
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=group))
+    # Python < 3.10 returns a dict of group -> entry points
+    return list(eps.get(group, []))
+
+
+def discover_packs(group: str = ENTRY_POINT_GROUP) -> List[PluginPack]:
+    """
+    Find installed challenge packs without importing their modules.
+
+    Each entry point names a package of challenge modules and/or data packs.
+    Only the package's location is looked up here; the registry scans it
+    like a local challenge directory and imports modules on first use.
+
+    Args:
+        group: Entry point group to read
+
+    Returns:
+        One PluginPack per package directory
+    """
+    packs = []
+    for ep in _entry_points(group):
+        package = ep.value.split(":")[0].strip()
+        dist = getattr(ep, "dist", None)
+        distribution = dist.metadata["Name"] if dist is not None else None
+
+        try:
+            # Locating a package doesn't execute it (only its parents, if nested)
+            spec = importlib.util.find_spec(package)
+        except (ImportError, ValueError) as e:
+            print(f"Skipping challenge pack {ep.name}: {e}")
+            continue
+
+        if spec is None or not spec.submodule_search_locations:
+            print(f"Skipping challenge pack {ep.name}: {package} is not a package")
+            continue
+
+        for location in spec.submodule_search_locations:
+            packs.append(PluginPack(ep.name, package, distribution, location))
+
+    return packs
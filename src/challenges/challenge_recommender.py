@@ -0,0 +1,220 @@
+import heapq
+from typing import List, Tuple
+
+from src.challenges.challenge_base import DifficultyLevel
+from src.challenges.challenge_index import ChallengeIndex
+from src.challenges.challenge_registry import ChallengeMetadata
+
+
+_DIFFICULTY_RANK = {level: i for i, level in enumerate(DifficultyLevel)}
+
+# The character level from which each difficulty is the best fit
+DIFFICULTY_BY_LEVEL = (
+    (12, DifficultyLevel.EPIC),
+    (6, DifficultyLevel.HARD),
+    (3, DifficultyLevel.MEDIUM),
+    (1, DifficultyLevel.EASY),
+)
+
+# Lower priority is recommended first
+DIFFICULTY_WEIGHT = 3.0
+SKILL_WEIGHT = 1.0
+FAILURE_WEIGHT = 1.0
+# One failed attempt makes a challenge worth retrying soon
+RETRY_BONUS = 0.5
+# Challenges without a primary skill rank like a moderately trained skill
+NEUTRAL_SKILL_LEVEL = 3
+
+
+def target_difficulty(level: int) -> DifficultyLevel:
+    """The difficulty that best fits a character level."""
+    for min_level, difficulty in DIFFICULTY_BY_LEVEL:
+        if level >= min_level:
+            return difficulty
+    return DifficultyLevel.EASY
+
+
+class _CandidateHeap:
+    """One character's unsolved challenges, ordered by priority."""
+
+    __slots__ = ("heap", "versions", "level", "areas", "skills", "completed", "completed_names", "failures")
+
+    def __init__(self):
+        # (priority, challenge id, version); entries whose version is no
+        # longer current are stale and skipped when they reach the top
+        self.heap = []
+        self.versions = {}
+        self.level = None
+        self.areas = None
+        self.skills = {}
+        # IDs of the completed challenges, and how many names they came from
+        self.completed = set()
+        self.completed_names = 0
+        self.failures = {}
+
+
+class ChallengeRecommender:
+    """
+    Suggests the next challenges for a character.
+
+    Unsolved challenges in the character's unlocked areas are ranked by how
+    weak the character is in the challenge's primary skill, how well its
+    difficulty fits the character's level, and how earlier attempts went.
+
+    Each character has a candidate heap that is updated incrementally: a
+    completion retires one entry and a skill increase re-ranks only the
+    challenges training that skill. Only a level-up or a catalog change
+    rebuilds the heap.
+    """
+
+    def __init__(self, index: ChallengeIndex):
+        """
+        Initialize the recommender.
+
+        Args:
+            index: Challenge index to recommend from
+        """
+        self.index = index
+        # character name -> _CandidateHeap
+        self._states = {}
+        # character name -> {challenge id: failed attempts}; outlives rebuilt heaps
+        self._failures = {}
+        self._by_skill = {}
+        self._by_name = {}
+        self._catalog_version = None
+
+    def recommend(self, character, limit: int = 5) -> List[ChallengeMetadata]:
+        """
+        Get the best next challenges for a character.
+
+        Args:
+            character: The player's Character
+            limit: Maximum number of recommendations
+
+        Returns:
+            Metadata of the recommended challenges, best first
+        """
+        state = self._state(character)
+
+        picked = []
+        while state.heap and len(picked) < limit:
+            entry = heapq.heappop(state.heap)
+            if state.versions.get(entry[1]) == entry[2]:
+                picked.append(entry)
+        # Peeking shouldn't consume the recommendations
+        for entry in picked:
+            heapq.heappush(state.heap, entry)
+
+        return [self.index.entries[challenge_id] for _, challenge_id, _ in picked]
+
+    def record_attempt(self, character, challenge_id: str, success: bool) -> None:
+        """
+        Update a character's candidates after an attempt.
+
+        Args:
+            character: The player's Character
+            challenge_id: ID of the attempted challenge
+            success: Whether the attempt passed
+        """
+        state = self._state(character)
+        if success:
+            state.versions.pop(challenge_id, None)
+            state.completed.add(challenge_id)
+        elif challenge_id in state.versions:
+            state.failures[challenge_id] = state.failures.get(challenge_id, 0) + 1
+            self._push(state, challenge_id)
+
+    def _state(self, character) -> _CandidateHeap:
+        """Get a character's candidate heap, brought up to date with the character."""
+        if self._catalog_version != self.index.version:
+            self._index_catalog()
+
+        state = self._states.get(character.name)
+        if state is None:
+            state = self._states[character.name] = _CandidateHeap()
+            state.failures = self._failures.setdefault(character.name, {})
+
+        if state.level != character.level or state.areas != set(character.unlocked_areas):
+            self._rebuild(state, character)
+            return state
+
+        # Retire challenges completed since the last call
+        if state.completed_names != len(character.completed_challenges):
+            for name in character.completed_challenges:
+                for challenge_id in self._ids_for(name):
+                    if challenge_id not in state.completed:
+                        state.completed.add(challenge_id)
+                        state.versions.pop(challenge_id, None)
+            state.completed_names = len(character.completed_challenges)
+
+        # Re-rank only the challenges whose skill changed
+        for skill, level in character.skills.items():
+            if state.skills.get(skill) != level:
+                state.skills[skill] = level
+                for challenge_id in self._by_skill.get(skill, ()):
+                    if challenge_id in state.versions:
+                        self._push(state, challenge_id)
+
+        # Drop stale entries once they outnumber the live ones
+        if len(state.heap) > 2 * len(state.versions) + 64:
+            state.heap = [entry for entry in state.heap if state.versions.get(entry[1]) == entry[2]]
+            heapq.heapify(state.heap)
+
+        return state
+
+    def _index_catalog(self) -> None:
+        """Group the catalog by skill and drop heaps built from an older catalog."""
+        self._by_skill = {}
+        self._by_name = {}
+        for meta in self.index.entries.values():
+            self._by_name.setdefault(meta.name, []).append(meta.id)
+            if meta.primary_skill is not None:
+                self._by_skill.setdefault(meta.primary_skill, []).append(meta.id)
+        self._states = {}
+        self._catalog_version = self.index.version
+
+    def _ids_for(self, name: str) -> List[str]:
+        """IDs of the challenges a completed challenge name stands for; several can share a name."""
+        return self._by_name.get(name, [name])
+
+    def _rebuild(self, state: _CandidateHeap, character) -> None:
+        """Rank every candidate from scratch."""
+        state.level = character.level
+        state.areas = set(character.unlocked_areas)
+        state.skills = dict(character.skills)
+        state.completed = {challenge_id for name in character.completed_challenges
+                           for challenge_id in self._ids_for(name)}
+        state.completed_names = len(character.completed_challenges)
+
+        state.heap = []
+        state.versions = {}
+        for meta in self.index.entries.values():
+            if meta.area in state.areas and meta.id not in state.completed:
+                state.versions[meta.id] = 0
+                state.heap.append((self._priority(state, meta), meta.id, 0))
+        heapq.heapify(state.heap)
+
+    def _push(self, state: _CandidateHeap, challenge_id: str) -> None:
+        """Re-rank one candidate, leaving its old entry behind as stale."""
+        version = state.versions[challenge_id] + 1
+        state.versions[challenge_id] = version
+        meta = self.index.entries[challenge_id]
+        heapq.heappush(state.heap, (self._priority(state, meta), challenge_id, version))
+
+    def _priority(self, state: _CandidateHeap, meta: ChallengeMetadata) -> Tuple[float, int]:
+        """Score a challenge for a character; lower is recommended first."""
+        fit = abs(_DIFFICULTY_RANK[meta.difficulty] - _DIFFICULTY_RANK[target_difficulty(state.level)])
+        if meta.primary_skill is None:
+            skill_level = NEUTRAL_SKILL_LEVEL
+        else:
+            skill_level = state.skills.get(meta.primary_skill, NEUTRAL_SKILL_LEVEL)
+
+        score = DIFFICULTY_WEIGHT * fit + SKILL_WEIGHT * skill_level
+        failures = state.failures.get(meta.id, 0)
+        if failures == 1:
+            score -= RETRY_BONUS
+        elif failures > 1:
+            score += FAILURE_WEIGHT * (failures - 1)
+
+        # Among equals, the bigger reward first
+        return score, -meta.xp_reward
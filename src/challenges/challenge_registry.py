@@ -0,0 +1,524 @@
+import os
+import ast
+import json
+import importlib
+import inspect
+import posixpath
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.challenges.challenge_pack import (
+    PACKS_DIR, DeclarativeChallenge, PackError, file_reader, is_pack_file, parse_pack, read_pack_file
+)
+from src.challenges.challenge_bundle import ChallengeBundle, is_bundle_file
+from src.challenges.challenge_stats import get_stats_store
+
+
+# Directory containing the `src` package; module paths are relative to it
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CHALLENGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "challenges")
+# In the project, not the working directory, so every launch finds it
+DEFAULT_MANIFEST_PATH = os.path.join(PROJECT_ROOT, ".cache", "challenge_manifest.json")
+# Validating a module is mostly file I/O and parsing, so a few threads help
+MAX_VALIDATION_WORKERS = 8
+
+
+class ChallengeMetadata:
+    """
+    Everything the menus need to know about a challenge, without loading it.
+
+    Exposes the same attribute names as Challenge so menu code can use
+    either one.
+    """
+
+    __slots__ = (
+        "id", "name", "area", "difficulty", "challenge_type", "xp_reward",
+        "primary_skill", "module", "class_name", "mtime", "pack", "bundle"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        area: str,
+        difficulty: DifficultyLevel,
+        challenge_type: ChallengeType,
+        xp_reward: int,
+        primary_skill: Optional[str],
+        module: str,
+        class_name: str,
+        mtime: float,
+        pack: Optional[str] = None,
+        bundle: Optional[str] = None
+    ):
+        self.id = id
+        self.name = name
+        self.area = area
+        self.difficulty = difficulty
+        self.challenge_type = challenge_type
+        self.xp_reward = xp_reward
+        self.primary_skill = primary_skill
+        self.module = module
+        self.class_name = class_name
+        self.mtime = mtime
+        # Path of the pack file for declarative challenges, None for Python ones
+        self.pack = pack
+        # Path of the .zip the module or pack is read from; pack is then a member name
+        self.bundle = bundle
+
+    @classmethod
+    def from_challenge(
+        cls, challenge: Challenge, module: str, mtime: float, bundle: Optional[str] = None
+    ) -> "ChallengeMetadata":
+        """Collect the metadata of an instantiated challenge."""
+        return cls(
+            id=challenge.id,
+            name=challenge.name,
+            area=challenge.area,
+            difficulty=challenge.difficulty,
+            challenge_type=challenge.challenge_type,
+            xp_reward=challenge.xp_reward,
+            primary_skill=challenge.primary_skill,
+            module=module,
+            class_name=type(challenge).__name__,
+            mtime=mtime,
+            bundle=bundle
+        )
+
+    @classmethod
+    def from_spec(
+        cls, spec: Dict[str, Any], pack: str, mtime: float, bundle: Optional[str] = None
+    ) -> "ChallengeMetadata":
+        """Collect the metadata of a declarative challenge from its pack spec."""
+        return cls(
+            id=spec["id"],
+            name=spec["name"],
+            area=spec.get("area", "Algorithm Forest"),
+            difficulty=spec["difficulty"],
+            challenge_type=spec["challenge_type"],
+            xp_reward=spec["xp_reward"],
+            primary_skill=spec.get("primary_skill"),
+            module=None,
+            class_name=DeclarativeChallenge.__name__,
+            mtime=mtime,
+            pack=pack,
+            bundle=bundle
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-friendly dict."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["difficulty"] = self.difficulty.value
+        data["challenge_type"] = self.challenge_type.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChallengeMetadata":
+        """Build metadata from a manifest entry."""
+        values = {name: data.get(name) for name in cls.__slots__}
+        values["difficulty"] = DifficultyLevel(data["difficulty"])
+        values["challenge_type"] = ChallengeType(data["challenge_type"])
+        return cls(**values)
+
+
+class ChallengeRegistry:
+    """
+    Lazily loaded catalog of challenges backed by an on-disk manifest.
+
+    Startup walks the challenge packages and stats each module, pack and
+    zipped bundle; only files whose mtime or size changed since the
+    manifest was written are validated (in parallel) and imported or
+    parsed. Challenges are instantiated when they are first requested.
+    """
+
+    MANIFEST_VERSION = 4
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH, challenge_dirs: Optional[List[str]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            manifest_path: Where the metadata manifest is cached
+            challenge_dirs: Directories to scan recursively for challenge modules,
+                packs and bundles, or paths of individual .zip bundles
+        """
+        self.manifest_path = manifest_path
+        self.challenge_dirs = challenge_dirs or [CHALLENGES_DIR, PACKS_DIR]
+        # Directories of installed packages -> their package name; see add_package
+        self.package_roots = {}
+        # file path -> {"mtime", "size", "module", "challenges": [metadata dict, ...]}
+        self.files = {}
+        self.entries = {}
+        self._instances = {}
+        # (bundle path, pack path) -> {challenge id: spec}, parsed on first use
+        self._packs = {}
+        # bundle path -> ChallengeBundle, opened on first use
+        self._bundles = {}
+        # Held while the catalog changes, so a watcher thread can refresh it
+        self._lock = threading.RLock()
+
+    def refresh(self) -> List[str]:
+        """
+        Bring the manifest up to date with the challenge files on disk.
+
+        Safe to call from a watcher thread while the game is running: changed
+        modules are reloaded and the new catalog is swapped in under a lock.
+
+        Returns:
+            IDs of the challenges that were added, changed or removed
+        """
+        with self._lock:
+            # After the first refresh the in-memory copy is the manifest
+            manifest = self.files or self._read_manifest()
+            files = {}
+            stale = []
+
+            for path, mtime, size in self._scan():
+                cached = manifest.get(path)
+                if cached is not None and cached["mtime"] == mtime and cached["size"] == size:
+                    files[path] = cached
+                else:
+                    stale.append((path, mtime, size))
+
+            modules = [path for path, _, _ in stale if path.endswith(".py")]
+            candidates = dict(zip(modules, self._validate_all(modules)))
+
+            changed = set()
+            for path, mtime, size in stale:
+                if path in candidates:
+                    module_path = self._module_path(path)
+                    # Modules without challenge classes are recorded so they aren't re-read
+                    harvested = []
+                    if candidates[path]:
+                        # A module this registry already imported was edited: re-execute it
+                        harvested = self._harvest(module_path, mtime, reload=path in self.files)
+                elif is_bundle_file(path):
+                    module_path = None
+                    harvested = self._harvest_bundle(path, mtime)
+                else:
+                    module_path = None
+                    harvested = self._harvest_pack(path, mtime)
+                files[path] = {
+                    "mtime": mtime,
+                    "size": size,
+                    "module": module_path,
+                    "challenges": [meta.to_dict() for meta in harvested]
+                }
+                changed.update(meta.id for meta in harvested)
+
+            if stale or set(files) != set(manifest):
+                self._write_manifest(files)
+
+            entries = {}
+            for file_info in files.values():
+                for data in file_info["challenges"]:
+                    meta = ChallengeMetadata.from_dict(data)
+                    entries[meta.id] = meta
+            # Entries read from the manifest are new to this process too
+            changed.update(entries.keys() ^ self.entries.keys())
+
+            self.files = files
+            self.entries = entries
+
+            # Forget instances of challenges that no longer exist
+            for challenge_id in list(self._instances):
+                if challenge_id not in self.entries:
+                    self._drop_instance(challenge_id)
+            for bundle_path, pack_path in list(self._packs):
+                if (bundle_path or pack_path) not in files:
+                    del self._packs[(bundle_path, pack_path)]
+            for path in list(self._bundles):
+                if path not in files:
+                    self._close_bundle(path)
+
+            return sorted(changed)
+
+    def add_package(self, path: str, package: str) -> None:
+        """
+        Scan an installed package's directory for challenges.
+
+        Args:
+            path: Directory of the package
+            package: Dotted name its modules are imported under
+        """
+        with self._lock:
+            self.package_roots[path] = package
+            if path not in self.challenge_dirs:
+                self.challenge_dirs.append(path)
+
+    def get_metadata(self, challenge_id: str) -> Optional[ChallengeMetadata]:
+        """Get the manifest entry of a challenge."""
+        return self.entries.get(challenge_id)
+
+    def list_metadata(self, area: Optional[str] = None) -> List[ChallengeMetadata]:
+        """List manifest entries, optionally only those in one area."""
+        if area is None:
+            return list(self.entries.values())
+        return [meta for meta in self.entries.values() if meta.area == area]
+
+    def get(self, challenge_id: str) -> Optional[Challenge]:
+        """Get a challenge, importing and instantiating it on first use."""
+        challenge = self._instances.get(challenge_id)
+        if challenge is not None:
+            return challenge
+
+        with self._lock:
+            challenge = self._instances.get(challenge_id)
+            if challenge is not None:
+                return challenge
+
+            meta = self.entries.get(challenge_id)
+            if meta is None:
+                return None
+
+            if meta.pack is not None:
+                challenge = self._build_declarative(meta)
+            else:
+                if meta.bundle is not None:
+                    self._bundle(meta.bundle).mount()
+                module = importlib.import_module(meta.module)
+                challenge = getattr(module, meta.class_name)()
+            self._instances[challenge_id] = challenge
+            return challenge
+
+    def _scan(self) -> Iterator[Tuple[str, float, int]]:
+        """Yield (path, mtime, size) for every challenge file, one stat each."""
+        for directory in self.challenge_dirs:
+            if os.path.isdir(directory):
+                yield from self._scan_dir(directory)
+            elif is_bundle_file(directory) and os.path.isfile(directory):
+                stat = os.stat(directory)
+                yield directory, stat.st_mtime, stat.st_size
+
+    def _scan_dir(self, directory: str) -> Iterator[Tuple[str, float, int]]:
+        """Recursively scan one directory in a stable order."""
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+
+        for entry in entries:
+            if entry.name.startswith((".", "__")):
+                continue
+            if entry.is_dir():
+                yield from self._scan_dir(entry.path)
+            elif entry.name.endswith(".py") or is_pack_file(entry.name) or is_bundle_file(entry.name):
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def _module_path(self, path: str) -> str:
+        """Convert a module file path into a dotted import path."""
+        for root, package in self.package_roots.items():
+            if path.startswith(root + os.sep):
+                return package + "." + os.path.relpath(path, root)[:-3].replace(os.sep, ".")
+
+        rel_path = os.path.relpath(path, PROJECT_ROOT)
+        return rel_path[:-3].replace(os.sep, ".")
+
+    def _validate_all(self, paths: List[str]) -> List[List[str]]:
+        """Validate changed modules in parallel; see _validate."""
+        if len(paths) <= 1:
+            return [self._validate(path) for path in paths]
+
+        workers = min(MAX_VALIDATION_WORKERS, len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._validate, paths))
+
+    @staticmethod
+    def _validate(path: str) -> List[str]:
+        """
+        Check a module without importing it.
+
+        Returns:
+            Names of classes that look like challenges, so modules without
+            any (helpers, broken files) are never imported
+        """
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+        except OSError as e:
+            print(f"Skipping invalid challenge module {path}: {e}")
+            return []
+        return ChallengeRegistry._find_challenge_classes(source, path)
+
+    @staticmethod
+    def _find_challenge_classes(source: bytes, path: str) -> List[str]:
+        """Parse module source and list the classes that look like challenges."""
+        try:
+            tree = ast.parse(source, filename=path)
+        except (SyntaxError, ValueError) as e:
+            print(f"Skipping invalid challenge module {path}: {e}")
+            return []
+
+        candidates = []
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                for base in node.bases:
+                    name = base.id if isinstance(base, ast.Name) else getattr(base, "attr", "")
+                    if name.endswith("Challenge"):
+                        candidates.append(node.name)
+                        break
+        return candidates
+
+    def _harvest(
+        self, module_path: str, mtime: float, bundle: Optional[str] = None, reload: bool = False
+    ) -> List[ChallengeMetadata]:
+        """
+        Import a changed module and collect metadata for its challenges.
+
+        Args:
+            module_path: Dotted module name
+            mtime: Modification time recorded in the manifest
+            bundle: Path of the bundle the module is imported from, if any
+            reload: Re-execute the module if it was already imported
+        """
+        try:
+            module = sys.modules.get(module_path)
+            if reload and module is not None:
+                self._discard_bytecode(module)
+                module = importlib.reload(module)
+            else:
+                module = importlib.import_module(module_path)
+        except Exception as e:
+            print(f"Error loading challenge from {module_path}: {e}")
+            return []
+
+        harvested = []
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, Challenge) and obj.__module__ == module.__name__
+                    and not inspect.isabstract(obj)):
+                try:
+                    challenge = obj()
+                except Exception as e:
+                    print(f"Error loading challenge {name} from {module_path}: {e}")
+                    continue
+
+                # The instance is already paid for, so keep it
+                self._drop_instance(challenge.id)
+                self._instances[challenge.id] = challenge
+                harvested.append(ChallengeMetadata.from_challenge(challenge, module_path, mtime, bundle))
+
+        return harvested
+
+    def _drop_instance(self, challenge_id: str) -> None:
+        """Forget a challenge's instance and the attempt stats kept for it."""
+        challenge = self._instances.pop(challenge_id, None)
+        if challenge is not None:
+            get_stats_store().discard(challenge._stats_key)
+
+    @staticmethod
+    def _discard_bytecode(module) -> None:
+        """
+        Remove a module's cached bytecode before reloading it.
+
+        .pyc files record the source mtime in whole seconds, so a quick edit
+        that keeps the file size would otherwise reload the old code.
+        """
+        cached = getattr(module, "__cached__", None)
+        if cached:
+            try:
+                os.remove(cached)
+            except OSError:
+                pass
+
+    def _harvest_pack(self, path: str, mtime: float, bundle: Optional[str] = None) -> List[ChallengeMetadata]:
+        """Parse a changed pack and collect metadata for its challenges."""
+        try:
+            specs = self._read_pack(path, bundle)
+        except (OSError, PackError) as e:
+            print(f"Error loading challenge pack {path}: {e}")
+            self._packs.pop((bundle, path), None)
+            return []
+
+        self._packs[(bundle, path)] = {spec["id"]: spec for spec in specs}
+        # Instances built from the old version of the pack are out of date
+        for spec in specs:
+            self._drop_instance(spec["id"])
+        return [ChallengeMetadata.from_spec(spec, path, mtime, bundle) for spec in specs]
+
+    def _harvest_bundle(self, path: str, mtime: float) -> List[ChallengeMetadata]:
+        """Collect metadata from the modules and packs of a changed bundle."""
+        self._close_bundle(path)
+        try:
+            bundle = self._bundle(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"Error loading challenge bundle {path}: {e}")
+            return []
+
+        harvested = []
+        modules = [(member, self._find_challenge_classes(bundle.read(member), posixpath.join(path, member)))
+                   for member in bundle.module_members()]
+        if any(candidates for _, candidates in modules):
+            bundle.mount()
+            importlib.invalidate_caches()
+            for member, candidates in modules:
+                if candidates:
+                    harvested.extend(self._harvest(bundle.module_name(member), mtime, bundle=path))
+
+        for member in bundle.members_matching(is_pack_file):
+            harvested.extend(self._harvest_pack(member, mtime, bundle=path))
+        return harvested
+
+    def _read_pack(self, path: str, bundle: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read a pack from disk or from a bundle member."""
+        if bundle is None:
+            return read_pack_file(path)
+        return parse_pack(self._bundle(bundle).read(path), posixpath.join(bundle, path))
+
+    def _build_declarative(self, meta: ChallengeMetadata) -> Challenge:
+        """Instantiate a declarative challenge, parsing its pack on first use."""
+        key = (meta.bundle, meta.pack)
+        specs = self._packs.get(key)
+        if specs is None:
+            specs = {spec["id"]: spec for spec in self._read_pack(meta.pack, meta.bundle)}
+            self._packs[key] = specs
+
+        if meta.bundle is None:
+            read_file = file_reader(os.path.dirname(meta.pack))
+        else:
+            read_file = self._bundle(meta.bundle).reader(posixpath.dirname(meta.pack))
+        return DeclarativeChallenge(specs[meta.id], read_file)
+
+    def _bundle(self, path: str) -> ChallengeBundle:
+        """Get an open bundle, reading its central directory on first use."""
+        bundle = self._bundles.get(path)
+        if bundle is None:
+            bundle = ChallengeBundle(path)
+            self._bundles[path] = bundle
+        return bundle
+
+    def _close_bundle(self, path: str) -> None:
+        """Close a bundle and unload its modules, e.g. because the zip changed."""
+        bundle = self._bundles.pop(path, None)
+        if bundle is not None:
+            bundle.unmount()
+            bundle.close()
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cached manifest, or return an empty one."""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("version") != self.MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _write_manifest(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically write the manifest."""
+        directory = os.path.dirname(self.manifest_path)
+        try:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": self.MANIFEST_VERSION, "files": files}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            # A read-only install still works, it just rescans next time
+            print(f"Could not write challenge manifest: {e}")
@@ -0,0 +1,228 @@
+import os
+import re
+import json
+import math
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Any, Callable, Tuple
+from src.challenges.challenge_registry import PROJECT_ROOT
+
+
+DEFAULT_SEARCH_INDEX_PATH = os.path.join(PROJECT_ROOT, ".cache", "search_index.json")
+
+# Words in the name count more than words in the description or hints
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0, "hints": 1.0}
+# A query word that is only a prefix of an indexed word scores less than an exact match
+PREFIX_WEIGHT = 0.5
+# Bounds the work a short prefix like "co" can cause
+MAX_PREFIX_EXPANSIONS = 32
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have if in into is it its
+of on or that the their then there these this to was were will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers like ``two_sum`` or ``has-cycle`` become separate words,
+    and single characters and common English words are dropped.
+    """
+    return [token for token in _TOKEN_RE.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+class ChallengeSearch:
+    """
+    Inverted index for full-text search over challenge names, descriptions and hints.
+
+    Results are ranked by TF-IDF, and query words also match indexed words
+    they are a prefix of. The index is kept in sync with the registry one
+    challenge at a time, keyed by the mtime recorded in the manifest, and
+    persisted next to it so a warm start doesn't load any challenge.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str = DEFAULT_SEARCH_INDEX_PATH):
+        """
+        Initialize the index.
+
+        Args:
+            path: Where the index is persisted
+        """
+        self.path = path
+        # term -> {challenge id: weighted term frequency}
+        self.postings = {}
+        # challenge id -> (mtime it was indexed at, its terms)
+        self.docs = {}
+        self._terms = None
+
+    def add(self, challenge_id: str, fields: Dict[str, str], version: Any = None) -> None:
+        """
+        Index a challenge, replacing any previous version of it.
+
+        Args:
+            challenge_id: ID of the challenge
+            fields: Text per field ("name", "description", "hints")
+            version: Marker of the indexed version, e.g. the source file's mtime
+        """
+        self.remove(challenge_id)
+
+        weights = defaultdict(float)
+        for field, text in fields.items():
+            field_weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text):
+                weights[token] += field_weight
+
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._terms = None
+            postings[challenge_id] = weight
+        self.docs[challenge_id] = (version, list(weights))
+
+    def add_challenge(self, challenge, version: Any = None) -> None:
+        """Index a Challenge's name, description and hints."""
+        self.add(challenge.id, {
+            "name": challenge.name,
+            "description": challenge.description or "",
+            "hints": " ".join(challenge.hints)
+        }, version)
+
+    def remove(self, challenge_id: str) -> None:
+        """Drop a challenge from the index."""
+        doc = self.docs.pop(challenge_id, None)
+        if doc is None:
+            return
+
+        for term in doc[1]:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(challenge_id, None)
+            if not postings:
+                del self.postings[term]
+                self._terms = None
+
+    def sync(self, entries: Dict[str, Any], fetch: Callable[[str], Any]) -> bool:
+        """
+        Bring the index in line with the registry.
+
+        Args:
+            entries: Challenge ID -> metadata (anything with an ``mtime``)
+            fetch: Returns the Challenge for an ID; only called for new or
+                changed challenges
+
+        Returns:
+            True if the index changed
+        """
+        changed = False
+        for challenge_id in [i for i in self.docs if i not in entries]:
+            self.remove(challenge_id)
+            changed = True
+
+        for challenge_id, meta in entries.items():
+            doc = self.docs.get(challenge_id)
+            if doc is not None and doc[0] == meta.mtime:
+                continue
+            challenge = fetch(challenge_id)
+            if challenge is not None:
+                self.add_challenge(challenge, meta.mtime)
+                changed = True
+
+        return changed
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the challenges best matching a query.
+
+        Args:
+            query: Words to search for
+            limit: Maximum number of results
+
+        Returns:
+            (challenge ID, score) pairs, best match first
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.docs:
+            return []
+
+        doc_count = len(self.docs)
+        scores = defaultdict(float)
+        for token in tokens:
+            for term in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + doc_count / len(postings))
+                boost = idf if term == token else idf * PREFIX_WEIGHT
+                for challenge_id, weight in postings.items():
+                    scores[challenge_id] += weight * boost
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+    def warm(self) -> None:
+        """Build the sorted term list now instead of on the first query."""
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+
+    def _expand(self, token: str) -> List[str]:
+        """Indexed terms starting with a query word, the exact word first."""
+        self.warm()
+        terms = self._terms
+        start = bisect_left(terms, token)
+        matches = []
+        for position in range(start, min(start + MAX_PREFIX_EXPANSIONS, len(terms))):
+            if not terms[position].startswith(token):
+                break
+            matches.append(terms[position])
+        return matches
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a JSON-friendly dict."""
+        return {
+            "version": self.VERSION,
+            "docs": {challenge_id: [version, terms] for challenge_id, (version, terms) in self.docs.items()},
+            "postings": self.postings
+        }
+
+    def load(self) -> bool:
+        """
+        Load the persisted index, if there is a usable one.
+
+        Returns:
+            True if the index was loaded
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != self.VERSION:
+            return False
+
+        self.docs = {challenge_id: (version, terms) for challenge_id, (version, terms) in data["docs"].items()}
+        self.postings = data["postings"]
+        self._terms = None
+        return True
+
+    def save(self) -> None:
+        """Atomically persist the index."""
+        directory = os.path.dirname(self.path)
+        try:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Search still works, the index is just rebuilt next time
+            print(f"Could not write search index: {e}")
@@ -0,0 +1,64 @@
+import os
+import itertools
+from typing import Dict
+
+
+class ChallengeStats:
+    """Attempt counters of one challenge instance."""
+
+    __slots__ = ("attempted", "completed", "best_time")
+
+    def __init__(self):
+        self.attempted = 0
+        self.completed = 0
+        self.best_time = float('inf')
+
+
+class StatsStore:
+    """
+    Per-process store for the counters that change on every attempt.
+
+    Keeping them here instead of on the challenge objects means a worker
+    forked from a process with a loaded registry never writes to the
+    challenges it shares with its parent, so their memory pages stay
+    shared. Each forked child starts with an empty store.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._keys = itertools.count()
+
+    def new_key(self) -> int:
+        """Allocate the key a new challenge instance keeps its stats under."""
+        return next(self._keys)
+
+    def get(self, key: int) -> ChallengeStats:
+        """Get the stats for a key, creating them on first use."""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ChallengeStats()
+        return stats
+
+    def discard(self, key: int) -> None:
+        """Forget the stats of a challenge instance that is no longer used."""
+        self._stats.pop(key, None)
+
+    def snapshot(self) -> Dict[int, ChallengeStats]:
+        """The stats recorded so far in this process."""
+        return dict(self._stats)
+
+    def reset(self) -> None:
+        """Forget all stats, e.g. in a freshly forked worker."""
+        self._stats = {}
+
+
+_store = StatsStore()
+
+if hasattr(os, "register_at_fork"):
+    # Workers count their own attempts; the parent's counts aren't theirs
+    os.register_at_fork(after_in_child=_store.reset)
+
+
+def get_stats_store() -> StatsStore:
+    """Get this process's stats store."""
+    return _store
@@ -0,0 +1,78 @@
+import os
+import threading
+from typing import Callable, List, Optional
+
+
+# Set to 1 to reload edited challenges while the game is running
+HOT_RELOAD_ENV = "FANTASY_QUEST_HOT_RELOAD"
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def hot_reload_enabled() -> bool:
+    """Check whether hot reload was requested through the environment."""
+    return os.environ.get(HOT_RELOAD_ENV, "").lower() in ("1", "true", "yes")
+
+
+class ChallengeWatcher:
+    """
+    Background thread that reloads challenges edited on disk.
+
+    Every ``interval`` seconds it asks the loader to refresh, which stats
+    the challenge files and only re-imports or re-parses the ones whose
+    mtime or size changed. Menus see the new challenges on their next draw.
+    """
+
+    def __init__(
+        self,
+        loader,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_change: Optional[Callable[[List[str]], None]] = None
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            loader: ChallengeLoader to keep up to date
+            interval: Seconds between polls
+            on_change: Called with the changed challenge IDs after a reload
+        """
+        self.loader = loader
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="challenge-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> List[str]:
+        """
+        Check for changes once.
+
+        Returns:
+            IDs of the challenges that were reloaded or removed
+        """
+        changed = self.loader.load_challenges()
+        if changed and self.on_change is not None:
+            self.on_change(changed)
+        return changed
+
+    def _run(self) -> None:
+        """Poll until stopped; errors are reported and polling continues."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error reloading challenges: {e}")
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Callable
+from typing import Callable
 from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.ai.evaluation_result import EvaluationResult
 
 
 class BinarySearchChallenge(Challenge):
@@ -92,10 +93,11 @@ class BinarySearchChallenge(Challenge):
             test_cases=test_cases,
             hints=hints,
             solution=solution,
-            area="Algorithm Forest"
+            area="Algorithm Forest",
+            primary_skill="SEARCHING"
         )
 
-    def verify_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
         """
         Run test cases against the user's solution.
 
@@ -103,14 +105,14 @@ class BinarySearchChallenge(Challenge):
             user_solution: User's solution function
 
         Returns:
-            Dict with verification results
+            EvaluationResult with verification results
         """
         from src.ai.solution_evaluator import SolutionEvaluator
 
         evaluator = SolutionEvaluator()
         return evaluator.evaluate(
             solution_func=user_solution,
-            test_cases=self.test_cases,
+            plan=self.get_test_plan(),
             expected_time_complexity="O(log n)",
             expected_space_complexity="O(1)"
         )
@@ -1,5 +1,6 @@
-from typing import List, Dict, Any, Callable
+from typing import Callable
 from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.ai.evaluation_result import EvaluationResult
 
 
 class HelloWorldChallenge(Challenge):
@@ -65,7 +66,7 @@ class HelloWorldChallenge(Challenge):
             area="Algorithm Forest"
         )
 
-    def verify_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
         """
         Run test cases against the user's solution.
 
@@ -73,26 +74,26 @@ class HelloWorldChallenge(Challenge):
             user_solution: User's solution function
 
         Returns:
-            Dict with verification results
+            EvaluationResult with verification results
         """
         from src.ai.solution_evaluator import SolutionEvaluator
 
         evaluator = SolutionEvaluator()
         results = evaluator.evaluate(
             solution_func=user_solution,
-            test_cases=self.test_cases
+            plan=self.get_test_plan()
         )
 
         # Add extra beginner-friendly feedback
-        if results["success"]:
-            results["feedback"].append(
+        if results.success:
+            results.feedback.append(
                 "Congratulations on completing your first challenge!")
-            results["feedback"].append(
+            results.feedback.append(
                 "This is the beginning of your journey. You'll tackle more complex challenges as you progress.")
         else:
-            results["feedback"].append(
+            results.feedback.append(
                 "Don't worry if you didn't get it right the first time. Coding is all about learning from mistakes.")
-            results["feedback"].append(
+            results.feedback.append(
                 "Check if your function name is exactly 'hello_world' and that you're returning the exact string \"Hello, magical world!\"")
 
         return results
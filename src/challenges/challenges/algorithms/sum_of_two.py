@@ -1,6 +1,7 @@
 import time
-from typing import List, Dict, Any, Callable
+from typing import Callable
 from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.ai.evaluation_result import EvaluationResult
 
 
 class SumOfTwoChallenge(Challenge):
@@ -76,28 +77,28 @@ class SumOfTwoChallenge(Challenge):
             area="Algorithm Forest"
         )
 
-    def verify_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
         """Run test cases against the user's solution."""
         from src.ai.solution_evaluator import SolutionEvaluator
 
         evaluator = SolutionEvaluator()
         results = evaluator.evaluate(
             solution_func=user_solution,
-            test_cases=self.test_cases
+            plan=self.get_test_plan()
         )
 
         # Add beginner-friendly explanation of the solution
-        if results["success"]:
-            results["feedback"].append(
+        if results.success:
+            results.feedback.append(
                 "Great job! You've mastered the addition spell.")
-            results["feedback"].append("Let's understand what your code did:")
-            results["feedback"].append(
+            results.feedback.append("Let's understand what your code did:")
+            results.feedback.append(
                 "1. You created a function that takes two parameters (a and b)")
-            results["feedback"].append(
+            results.feedback.append(
                 "2. You added them together with the + operator")
-            results["feedback"].append(
+            results.feedback.append(
                 "3. You returned the result to the caller")
-            results["feedback"].append(
+            results.feedback.append(
                 "This pattern of taking inputs, processing them, and returning a result is the foundation of most functions you'll write!")
 
         return results
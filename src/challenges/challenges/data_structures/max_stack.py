@@ -1,5 +1,7 @@
-from typing import List, Dict, Any, Callable
+from typing import Callable
 from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.ai.evaluation_result import EvaluationResult, TestCaseResult
+from src.ai.output_capture import capture_output
 
 
 class MaxStackChallenge(Challenge):
@@ -138,19 +140,16 @@ class MaxStack:
             test_cases=test_cases,
             hints=hints,
             solution=solution,
-            area="Data Structure Mountains"
+            area="Data Structure Mountains",
+            entry_point="MaxStack",
+            primary_skill="ARRAYS"
         )
 
-    def verify_solution(self, user_solution: Callable) -> Dict[str, Any]:
+    def verify_solution(self, user_solution: Callable) -> EvaluationResult:
         """
         Special verification for class implementations.
         """
-        results = {
-            "success": True,
-            "test_cases": [],
-            "time_taken": 0,
-            "feedback": []
-        }
+        results = EvaluationResult()
 
         import time
         start_time = time.time()
@@ -159,64 +158,65 @@ class MaxStack:
         MaxStack = user_solution
 
         for i, tc in enumerate(self.test_cases):
-            test_result = {
-                "passed": True,
-                "input": tc["input"],
-                "expected": tc["expected"],
-                "actual": []
-            }
-
-            try:
-                obj = None
-
-                for j, operation in enumerate(tc["input"]):
-                    method_name = operation["method"]
-                    args = operation["args"]
-
-                    if method_name == "__init__":
-                        obj = MaxStack()
-                        test_result["actual"].append(None)
-                    else:
-                        if not obj:
-                            raise ValueError("Object not initialized")
-
-                        # Get the method from the object
-                        method = getattr(obj, method_name)
-
-                        # Call the method with the arguments
-                        result = method(*args)
-                        test_result["actual"].append(result)
-
-                # Check if the actual results match the expected results
-                if test_result["actual"] != tc["expected"]:
-                    test_result["passed"] = False
-                    test_result["error"] = f"Expected {tc['expected']}, but got {test_result['actual']}"
-                    results["success"] = False
-
-            except Exception as e:
-                test_result["passed"] = False
-                test_result["error"] = str(e)
-                results["success"] = False
-
-            results["test_cases"].append(test_result)
-
-        results["time_taken"] = time.time() - start_time
+            test_result = TestCaseResult(
+                passed=True,
+                input=tc["input"],
+                expected=tc["expected"],
+                actual=[]
+            )
+
+            with capture_output() as capture:
+                try:
+                    obj = None
+
+                    for j, operation in enumerate(tc["input"]):
+                        method_name = operation["method"]
+                        args = operation["args"]
+
+                        if method_name == "__init__":
+                            obj = MaxStack()
+                            test_result.actual.append(None)
+                        else:
+                            if not obj:
+                                raise ValueError("Object not initialized")
+
+                            # Get the method from the object
+                            method = getattr(obj, method_name)
+
+                            # Call the method with the arguments
+                            result = method(*args)
+                            test_result.actual.append(result)
+
+                    # Check if the actual results match the expected results
+                    if test_result.actual != tc["expected"]:
+                        test_result.passed = False
+                        test_result.error = f"Expected {tc['expected']}, but got {test_result.actual}"
+                        results.success = False
+
+                except Exception as e:
+                    test_result.passed = False
+                    test_result.error = str(e)
+                    results.success = False
+
+            test_result.output = capture.result()
+            results.test_cases.append(test_result)
+
+        results.time_taken = time.time() - start_time
 
         # Generate feedback
-        if results["success"]:
-            results["feedback"].append(
+        if results.success:
+            results.feedback.append(
                 "Great job! Your MaxStack implementation works correctly.")
-            results["feedback"].append(
-                f"Your solution ran in {results['time_taken']:.5f} seconds.")
+            results.feedback.append(
+                f"Your solution ran in {results.time_taken:.5f} seconds.")
         else:
-            failed_count = sum(
-                1 for tc in results["test_cases"] if not tc["passed"])
-            results["feedback"].append(
+            failed_count = len(results.test_cases) - results.passed_count
+            results.feedback.append(
                 f"Your solution passed {len(self.test_cases) - failed_count} out of {len(self.test_cases)} test cases.")
 
-            for i, tc in enumerate(results["test_cases"]):
-                if not tc["passed"]:
-                    results["feedback"].append(
-                        f"Test case {i+1} failed: {tc.get('error', 'Unknown error')}")
+            for i, tc in enumerate(results.test_cases):
+                if not tc.passed:
+                    results.feedback.append(
+                        f"Test case {i+1} failed: {tc.error or 'Unknown error'}")
 
         return results
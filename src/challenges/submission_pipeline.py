@@ -0,0 +1,269 @@
+import ast
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Callable, Optional
+
+from src.ai.evaluation_result import EvaluationResult
+
+
+class PipelineError(Exception):
+    """Raised when a submission fails one of the pipeline stages."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+class CompiledSubmission:
+    """A parsed and compiled submission, ready to be loaded."""
+
+    __slots__ = ("code_hash", "entry_point", "code_object")
+
+    def __init__(self, code_hash: str, entry_point: str, code_object):
+        self.code_hash = code_hash
+        self.entry_point = entry_point
+        self.code_object = code_object
+
+
+class SubmissionPipeline:
+    """
+    Turns a user's source code into a verified, feedback-ready result.
+
+    Every submission goes through the same stages:
+    parse -> resolve -> compile -> load -> verify -> feedback.
+    Each stage is timed, the compiled code is cached by source hash and
+    verification results are cached by source hash and test suite.
+    """
+
+    STAGES = ("parse", "resolve", "compile", "load", "verify", "feedback")
+
+    def __init__(self, max_cache_size: int = 256, cache_results: bool = True):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_cache_size: Maximum number of entries kept in each stage cache
+            cache_results: Whether verification results are cached
+        """
+        self.max_cache_size = max_cache_size
+        self.cache_results = cache_results
+        self._compile_cache = OrderedDict()
+        self._result_cache = OrderedDict()
+
+    def run(self, challenge, source: str) -> EvaluationResult:
+        """
+        Run a submission through every stage of the pipeline.
+
+        Args:
+            challenge: The challenge being attempted
+            source: String containing the user's Python code
+
+        Returns:
+            EvaluationResult containing success/failure, time taken, etc.
+        """
+        timings = {}
+        cached_stages = []
+        start_time = time.perf_counter()
+
+        try:
+            compiled = self._compile(challenge, source, timings, cached_stages)
+
+            result_key = None
+            if self.cache_results:
+                result_key = (challenge.id, compiled.code_hash, challenge.get_suite_hash())
+                cached = self._cache_get(self._result_cache, result_key)
+                if cached is not None:
+                    cached_stages.extend(("load", "verify"))
+                    return self._feedback(cached.copy(), compiled, timings, cached_stages, start_time)
+
+            user_solution = self._load(compiled, timings)
+            results = self._verify(challenge, user_solution, timings)
+
+            if result_key is not None:
+                self._cache_put(self._result_cache, result_key, results.copy())
+
+            return self._feedback(results, compiled, timings, cached_stages, start_time)
+
+        except PipelineError as e:
+            return EvaluationResult(
+                success=False,
+                error=str(e),
+                stage=e.stage,
+                stage_timings=timings,
+                time_taken=time.perf_counter() - start_time
+            )
+
+    def load(self, challenge, source: str) -> Callable:
+        """
+        Compile and load a submission without verifying it.
+
+        Args:
+            challenge: The challenge the submission is for
+            source: String containing the user's Python code
+
+        Returns:
+            The submission's entry point
+
+        Raises:
+            PipelineError: If the submission can't be parsed, resolved or loaded
+        """
+        compiled = self._compile(challenge, source, {}, [])
+        return self._load(compiled, {})
+
+    def invalidate(self, challenge_id: Optional[str] = None) -> None:
+        """
+        Drop cached verification results.
+
+        Args:
+            challenge_id: Only drop results for this challenge, or all if None
+        """
+        if challenge_id is None:
+            self._result_cache.clear()
+            return
+
+        for key in [k for k in self._result_cache if k[0] == challenge_id]:
+            del self._result_cache[key]
+
+    def _compile(self, challenge, source: str, timings: Dict[str, float], cached_stages: List[str]) -> CompiledSubmission:
+        """Run the parse, resolve and compile stages, using the cache when possible."""
+        preferred = getattr(challenge, "entry_point", None)
+        code_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        cache_key = (code_hash, preferred)
+
+        compiled = self._cache_get(self._compile_cache, cache_key)
+        if compiled is not None:
+            cached_stages.extend(("parse", "resolve", "compile"))
+            return compiled
+
+        stage_start = time.perf_counter()
+        try:
+            tree = ast.parse(source, filename="<submission>")
+        except SyntaxError as e:
+            raise PipelineError("parse", f"Syntax error on line {e.lineno}: {e.msg}")
+        timings["parse"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        entry_point = self._resolve_entry_point(tree, preferred)
+        timings["resolve"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        try:
+            code_object = compile(tree, "<submission>", "exec")
+        except (SyntaxError, ValueError) as e:
+            raise PipelineError("compile", f"Error compiling your solution: {str(e)}")
+        timings["compile"] = time.perf_counter() - stage_start
+
+        compiled = CompiledSubmission(code_hash, entry_point, code_object)
+        self._cache_put(self._compile_cache, cache_key, compiled)
+        return compiled
+
+    def _resolve_entry_point(self, tree: ast.Module, preferred: Optional[str]) -> str:
+        """
+        Pick the submission's entry point from its top-level definitions.
+
+        The challenge's expected name wins. Otherwise a lone definition is
+        used; with several definitions the entry point is ambiguous and the
+        submission is rejected rather than guessed at.
+        """
+        definitions = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions.append(node.name)
+            elif isinstance(node, ast.Assign) and preferred:
+                # Allow e.g. `two_sum = lambda nums, target: ...`
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and target.id == preferred:
+                        definitions.append(target.id)
+
+        if preferred and preferred in definitions:
+            return preferred
+
+        if not definitions:
+            expected = f" The function should be named '{preferred}'." if preferred else ""
+            raise PipelineError("resolve", f"No function found in your solution.{expected}")
+
+        if len(definitions) == 1:
+            return definitions[0]
+
+        expected = f" Name your solution '{preferred}'." if preferred else ""
+        raise PipelineError(
+            "resolve",
+            f"Couldn't tell which function is your solution: found {', '.join(definitions)}.{expected}")
+
+    def _load(self, compiled: CompiledSubmission, timings: Dict[str, float]) -> Callable:
+        """Execute the compiled code in a fresh namespace and return its entry point."""
+        stage_start = time.perf_counter()
+        namespace = {"__name__": "__submission__"}
+        try:
+            exec(compiled.code_object, namespace)
+        except Exception as e:
+            raise PipelineError("load", f"Error executing your solution: {str(e)}")
+
+        user_solution = namespace.get(compiled.entry_point)
+        if not callable(user_solution):
+            raise PipelineError("load", f"'{compiled.entry_point}' in your solution is not callable.")
+
+        timings["load"] = time.perf_counter() - stage_start
+        return user_solution
+
+    def _verify(self, challenge, user_solution: Callable, timings: Dict[str, float]) -> EvaluationResult:
+        """Run the challenge's verifier and enforce its time limit."""
+        stage_start = time.perf_counter()
+        try:
+            results = EvaluationResult.coerce(challenge.verify_solution(user_solution))
+        except Exception as e:
+            raise PipelineError("verify", f"Error evaluating solution: {str(e)}")
+        time_taken = time.perf_counter() - stage_start
+        timings["verify"] = time_taken
+
+        results.time_taken = time_taken
+
+        # Check if time limit exceeded (if there is one)
+        if challenge.time_limit_seconds > 0 and time_taken > challenge.time_limit_seconds:
+            results.success = False
+            results.error = f"Time limit exceeded. Your solution took {time_taken:.2f}s, but the limit is {challenge.time_limit_seconds}s."
+
+        return results
+
+    def _feedback(
+        self,
+        results: EvaluationResult,
+        compiled: CompiledSubmission,
+        timings: Dict[str, float],
+        cached_stages: List[str],
+        start_time: float
+    ) -> EvaluationResult:
+        """Attach pipeline metadata so every caller renders the same shape."""
+        stage_start = time.perf_counter()
+        results.entry_point = compiled.entry_point
+        results.cached_stages = cached_stages
+        timings["feedback"] = time.perf_counter() - stage_start
+        results.stage_timings = timings
+        results.pipeline_time = time.perf_counter() - start_time
+        return results
+
+    def _cache_get(self, cache: OrderedDict, key):
+        """Look up a cache entry and mark it as recently used."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: OrderedDict, key, value) -> None:
+        """Store a cache entry, evicting the least recently used one if full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_cache_size:
+            cache.popitem(last=False)
+
+
+_default_pipeline = None
+
+
+def get_default_pipeline() -> SubmissionPipeline:
+    """Get the pipeline shared by the game, the graders and the tests."""
+    global _default_pipeline
+    if _default_pipeline is None:
+        _default_pipeline = SubmissionPipeline()
+    return _default_pipeline
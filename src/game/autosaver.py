@@ -0,0 +1,149 @@
+import time
+import threading
+from typing import Dict, Any, List, Tuple
+from src.game.save_store import save_slug
+
+
+# Seconds without new progress before a full save is written
+DEFAULT_AUTOSAVE_DELAY = 2.0
+# Journaled events after which a character is saved even if progress
+# doesn't pause, bounding what loading it has to replay
+DEFAULT_SNAPSHOT_EVENTS = 50
+
+
+class Autosaver:
+    """
+    Background thread that makes progress durable without blocking the game.
+
+    After the character makes progress the game calls ``record``, which
+    takes the character's new progress events and copies its state in
+    memory. The thread appends the events to the save journal as soon as
+    they arrive. It writes a full save, a snapshot the journal is replayed
+    on, once no new progress has come in for ``delay`` seconds or once
+    ``snapshot_events`` events have been journaled since the last one.
+
+    Pending work is taken and written under one lock, so ``flush`` also
+    waits for a write the thread has already started and a save made right
+    after it can't be replaced by an older snapshot.
+    """
+
+    def __init__(self, save_manager, delay: float = DEFAULT_AUTOSAVE_DELAY,
+                 snapshot_events: int = DEFAULT_SNAPSHOT_EVENTS):
+        """
+        Initialize the autosaver.
+
+        Args:
+            save_manager: SaveManager to write saves and journal events through
+            delay: Seconds of quiet before a full save is written
+            snapshot_events: Events after which a full save is written anyway
+        """
+        self.save_manager = save_manager
+        self.delay = delay
+        self.snapshot_events = snapshot_events
+        self._cond = threading.Condition()
+        # Held while pending work is taken and written; taken before _cond
+        self._write_lock = threading.Lock()
+        self._events = []
+        # save slug -> latest save record
+        self._snapshots = {}
+        # save slug -> events recorded since the character's last full save
+        self._unsaved = {}
+        self._last_change = 0.0
+        self._stopping = False
+        self._thread = None
+
+    def start(self) -> None:
+        """Start saving in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosaver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything still pending and stop the thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def record(self, character) -> List[Dict[str, Any]]:
+        """
+        Report progress the character has just made.
+
+        Args:
+            character: The updated Character
+
+        Returns:
+            The character's new progress events
+        """
+        events = self.save_manager.take_events(character)
+        if not events:
+            return events
+        snapshot = character.to_dict()
+        slug = save_slug(character.name)
+
+        with self._cond:
+            self._events.extend(events)
+            self._snapshots[slug] = snapshot
+            self._unsaved.setdefault(slug, []).extend(events)
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+        if self._thread is None:
+            # Not running in the background: save right away
+            self.flush()
+        return events
+
+    def flush(self) -> None:
+        """Wait for any write in progress, then write everything pending on the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                events, snapshots = self._take(True)
+            self._write(events, snapshots)
+
+    def _take(self, with_snapshots: bool) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], List]]]:
+        """Take the pending events, and the pending saves with their events if asked to."""
+        events, self._events = self._events, []
+        snapshots = []
+        if with_snapshots:
+            snapshots = [(snapshot, self._unsaved.get(slug, [])) for slug, snapshot in self._snapshots.items()]
+            self._snapshots = {}
+            self._unsaved = {}
+        return events, snapshots
+
+    def _saves_due(self) -> bool:
+        """Whether progress has been quiet, or journaled, long enough for a full save."""
+        if not self._snapshots:
+            return False
+        return (time.monotonic() - self._last_change >= self.delay
+                or max(map(len, self._unsaved.values())) >= self.snapshot_events)
+
+    def _write(self, events: List[Dict[str, Any]], snapshots: List[Tuple[Dict[str, Any], List]]) -> None:
+        """Journal the events, then write the saves."""
+        self.save_manager.journal.append(events)
+        for snapshot, snapshot_events in snapshots:
+            self.save_manager.write_record(snapshot, events=snapshot_events)
+
+    def _run(self) -> None:
+        """Save until stopped; errors are reported and saving continues."""
+        while True:
+            with self._cond:
+                while not self._stopping and not self._events and not self._saves_due():
+                    timeout = None
+                    if self._snapshots:
+                        timeout = max(0.0, self._last_change + self.delay - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    return
+
+            with self._write_lock:
+                with self._cond:
+                    events, snapshots = self._take(self._saves_due())
+                try:
+                    self._write(events, snapshots)
+                except Exception as e:
+                    print(f"Error autosaving: {e}")
@@ -1,6 +1,10 @@
-from dataclasses import dataclass, field
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping, MutableMapping, Sequence
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
 
 class CharacterClass(Enum):
@@ -11,6 +15,13 @@ class CharacterClass(Enum):
     FULLSTACK_BARD = "Fullstack Bard"
 
 
+# Progress event types; a character's progress is the result of its events
+XP_GAINED = "xp_gained"
+CHALLENGE_COMPLETED = "challenge_completed"
+SKILL_INCREASED = "skill_increased"
+AREA_UNLOCKED = "area_unlocked"
+
+
 class Skill(Enum):
     ARRAYS = "Arrays"
     LINKED_LISTS = "Linked Lists"
@@ -24,9 +35,212 @@ class Skill(Enum):
     SYSTEM_DESIGN = "System Design"
 
 
-@dataclass
+# Every character starts here
+STARTING_AREA = "Algorithm Forest"
+
+# Areas unlocked by reaching a level, in the order they open up
+AREA_UNLOCKS = {
+    "Data Structure Dungeon": 3,    # Unlocked at level 3
+    "Function Fields": 5,           # Unlocked at level 5
+    "Object-Oriented Oasis": 8,     # Unlocked at level 8
+    "Recursive Ruins": 12,          # Unlocked at level 12
+    "Debugging Desert": 15,         # Unlocked at level 15
+    "Optimization Ocean": 20        # Unlocked at level 20
+}
+
+_CLASSES = tuple(CharacterClass)
+_CLASS_VALUES = tuple(character_class.value for character_class in _CLASSES)
+_CLASS_INDEX = {character_class: index for index, character_class in enumerate(_CLASSES)}
+
+# Skill levels are kept in Skill order; either the name or the Skill finds one
+SKILL_NAMES = tuple(skill.name for skill in Skill)
+_SKILL_INDEX = {name: index for index, name in enumerate(SKILL_NAMES)}
+_SKILL_INDEX.update({skill: index for index, skill in enumerate(Skill)})
+
+
+class _Numbering:
+    """
+    Numbers for area names shared by every character.
+
+    Characters keep their unlocked areas as bits of these numbers. A name
+    is numbered the first time any character meets it, so there is one
+    number per area of the game world, plus any unknown areas found in
+    saves. The numbers depend on load order and only exist in memory:
+    saves, events and stats always name the areas.
+    """
+
+    __slots__ = ("numbers", "names", "_lock")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.numbers = {}
+        self.names = []
+        self._lock = threading.Lock()
+        for name in names:
+            self.number(name)
+
+    def number(self, name: str) -> int:
+        """Get a name's number, numbering it if it is new."""
+        number = self.numbers.get(name)
+        if number is None:
+            with self._lock:
+                number = self.numbers.get(name)
+                if number is None:
+                    number = len(self.names)
+                    # Named before it is numbered, for readers without the lock
+                    self.names.append(name)
+                    self.numbers[name] = number
+        return number
+
+
+_AREAS = _Numbering([STARTING_AREA, *AREA_UNLOCKS])
+# Unlocked areas by area bitmask; there are only a few combinations
+_AREA_LISTS = {}
+
+
+def _area_list(mask: int) -> Tuple[str, ...]:
+    """The areas in a bitmask, in the order they were numbered."""
+    areas = _AREA_LISTS.get(mask)
+    if areas is None:
+        names = _AREAS.names
+        areas = _AREA_LISTS[mask] = tuple(
+            names[number] for number in range(mask.bit_length()) if mask >> number & 1)
+    return areas
+
+
+class SkillLevels(MutableMapping):
+    """
+    A character's skill levels by skill name.
+
+    The levels are an array of unsigned 32-bit integers in Skill order. A Skill
+    works as a key too. Every character has every skill, so skills can't
+    be added or removed.
+    """
+
+    __slots__ = ("_levels",)
+
+    def __init__(self):
+        self._levels = array("I", [1] * len(SKILL_NAMES))
+
+    def __getitem__(self, skill) -> int:
+        index = _SKILL_INDEX.get(skill)
+        if index is None:
+            raise KeyError(skill)
+        return self._levels[index]
+
+    def __setitem__(self, skill, level: int) -> None:
+        index = _SKILL_INDEX.get(skill)
+        if index is None:
+            raise KeyError(skill)
+        self._levels[index] = level
+
+    def __delitem__(self, skill) -> None:
+        raise TypeError("skills can't be removed")
+
+    def __contains__(self, skill) -> bool:
+        return skill in _SKILL_INDEX
+
+    def __iter__(self):
+        return iter(SKILL_NAMES)
+
+    def __len__(self) -> int:
+        return len(SKILL_NAMES)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class CompletedChallenges(Sequence):
+    """
+    Read-only view of a character's completed challenges, in completion order.
+
+    Checking a challenge with ``in`` is a binary search. The view
+    compares equal to a list of the same names.
+    """
+
+    __slots__ = ("_character",)
+
+    def __init__(self, character: "Character"):
+        self._character = character
+
+    def __getitem__(self, index):
+        return (self._character._completed or [])[index]
+
+    def __iter__(self):
+        return iter(self._character._completed or ())
+
+    def __contains__(self, challenge_name) -> bool:
+        return self._character.has_completed(challenge_name)
+
+    def __len__(self) -> int:
+        return self._character.challenges_completed
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompletedChallenges):
+            other = list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class CharacterStats(Mapping):
+    """
+    Read-only view of a character's stats.
+
+    Values are read from the character when looked up, so the view costs
+    one small object and always shows current progress. Skills are a
+    read-only mapping and unlocked areas a tuple, so callers can't change
+    the character through them.
+    """
+
+    __slots__ = ("_character",)
+
+    _FIELDS = {
+        "name": lambda character: character.name,
+        "class": lambda character: _CLASS_VALUES[character._class],
+        "level": lambda character: character.level,
+        "experience": lambda character: character.experience,
+        "xp_to_next_level": lambda character: character.xp_to_next_level,
+        "skills": lambda character: MappingProxyType(character._skills),
+        "challenges_completed": lambda character: character.challenges_completed,
+        "unlocked_areas": lambda character: _area_list(character._areas),
+    }
+
+    def __init__(self, character: "Character"):
+        self._character = character
+
+    def __getitem__(self, key: str) -> Any:
+        field = self._FIELDS.get(key)
+        if field is None:
+            raise KeyError(key)
+        return field(self._character)
+
+    def __iter__(self):
+        return iter(self._FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class Character:
-    """Represents a player character in the game."""
+    """
+    Represents a player character in the game.
+
+    Game servers hold many characters at once, so a character is kept
+    compact: it has no instance dict, its skill levels are an array and
+    unlocked areas are a bitmask. Completed challenges are kept in
+    completion order and, to check them by binary search, sorted.
+    """
+
+    __slots__ = ("name", "_class", "level", "experience", "xp_to_next_level", "_skills",
+                 "_completed", "_completed_sorted", "_areas", "_inventory", "_events")
 
     def __init__(self, name: str, character_class: CharacterClass):
         """Initialize a character."""
@@ -37,10 +251,80 @@ class Character:
         self.xp_to_next_level = self.calculate_xp_for_level(
             2)  # XP needed for level 2
         # Start with level 1 in all skills
-        self.skills = {skill.name: 1 for skill in Skill}
-        self.completed_challenges = []
+        self._skills = SkillLevels()
+        # Completed challenge names in completion order and sorted,
+        # created with the first one
+        self._completed = None
+        self._completed_sorted = None
         # Start with the first area unlocked
-        self.unlocked_areas = ["Algorithm Forest"]
+        self._areas = 1 << _AREAS.numbers[STARTING_AREA]
+        self._inventory = None
+        # Progress events not yet taken by the save system
+        self._events = None
+
+    @property
+    def character_class(self) -> CharacterClass:
+        """The character's class."""
+        return _CLASSES[self._class]
+
+    @character_class.setter
+    def character_class(self, character_class: CharacterClass) -> None:
+        self._class = _CLASS_INDEX[character_class]
+
+    @property
+    def skills(self) -> SkillLevels:
+        """Skill levels by skill name."""
+        return self._skills
+
+    @property
+    def completed_challenges(self) -> CompletedChallenges:
+        """Completed challenges, in completion order."""
+        return CompletedChallenges(self)
+
+    @completed_challenges.setter
+    def completed_challenges(self, challenge_names: Iterable[str]) -> None:
+        self._completed = self._completed_sorted = None
+        for challenge_name in challenge_names:
+            self._add_completed(challenge_name)
+
+    @property
+    def challenges_completed(self) -> int:
+        """Number of completed challenges."""
+        return len(self._completed) if self._completed is not None else 0
+
+    @property
+    def unlocked_areas(self) -> List[str]:
+        """Unlocked area names, starting area first."""
+        return list(_area_list(self._areas))
+
+    @unlocked_areas.setter
+    def unlocked_areas(self, areas: Iterable[str]) -> None:
+        self._areas = 0
+        for area in areas:
+            self._areas |= 1 << _AREAS.number(area)
+
+    @property
+    def inventory(self) -> List[str]:
+        """Items the character carries."""
+        if self._inventory is None:
+            self._inventory = []
+        return self._inventory
+
+    def has_completed(self, challenge_name: str) -> bool:
+        """
+        Check whether a challenge was completed, by binary search.
+
+        Args:
+            challenge_name: Name of the challenge
+
+        Returns:
+            True if the character completed it
+        """
+        completed = self._completed_sorted
+        if completed is None:
+            return False
+        index = bisect_left(completed, challenge_name)
+        return index < len(completed) and completed[index] == challenge_name
 
     def calculate_xp_for_level(self, level: int) -> int:
         """
@@ -56,6 +340,15 @@ class Character:
         # This creates a curve where higher levels require more XP
         return int(50 * (level ** 2) - 150 * level + 200)
 
+    def total_experience(self) -> int:
+        """
+        Get all XP the character has earned, including XP spent on levels.
+
+        Returns:
+            XP needed to reach the current level plus the current experience
+        """
+        return self.experience + sum(self.calculate_xp_for_level(level + 1) for level in range(1, self.level))
+
     def add_experience(self, amount: int) -> bool:
         """
         Add experience points to the character and check for level up.
@@ -66,39 +359,108 @@ class Character:
         Returns:
             True if the character leveled up, False otherwise
         """
-        old_level = self.level
-        self.experience += amount
+        return self._gain_experience(amount)
 
-        # Check if we've reached the next level threshold
-        leveled_up = False
-
-        # Continue leveling up as long as we have enough XP
-        while self.experience >= self.xp_to_next_level:
-            self.level += 1
-            self.experience -= self.xp_to_next_level
-            self.xp_to_next_level = self.calculate_xp_for_level(self.level + 1)
-            leveled_up = True
-
-            # Check if new areas should be unlocked
-            self._check_area_unlocks()
-
-        return leveled_up
-
-    def complete_challenge(self, challenge_name: str, skill: Optional[str] = None, xp_gained: int = 0) -> None:
+    def complete_challenge(self, challenge_name: str, skill: Optional[str] = None, xp_gained: int = 0) -> bool:
         """
-        Mark a challenge as completed and improve a skill if applicable.
+        Award a challenge's XP, mark it as completed and improve a skill if applicable.
+
+        The XP and skill events name the challenge, so merging two sessions'
+        progress can tell which gains came from the same completion.
 
         Args:
             challenge_name: Name of the completed challenge
             skill: Skill to improve (if any)
             xp_gained: XP gained from the challenge
+
+        Returns:
+            True if the character leveled up, False otherwise
         """
-        if challenge_name not in self.completed_challenges:
-            self.completed_challenges.append(challenge_name)
+        if isinstance(skill, Skill):
+            skill = skill.name
+        leveled_up = False
+        if xp_gained:
+            leveled_up = self._gain_experience(xp_gained, challenge=challenge_name)
+
+        if not self.has_completed(challenge_name):
+            self._record(CHALLENGE_COMPLETED, challenge=challenge_name)
 
             # Improve the relevant skill if specified
             if skill and skill in self.skills:
-                self.skills[skill] += 1
+                self._record(SKILL_INCREASED, skill=skill, amount=1, challenge=challenge_name)
+        return leveled_up
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """
+        Apply a progress event to the character, without recording it.
+
+        Every change to the character's progress goes through here, so
+        replaying a character's events on its last save rebuilds its
+        current state.
+
+        Args:
+            event: Event with a "type" and that type's fields
+        """
+        event_type = event["type"]
+        if event_type == XP_GAINED:
+            self.experience += event["amount"]
+            # Continue leveling up as long as we have enough XP
+            while self.experience >= self.xp_to_next_level:
+                self.level += 1
+                self.experience -= self.xp_to_next_level
+                self.xp_to_next_level = self.calculate_xp_for_level(self.level + 1)
+        elif event_type == CHALLENGE_COMPLETED:
+            if self._add_completed(event["challenge"]):
+                # Events from before skill increases were events of their own
+                index = _SKILL_INDEX.get(event.get("skill"))
+                if index is not None:
+                    self._skills._levels[index] += 1
+        elif event_type == SKILL_INCREASED:
+            index = _SKILL_INDEX.get(event["skill"])
+            if index is not None:
+                self._skills._levels[index] += event.get("amount", 1)
+        elif event_type == AREA_UNLOCKED:
+            self._areas |= 1 << _AREAS.number(event["area"])
+
+    def take_events(self) -> List[Dict[str, Any]]:
+        """
+        Take the progress events recorded since the last call.
+
+        Returns:
+            Events in the order they happened
+        """
+        events, self._events = self._events, None
+        return events if events is not None else []
+
+    def _gain_experience(self, amount: int, **fields) -> bool:
+        """Record an XP gain and unlock areas on level up; True if leveled up."""
+        old_level = self.level
+        self._record(XP_GAINED, amount=amount, **fields)
+        if self.level == old_level:
+            return False
+
+        # Check if new areas should be unlocked
+        self._check_area_unlocks()
+        return True
+
+    def _record(self, event_type: str, **fields) -> None:
+        """Apply a new progress event and keep it for the save system."""
+        event = {"type": event_type}
+        event.update(fields)
+        self.apply(event)
+        if self._events is None:
+            self._events = []
+        self._events.append(event)
+
+    def _add_completed(self, challenge_name: str) -> bool:
+        """Add a challenge to the completed ones; False if it already was."""
+        if self.has_completed(challenge_name):
+            return False
+        if self._completed is None:
+            self._completed, self._completed_sorted = [], []
+        self._completed.append(challenge_name)
+        insort(self._completed_sorted, challenge_name)
+        return True
 
     def _check_area_unlocks(self) -> List[str]:
         """
@@ -109,38 +471,62 @@ class Character:
         """
         new_areas = []
 
-        # Define area unlock requirements
-        area_unlocks = {
-            "Data Structure Dungeon": 3,    # Unlocked at level 3
-            "Function Fields": 5,           # Unlocked at level 5
-            "Object-Oriented Oasis": 8,     # Unlocked at level 8
-            "Recursive Ruins": 12,          # Unlocked at level 12
-            "Debugging Desert": 15,         # Unlocked at level 15
-            "Optimization Ocean": 20        # Unlocked at level 20
-        }
-
         # Check each area
-        for area, required_level in area_unlocks.items():
-            if self.level >= required_level and area not in self.unlocked_areas:
-                self.unlocked_areas.append(area)
+        for area, required_level in AREA_UNLOCKS.items():
+            if self.level >= required_level and not self._areas >> _AREAS.numbers[area] & 1:
+                self._record(AREA_UNLOCKED, area=area)
                 new_areas.append(area)
 
         return new_areas
 
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self) -> CharacterStats:
         """
         Get the character's stats.
 
         Returns:
-            Dictionary with character stats
+            Read-only mapping with character stats
+        """
+        return CharacterStats(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the character's progress to a JSON-friendly dict.
+
+        Returns:
+            Save record with the class by value and skills by name
         """
         return {
             "name": self.name,
-            "class": self.character_class.value,
+            "class": _CLASS_VALUES[self._class],
             "level": self.level,
             "experience": self.experience,
-            "xp_to_next_level": self.xp_to_next_level,
-            "skills": self.skills,
-            "challenges_completed": len(self.completed_challenges),
-            "unlocked_areas": self.unlocked_areas
+            "skills": dict(zip(SKILL_NAMES, self._skills._levels)),
+            "completed_challenges": list(self.completed_challenges),
+            "unlocked_areas": list(self.unlocked_areas)
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Character":
+        """
+        Rebuild a character from a save record.
+
+        Missing fields keep a new character's defaults, so older saves
+        still load.
+
+        Args:
+            data: Record as produced by to_dict
+
+        Returns:
+            The restored Character
+        """
+        character = cls(data["name"], CharacterClass(data["class"]))
+        character.level = data.get("level", character.level)
+        character.experience = data.get("experience", character.experience)
+        character.xp_to_next_level = character.calculate_xp_for_level(character.level + 1)
+        for skill, level in data.get("skills", {}).items():
+            if skill in character.skills:
+                character.skills[skill] = level
+        character.completed_challenges = data.get("completed_challenges", [])
+        if "unlocked_areas" in data:
+            character.unlocked_areas = data["unlocked_areas"]
+        return character
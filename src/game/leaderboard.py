@@ -0,0 +1,278 @@
+import os
+import json
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from src.game.character import Character
+from src.game.save_store import save_slug
+from src.game.save_lock import file_lock
+
+
+# In a directory of its own: JSON files next to the saves would be taken
+# for saves, and rewriting them would make the save index look stale
+LEADERBOARD_DIR = "leaderboard"
+SNAPSHOT_NAME = "snapshot.json"
+LOG_NAME = "updates.ndjson"
+LEADERBOARD_VERSION = 1
+
+# What characters can be ranked by
+LEVEL = "level"
+EXPERIENCE = "experience"
+COMPLETIONS = "completions"
+CATEGORIES = (LEVEL, EXPERIENCE, COMPLETIONS)
+
+# Logged updates allowed beyond one per character before the log is
+# folded into the snapshot
+DEFAULT_COMPACT_SLACK = 1000
+
+
+def make_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The part of a save record the leaderboard ranks by.
+
+    Args:
+        record: Save record
+
+    Returns:
+        {"name", "level", "experience", "total_experience", "completions"}
+    """
+    return {
+        "name": record["name"],
+        "level": record["level"],
+        "experience": record["experience"],
+        "total_experience": Character.from_dict(record).total_experience(),
+        "completions": len(record["completed_challenges"])
+    }
+
+
+def _sort_key(category: str, slug: str, entry: Dict[str, Any]) -> Tuple:
+    """Key ordering entries best first; ties go to the alphabetically first save."""
+    if category == LEVEL:
+        return (-entry["level"], -entry["experience"], slug)
+    if category == EXPERIENCE:
+        return (-entry["total_experience"], slug)
+    return (-entry["completions"], slug)
+
+
+def _check_category(category: str) -> None:
+    """Reject categories the leaderboard doesn't rank by."""
+    if category not in CATEGORIES:
+        raise ValueError(f"unknown leaderboard category {category!r}")
+
+
+class Leaderboard:
+    """
+    Rankings of every saved character, kept up to date save by save.
+
+    For each category the characters' sort keys are kept in a sorted
+    list, so a save moves one key with bisect and a character's rank is
+    a binary search. The entries are stored next to the saves as a JSON
+    snapshot plus an append-only log of the updates since, which is
+    folded into the snapshot once it grows longer than the snapshot.
+    Updates take a lock file, and other processes' updates are picked up
+    from the log before the leaderboard is read or changed.
+    """
+
+    def __init__(self, leaderboard_dir: str, compact_slack: int = DEFAULT_COMPACT_SLACK):
+        """
+        Initialize the leaderboard, loading it if it was saved before.
+
+        Args:
+            leaderboard_dir: Directory for the leaderboard's files
+            compact_slack: Log updates allowed beyond one per character
+                before the log is folded into the snapshot
+        """
+        self.leaderboard_dir = leaderboard_dir
+        self.snapshot_path = os.path.join(leaderboard_dir, SNAPSHOT_NAME)
+        self.log_path = os.path.join(leaderboard_dir, LOG_NAME)
+        self.lock_path = self.log_path + ".lock"
+        self.compact_slack = compact_slack
+        self._lock = threading.RLock()
+        # save slug -> entry, and per category the sorted entry keys
+        self._entries = {}
+        self._ranked = {category: [] for category in CATEGORIES}
+        # Number of the last update applied
+        self._seq = 0
+        # Identity of the loaded snapshot, and how far the log has been read
+        self._snapshot_id = None
+        self._log_offset = 0
+        self._log_lines = 0
+        with self._lock:
+            self._load()
+
+    def exists(self) -> bool:
+        """Check whether the leaderboard was saved before."""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.log_path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._entries)
+
+    def update(self, record: Dict[str, Any]) -> None:
+        """
+        Rank a character as of a new save.
+
+        Args:
+            record: The saved record
+        """
+        slug = save_slug(record["name"])
+        entry = make_entry(record)
+        os.makedirs(self.leaderboard_dir, exist_ok=True)
+        with self._lock, file_lock(self.lock_path):
+            self.refresh()
+            if self._entries.get(slug) == entry:
+                return
+
+            self._seq += 1
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(dict(entry, seq=self._seq, slug=slug)) + "\n")
+                self._log_offset = f.tell()
+            self._log_lines += 1
+            self._apply(slug, entry)
+
+            if self._log_lines > len(self._entries) + self.compact_slack:
+                self._compact()
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Rank all characters from scratch.
+
+        Args:
+            records: Every save record
+        """
+        os.makedirs(self.leaderboard_dir, exist_ok=True)
+        with self._lock, file_lock(self.lock_path):
+            self._entries = {save_slug(record["name"]): make_entry(record) for record in records}
+            self._sort()
+            self._seq += 1
+            self._compact()
+
+    def top(self, category: str = LEVEL, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the best characters in a category.
+
+        Args:
+            category: One of CATEGORIES
+            count: Number of characters
+
+        Returns:
+            Entries as made by make_entry plus their "rank", best first
+        """
+        _check_category(category)
+        with self._lock:
+            self.refresh()
+            return [dict(self._entries[key[-1]], rank=rank)
+                    for rank, key in enumerate(self._ranked[category][:count], start=1)]
+
+    def rank(self, name: str, category: str = LEVEL) -> Optional[int]:
+        """
+        Get a character's rank in a category.
+
+        Args:
+            name: Character name
+            category: One of CATEGORIES
+
+        Returns:
+            1 for the best character, or None if the character isn't saved
+        """
+        _check_category(category)
+        slug = save_slug(name)
+        with self._lock:
+            self.refresh()
+            entry = self._entries.get(slug)
+            if entry is None:
+                return None
+            return bisect_left(self._ranked[category], _sort_key(category, slug, entry)) + 1
+
+    def refresh(self) -> None:
+        """Apply updates other processes have made since the leaderboard was read."""
+        with self._lock:
+            if self._snapshot_id_now() != self._snapshot_id:
+                # Compacted by another process
+                self._load()
+            else:
+                self._read_log()
+
+    def _apply(self, slug: str, entry: Dict[str, Any]) -> None:
+        """Replace a character's entry and move its keys."""
+        old = self._entries.get(slug)
+        for category, ranked in self._ranked.items():
+            if old is not None:
+                del ranked[bisect_left(ranked, _sort_key(category, slug, old))]
+            insort(ranked, _sort_key(category, slug, entry))
+        self._entries[slug] = entry
+
+    def _sort(self) -> None:
+        """Rebuild the sorted keys of every category from the entries."""
+        for category in CATEGORIES:
+            self._ranked[category] = sorted(
+                _sort_key(category, slug, entry) for slug, entry in self._entries.items())
+
+    def _load(self) -> None:
+        """Load the snapshot and replay the log after it."""
+        self._entries, self._seq = {}, 0
+        self._snapshot_id = self._snapshot_id_now()
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == LEADERBOARD_VERSION:
+                self._entries, self._seq = data["entries"], data["seq"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            # Missing or damaged: the log and later saves fill it in again
+            pass
+        self._sort()
+
+        self._log_offset = self._log_lines = 0
+        self._read_log()
+
+    def _read_log(self) -> None:
+        """Apply the complete log lines after the part already read."""
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # A line still being written is read next time
+        end = data.rfind(b"\n") + 1
+        self._log_offset += end
+        for line in data[:end].splitlines():
+            self._log_lines += 1
+            try:
+                update = json.loads(line)
+                seq, slug = update.pop("seq"), update.pop("slug")
+            except (ValueError, KeyError, AttributeError):
+                continue
+            # Updates from before the snapshot are already part of it
+            if seq > self._seq:
+                self._seq = seq
+                self._apply(slug, update)
+
+    def _compact(self) -> None:
+        """Write every entry to the snapshot and start a new, empty log."""
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": LEADERBOARD_VERSION, "seq": self._seq, "entries": self._entries}, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+        tmp_path = self.log_path + ".tmp"
+        open(tmp_path, 'w').close()
+        os.replace(tmp_path, self.log_path)
+
+        self._snapshot_id = self._snapshot_id_now()
+        self._log_offset = self._log_lines = 0
+
+    def _snapshot_id_now(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Identify the snapshot file on disk.
+
+        Compaction replaces the snapshot and then the log, so a changed
+        snapshot means the log was started over too.
+        """
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,215 @@
+import sys
+import json
+import struct
+from array import array
+from typing import Dict, Any, Callable
+
+
+# Version 1 is the original JSON save: a "challenges_completed" count and
+# an "inventory" instead of the completed challenges themselves.
+# Version 2 is the record produced by Character.to_dict.
+# Version 3 adds the save's revision, counting writes to detect lost updates.
+# Version 4 widens the binary counts and skill levels from 16 to 32 bits.
+FORMAT_VERSION = 4
+
+MAGIC = b"FCQS"
+_HEADER = struct.Struct("<4sH")
+# level, experience, skill count, completion count, unlocked area count
+_COUNTS_V2 = struct.Struct("<IqHHH")
+# level, experience, revision, skill count, completion count, unlocked area count
+_COUNTS_V3 = struct.Struct("<IqIHHH")
+_COUNTS = struct.Struct("<IqIIII")
+# array type code of the skill levels in each binary version
+_LEVEL_TYPES = {2: "H", 3: "H", 4: "I"}
+# Joins all strings of a record into one UTF-8 blob
+_SEPARATOR = "\x00"
+
+
+class SaveFormatError(ValueError):
+    """Raised when saved data can't be decoded."""
+
+
+def _v1_to_v2(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Only the count of completed challenges was saved; start an empty list."""
+    completed = record.get("completed_challenges")
+    upgraded = {
+        "name": record["name"],
+        "class": record["class"],
+        "level": int(record.get("level", 1)),
+        "experience": int(record.get("experience", 0)),
+        "skills": dict(record.get("skills", {})),
+        "completed_challenges": list(completed) if isinstance(completed, list) else [],
+        "unlocked_areas": list(record.get("unlocked_areas", ["Algorithm Forest"]))
+    }
+    if "timestamp" in record:
+        upgraded["timestamp"] = record["timestamp"]
+    return upgraded
+
+
+def _v2_to_v3(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Saves from before revisions count as never rewritten."""
+    upgraded = dict(record)
+    upgraded.setdefault("revision", 0)
+    return upgraded
+
+
+def _v3_to_v4(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Only the binary encoding changed."""
+    return record
+
+
+# version -> function upgrading a record of that version to the next one
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _v1_to_v2,
+    2: _v2_to_v3,
+    3: _v3_to_v4,
+}
+
+
+def migrate(record: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """
+    Upgrade a record to the current format version.
+
+    Args:
+        record: Decoded record
+        version: Format version the record was written in
+
+    Returns:
+        The record in the current format
+    """
+    if version > FORMAT_VERSION:
+        raise SaveFormatError(f"save format {version} is newer than this game ({FORMAT_VERSION})")
+    while version < FORMAT_VERSION:
+        record = MIGRATIONS[version](record)
+        version += 1
+    return record
+
+
+def _levels_to_bytes(levels, version: int = FORMAT_VERSION) -> bytes:
+    """Pack skill levels as little-endian unsigned integers of a binary version's width."""
+    packed = array(_LEVEL_TYPES[version], levels)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def encode(record: Dict[str, Any], debug: bool = False) -> bytes:
+    """
+    Serialize a save record.
+
+    The binary form is a magic number and format version, the numbers
+    packed with struct, and all strings in one separator-joined UTF-8
+    blob, so decoding is a handful of C-level calls however much
+    progress the character has.
+
+    Records with numbers the binary format can't hold, such as skill
+    levels past 32 bits, are written as JSON instead.
+
+    Args:
+        record: Record as produced by Character.to_dict, optionally with a timestamp
+        debug: Write indented JSON instead, for reading and diffing saves
+
+    Returns:
+        Encoded record
+    """
+    if debug:
+        data = dict(record)
+        data["format_version"] = FORMAT_VERSION
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    skills = record["skills"]
+    completed = record["completed_challenges"]
+    areas = record["unlocked_areas"]
+    strings = [record["name"], record["class"], record.get("timestamp", "")]
+    strings.extend(skills)
+    strings.extend(completed)
+    strings.extend(areas)
+    text = _SEPARATOR.join(strings)
+    if text.count(_SEPARATOR) != len(strings) - 1:
+        raise SaveFormatError("save strings can't contain NUL characters")
+
+    try:
+        counts = _COUNTS.pack(record["level"], record["experience"], record.get("revision", 0),
+                              len(skills), len(completed), len(areas))
+        levels = _levels_to_bytes(skills.values())
+    except (struct.error, OverflowError, TypeError):
+        return encode(record, debug=True)
+
+    return b"".join((
+        _HEADER.pack(MAGIC, FORMAT_VERSION),
+        counts,
+        levels,
+        text.encode("utf-8")
+    ))
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """
+    Deserialize a save record written by any version of the game.
+
+    Accepts the binary format, its JSON debug form and the original JSON
+    saves, and migrates older versions to the current one.
+
+    Args:
+        data: Encoded record
+
+    Returns:
+        Record as accepted by Character.from_dict
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        try:
+            record = json.loads(data)
+        except ValueError as e:
+            raise SaveFormatError(f"not a save: {e}") from e
+        if not isinstance(record, dict):
+            raise SaveFormatError("not a save: expected an object")
+        version = record.pop("format_version", 1)
+        return migrate(record, version)
+
+    try:
+        _, version = _HEADER.unpack_from(data)
+    except struct.error as e:
+        raise SaveFormatError(f"corrupt save: {e}") from e
+    # Binary saves start at version 2
+    if version not in _LEVEL_TYPES:
+        raise SaveFormatError(f"unknown binary save format {version}")
+
+    try:
+        if version == 2:
+            revision = None
+            level, experience, skill_count, completed_count, area_count = _COUNTS_V2.unpack_from(
+                data, _HEADER.size)
+            offset = _HEADER.size + _COUNTS_V2.size
+        else:
+            counts = _COUNTS_V3 if version == 3 else _COUNTS
+            level, experience, revision, skill_count, completed_count, area_count = counts.unpack_from(
+                data, _HEADER.size)
+            offset = _HEADER.size + counts.size
+        levels = array(_LEVEL_TYPES[version])
+        levels_end = offset + levels.itemsize * skill_count
+        levels.frombytes(data[offset:levels_end])
+        if sys.byteorder == "big":
+            levels.byteswap()
+        strings = data[levels_end:].decode("utf-8").split(_SEPARATOR)
+    except (struct.error, ValueError) as e:
+        raise SaveFormatError(f"corrupt save: {e}") from e
+
+    if len(strings) != 3 + skill_count + completed_count + area_count:
+        raise SaveFormatError("corrupt save: string count mismatch")
+
+    skills_end = 3 + skill_count
+    completed_end = skills_end + completed_count
+    record = {
+        "name": strings[0],
+        "class": strings[1],
+        "level": level,
+        "experience": experience,
+        "skills": dict(zip(strings[3:skills_end], levels.tolist())),
+        "completed_challenges": strings[skills_end:completed_end],
+        "unlocked_areas": strings[completed_end:]
+    }
+    if strings[2]:
+        record["timestamp"] = strings[2]
+    if revision is not None:
+        record["revision"] = revision
+    return migrate(record, version)
@@ -0,0 +1,164 @@
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+from array import array
+from typing import Dict, Any, Iterable, Iterator, List
+from src.game import save_codec
+from src.game.character import Skill
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Rows buffered per column before they are written out
+BATCH_SIZE = 1000
+
+# Integer columns of the columnar export, besides one per skill
+NUMBER_COLUMNS = ("level", "experience", "completed_challenges", "unlocked_areas")
+STRING_COLUMNS = ("name", "class")
+
+
+def skill_column(skill: Skill) -> str:
+    """Name of a skill's column in the columnar export."""
+    return f"skill_{skill.name}"
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Write save records to an NDJSON file, one record per line.
+
+    Each line carries the save format version, so a later version of the
+    game can import the file. The file is written under a temporary name
+    and renamed into place once complete.
+
+    Args:
+        records: Save records, consumed one at a time
+        path: File to write
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(dict(record, format_version=save_codec.FORMAT_VERSION)) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read save records from an NDJSON export, one line at a time.
+
+    Records from older save formats are migrated; unreadable lines are
+    reported and skipped.
+
+    Args:
+        path: File written by write_ndjson
+
+    Returns:
+        Iterator over the records
+    """
+    with open(path, 'rb') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = save_codec.decode(line)
+                record.setdefault("timestamp", "")
+            except ValueError as e:
+                print(f"Skipping line {line_number} of {path}: {e}")
+                continue
+            yield record
+
+
+def write_columns(records: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Write save records as a NumPy ``.npz`` archive with one array per column.
+
+    The columns are ``name``, ``class``, ``level``, ``experience``, the
+    number of ``completed_challenges`` and ``unlocked_areas``, and
+    ``skill_<SKILL>`` with the level of every skill (0 if the save has
+    none). Rows are buffered in batches and spooled to a temporary file
+    per column, so memory use doesn't grow with the number of saves;
+    ``numpy.load`` reads the result.
+
+    Args:
+        records: Save records, consumed one at a time
+        path: Archive to write, usually ending in ``.npz``
+
+    Returns:
+        Number of records written
+    """
+    if np is None:
+        raise ImportError("the columnar export needs the 'numpy' package")
+
+    number_columns = list(NUMBER_COLUMNS) + [skill_column(skill) for skill in Skill]
+    spools = {column: tempfile.TemporaryFile() for column in number_columns + list(STRING_COLUMNS)}
+    try:
+        count = 0
+        widths = dict.fromkeys(STRING_COLUMNS, 1)
+        batch = {column: array("q") for column in number_columns}
+        for record in records:
+            batch["level"].append(record["level"])
+            batch["experience"].append(record["experience"])
+            batch["completed_challenges"].append(len(record["completed_challenges"]))
+            batch["unlocked_areas"].append(len(record["unlocked_areas"]))
+            for skill in Skill:
+                batch[skill_column(skill)].append(record["skills"].get(skill.name, 0))
+            # Strings are padded to the longest one, which isn't known
+            # until the end, so they are spooled as JSON lines for now
+            for column in STRING_COLUMNS:
+                widths[column] = max(widths[column], len(record[column]))
+                spools[column].write(json.dumps(record[column]).encode("utf-8") + b"\n")
+
+            count += 1
+            if count % BATCH_SIZE == 0:
+                _flush(batch, spools)
+        _flush(batch, spools)
+
+        tmp_path = path + ".tmp"
+        with zipfile.ZipFile(tmp_path, 'w', allowZip64=True) as archive:
+            for column in number_columns:
+                _write_array(archive, column, np.dtype(np.int64).str, count, spools[column], shutil.copyfileobj)
+            for column in STRING_COLUMNS:
+                width = widths[column]
+                _write_array(archive, column, f"<U{width}", count, spools[column],
+                             lambda spool, out, width=width: _copy_padded(spool, out, width))
+        os.replace(tmp_path, path)
+        return count
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+
+def _flush(batch: Dict[str, array], spools: Dict[str, Any]) -> None:
+    """Append the buffered numbers to their spool files and clear the buffers."""
+    for column, values in batch.items():
+        values.tofile(spools[column])
+        del values[:]
+
+
+def _write_array(archive: zipfile.ZipFile, column: str, descr: str, count: int, spool, copy) -> None:
+    """Add a one-dimensional ``.npy`` array to the archive from a spool file."""
+    spool.seek(0)
+    with archive.open(column + ".npy", 'w', force_zip64=True) as out:
+        np.lib.format.write_array_header_1_0(out, {"descr": descr, "fortran_order": False, "shape": (count,)})
+        copy(spool, out)
+
+
+def _copy_padded(spool, out, width: int) -> None:
+    """Write spooled strings as fixed-width little-endian UTF-32."""
+    chunk: List[bytes] = []
+    for line in spool:
+        chunk.append(json.loads(line).ljust(width, "\x00").encode("utf-32-le"))
+        if len(chunk) == BATCH_SIZE:
+            out.write(b"".join(chunk))
+            chunk.clear()
+    out.write(b"".join(chunk))
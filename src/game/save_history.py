@@ -0,0 +1,284 @@
+import os
+import json
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from src.game.save_store import save_slug
+
+
+HISTORY_DIR = "history"
+# A full snapshot after this many versions bounds the deltas replayed per lookup
+DEFAULT_SNAPSHOT_INTERVAL = 10
+# Versions kept per character; older ones are compacted away
+DEFAULT_MAX_VERSIONS = 100
+
+_MISSING = object()
+
+
+def make_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describe how a save record changed.
+
+    Lists that only grew (completed challenges, unlocked areas) store the
+    new items, dicts that only gained or changed keys (skills) store the
+    changed keys, and anything else stores its new value.
+
+    Args:
+        old: Previous record
+        new: Current record
+
+    Returns:
+        Delta for apply_delta
+    """
+    delta = {}
+    for field, value in new.items():
+        previous = old.get(field, _MISSING)
+        if previous == value:
+            continue
+        if isinstance(value, list) and isinstance(previous, list) and value[:len(previous)] == previous:
+            delta.setdefault("extend", {})[field] = value[len(previous):]
+        elif isinstance(value, dict) and isinstance(previous, dict) and previous.keys() <= value.keys():
+            delta.setdefault("update", {})[field] = {
+                key: item for key, item in value.items() if previous.get(key, _MISSING) != item}
+        else:
+            delta.setdefault("set", {})[field] = value
+
+    removed = [field for field in old if field not in new]
+    if removed:
+        delta["unset"] = removed
+    return delta
+
+
+def apply_delta(record: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a delta from make_delta.
+
+    Args:
+        record: Record the delta was made against; left unchanged
+        delta: The changes
+
+    Returns:
+        The changed record
+    """
+    result = dict(record)
+    for field, value in delta.get("set", {}).items():
+        result[field] = value
+    for field, items in delta.get("extend", {}).items():
+        result[field] = result[field] + items
+    for field, items in delta.get("update", {}).items():
+        merged = dict(result[field])
+        merged.update(items)
+        result[field] = merged
+    for field in delta.get("unset", ()):
+        result.pop(field, None)
+    return result
+
+
+class _Chain:
+    """What a character's chain needs for the next append."""
+
+    __slots__ = ("first", "last", "record", "since_snapshot", "size")
+
+    def __init__(self, first: int, last: int, record: Dict[str, Any], since_snapshot: int):
+        self.first = first
+        self.last = last
+        self.record = record
+        self.since_snapshot = since_snapshot
+        # File size after this process last wrote the chain
+        self.size = None
+
+
+class SaveHistory:
+    """
+    Every saved version of every character, as snapshots plus deltas.
+
+    Each character has an append-only ``<slug>.ndjson`` chain. A version
+    is stored as the delta from the previous one, except every
+    ``snapshot_interval``-th version, which is a full snapshot, so
+    rebuilding any version replays fewer than ``snapshot_interval``
+    deltas. Once a chain holds more than ``max_versions`` versions, the
+    oldest are dropped and the oldest kept version becomes a snapshot.
+
+    Callers serialize writes per character across processes: SaveManager
+    records a version while it holds the save's lock file. A chain
+    another process appended to is re-read before the next append.
+    """
+
+    def __init__(
+        self,
+        history_dir: str,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        max_versions: int = DEFAULT_MAX_VERSIONS
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            history_dir: Directory holding the chains
+            snapshot_interval: Versions between full snapshots
+            max_versions: Versions kept per character
+        """
+        self.history_dir = history_dir
+        self.snapshot_interval = snapshot_interval
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        # save slug -> _Chain for chains appended to in this process
+        self._chains = {}
+
+    def path_for(self, name: str) -> str:
+        """Path of a character's chain."""
+        return os.path.join(self.history_dir, f"{save_slug(name)}.ndjson")
+
+    def record(self, record: Dict[str, Any]) -> int:
+        """
+        Add a save record as the character's newest version.
+
+        Args:
+            record: Save record as written to the save store
+
+        Returns:
+            The new version number
+        """
+        slug = save_slug(record["name"])
+        with self._lock:
+            chain = self._chains.get(slug)
+            if chain is None or chain.size != self._size(record["name"]):
+                chain = self._chains[slug] = self._load_chain(record["name"])
+
+            entry = {"version": 1, "at": record.get("timestamp")}
+            if chain is None:
+                entry["snapshot"] = record
+                chain = self._chains[slug] = _Chain(1, 1, record, 0)
+            else:
+                entry["version"] = chain.last + 1
+                if chain.since_snapshot + 1 >= self.snapshot_interval:
+                    entry["snapshot"] = record
+                    chain.since_snapshot = 0
+                else:
+                    entry["delta"] = make_delta(chain.record, record)
+                    chain.since_snapshot += 1
+                chain.last = entry["version"]
+                chain.record = record
+
+            os.makedirs(self.history_dir, exist_ok=True)
+            with open(self.path_for(record["name"]), 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                chain.size = f.tell()
+
+            # Compact in batches rather than on every save
+            if chain.last - chain.first + 1 > self.max_versions + self.snapshot_interval:
+                self._compact(record["name"], chain)
+                chain.size = self._size(record["name"])
+            return entry["version"]
+
+    def versions(self, name: str) -> List[Tuple[int, Optional[str]]]:
+        """
+        List a character's saved versions.
+
+        Args:
+            name: Character name
+
+        Returns:
+            (version, timestamp) pairs, oldest first
+        """
+        return [(entry["version"], entry["at"]) for entry in self._read(name)]
+
+    def get(self, name: str, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a saved version of a character.
+
+        Args:
+            name: Character name
+            version: Version number from versions()
+
+        Returns:
+            The save record, or None if the version isn't kept
+        """
+        entries = self._read(name)
+        position = next((i for i, entry in enumerate(entries) if entry["version"] == version), None)
+        if position is None:
+            return None
+        return self._rebuild(entries, position)
+
+    def compact(self, name: str) -> None:
+        """Apply the retention policy to a character's chain now."""
+        with self._lock:
+            chain = self._chains.get(save_slug(name)) or self._load_chain(name)
+            if chain is not None:
+                self._compact(name, chain)
+
+    @staticmethod
+    def _rebuild(entries: List[Dict[str, Any]], position: int) -> Dict[str, Any]:
+        """Replay from the closest snapshot at or before a position."""
+        start = position
+        while start > 0 and "snapshot" not in entries[start]:
+            start -= 1
+        if "snapshot" not in entries[start]:
+            raise ValueError("save history has no snapshot to rebuild from")
+        record = entries[start]["snapshot"]
+        for entry in entries[start + 1:position + 1]:
+            record = apply_delta(record, entry["delta"])
+        return record
+
+    def _load_chain(self, name: str) -> Optional[_Chain]:
+        """Read the state needed to append to an existing chain."""
+        entries = self._read(name)
+        if not entries:
+            return None
+
+        # Appending after a line torn by a crash would corrupt the next entry too
+        with open(self.path_for(name), 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._rewrite(name, entries)
+
+        since_snapshot = 0
+        for entry in reversed(entries):
+            if "snapshot" in entry:
+                break
+            since_snapshot += 1
+        return _Chain(entries[0]["version"], entries[-1]["version"],
+                      self._rebuild(entries, len(entries) - 1), since_snapshot)
+
+    def _compact(self, name: str, chain: _Chain) -> None:
+        """Drop versions beyond the retention limit."""
+        entries = self._read(name)
+        drop = len(entries) - self.max_versions
+        if drop <= 0:
+            return
+
+        first = entries[drop]
+        if "snapshot" not in first:
+            first = {"version": first["version"], "at": first["at"], "snapshot": self._rebuild(entries, drop)}
+        self._rewrite(name, [first] + entries[drop + 1:])
+        chain.first = first["version"]
+
+    def _rewrite(self, name: str, entries: List[Dict[str, Any]]) -> None:
+        """Atomically replace a character's chain."""
+        path = self.path_for(name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        os.replace(tmp_path, path)
+
+    def _size(self, name: str) -> Optional[int]:
+        """Size of a character's chain file, or None if there is none."""
+        try:
+            return os.path.getsize(self.path_for(name))
+        except OSError:
+            return None
+
+    def _read(self, name: str) -> List[Dict[str, Any]]:
+        """Parse a character's chain, ignoring a line torn by a crash."""
+        try:
+            with open(self.path_for(name), 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
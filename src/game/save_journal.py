@@ -0,0 +1,202 @@
+import os
+import json
+import threading
+from typing import Dict, Any, Iterator, List, Optional
+from src.game.save_store import save_slug
+from src.game.save_lock import file_lock
+
+
+JOURNAL_DIR = "events"
+# The single journal file used before events were kept per character
+LEGACY_JOURNAL_NAME = "journal.ndjson"
+
+
+class SaveJournal:
+    """
+    Append-only log of every character's progress events.
+
+    Each character has its own log, ``<slug>.ndjson``, with one JSON
+    event per line. Every event carries the character's name and an
+    ``at`` timestamp. Events are never removed, so the log tells how a
+    character got where it is and can be read directly for analysis.
+
+    A save works as a snapshot of the log: loading a character replays
+    only the events logged after its save. Each save leaves a checkpoint,
+    the log's size from just before the save, which tells those events
+    apart by their place in the log rather than by their timestamps, as
+    other processes' clocks may lag behind. It also means finding them
+    doesn't take reading the log from the start. A line torn by a
+    crash mid-append is ignored. Appends take a lock file, so game
+    processes sharing a save directory don't lose each other's events.
+    """
+
+    def __init__(self, journal_dir: str):
+        """
+        Initialize the journal.
+
+        Args:
+            journal_dir: Directory for the event logs
+        """
+        self.journal_dir = journal_dir
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> str:
+        """Path of a character's event log."""
+        return os.path.join(self.journal_dir, save_slug(name) + ".ndjson")
+
+    def checkpoint_path(self, name: str) -> str:
+        """Path of a character's latest checkpoint."""
+        return os.path.join(self.journal_dir, save_slug(name) + ".checkpoint.json")
+
+    def append(self, events: List[Dict[str, Any]]) -> None:
+        """Durably append events to their characters' logs."""
+        by_slug = {}
+        for event in events:
+            by_slug.setdefault(save_slug(event["character"]), []).append(event)
+
+        for character_events in by_slug.values():
+            path = self.path_for(character_events[0]["character"])
+            data = "".join(json.dumps(event) + "\n" for event in character_events).encode("utf-8")
+            os.makedirs(self.journal_dir, exist_ok=True)
+            with self._lock, file_lock(path + ".lock"):
+                with open(path, 'a+b') as f:
+                    # Don't glue the first event onto a line torn by a crash
+                    if f.tell() > 0:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            data = b"\n" + data
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def size(self, name: str) -> int:
+        """Current size of a character's log, as a checkpoint offset."""
+        try:
+            return os.path.getsize(self.path_for(name))
+        except FileNotFoundError:
+            return 0
+
+    def checkpoint(self, name: str, at: str, offset: int) -> None:
+        """
+        Note that a save with timestamp ``at`` covers the log up to ``offset``.
+
+        Args:
+            name: Character name
+            at: Timestamp of the save
+            offset: Log size taken before the save's timestamp
+        """
+        os.makedirs(self.journal_dir, exist_ok=True)
+        path = self.checkpoint_path(name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"at": at, "offset": offset}, f)
+        os.replace(tmp_path, path)
+
+    def events(self, name: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Read a character's events in the order they were recorded.
+
+        Args:
+            name: Character name
+            after: Only events recorded after this timestamp
+
+        Returns:
+            Matching events
+        """
+        start = 0
+        if after is not None:
+            checkpoint = self._checkpoint(name)
+            if checkpoint is not None and checkpoint["at"] <= after:
+                start = checkpoint["offset"]
+        return [event for event in self.iter_events(name, start)
+                if after is None or event["at"] > after]
+
+    def since_save(self, name: str, at: str) -> List[Dict[str, Any]]:
+        """
+        Read the events logged after a save.
+
+        With the save's checkpoint, these are all events appended after
+        its offset, including events another process stamped before the
+        save but logged after it. Saves without a checkpoint, e.g.
+        imported ones, fall back to the events recorded after the save's
+        timestamp.
+
+        Args:
+            name: Character name
+            at: Timestamp of the save
+
+        Returns:
+            The events, in log order
+        """
+        checkpoint = self._checkpoint(name)
+        if checkpoint is not None and checkpoint["at"] == at:
+            return list(self.iter_events(name, checkpoint["offset"]))
+        return self.events(name, after=at)
+
+    def iter_events(self, name: str, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a character's events from its log, one line at a time.
+
+        Args:
+            name: Character name
+            start: Log offset to start reading at
+
+        Returns:
+            Iterator over the events
+        """
+        try:
+            f = open(self.path_for(name), 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash
+                    continue
+                if isinstance(event, dict) and "character" in event and "at" in event:
+                    yield event
+
+    def import_legacy(self, path: str) -> int:
+        """
+        Move the events of a journal file from older versions into the logs.
+
+        Args:
+            path: The old ``journal.ndjson``
+
+        Returns:
+            Number of events moved
+        """
+        if not os.path.exists(path):
+            return 0
+
+        with file_lock(path + ".lock"):
+            try:
+                with open(path, 'rb') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                # Moved by another process meanwhile
+                return 0
+
+            events = []
+            for line in lines:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict) and "character" in event and "at" in event:
+                    events.append(event)
+            self.append(events)
+            os.remove(path)
+        return len(events)
+
+    def _checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a character's checkpoint, or None if there is none."""
+        try:
+            with open(self.checkpoint_path(name), 'r') as f:
+                checkpoint = json.load(f)
+            return {"at": checkpoint["at"], "offset": int(checkpoint["offset"])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,76 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from src.game.save_store import save_slug
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+LOCK_DIR = ".locks"
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on a lock file.
+
+    Other processes using the same lock file wait; on platforms without
+    fcntl this only documents intent and doesn't lock.
+
+    Args:
+        path: Lock file, created if missing
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SaveLocks:
+    """
+    One lock per character save, shared by this process's threads and,
+    through fcntl, by other game processes using the same save directory.
+
+    Only writers take the locks. Saves are replaced atomically, so
+    readers always see a complete save without waiting.
+    """
+
+    def __init__(self, lock_dir: str):
+        """
+        Initialize the locks.
+
+        Args:
+            lock_dir: Directory for the lock files
+        """
+        self.lock_dir = lock_dir
+        self._guard = threading.Lock()
+        # save slug -> lock for this process's threads; flock alone
+        # doesn't exclude threads sharing an open file
+        self._locks = {}
+
+    @contextmanager
+    def hold(self, name: str) -> Iterator[None]:
+        """
+        Hold the lock for a character's save.
+
+        Args:
+            name: Character name
+        """
+        slug = save_slug(name)
+        with self._guard:
+            lock = self._locks.setdefault(slug, threading.Lock())
+
+        with lock:
+            os.makedirs(self.lock_dir, exist_ok=True)
+            with file_lock(os.path.join(self.lock_dir, f"{slug}.lock")):
+                yield
@@ -1,21 +1,122 @@
-import json
 import os
 import datetime
-from typing import Dict, Optional
-from src.game.character import Character, CharacterClass, Skill
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.game.character import Character, CHALLENGE_COMPLETED, AREA_UNLOCKED
+from src.game.save_store import SqliteSaveStore, save_slug
+from src.game.save_lock import SaveLocks, LOCK_DIR
+from src.game.save_journal import SaveJournal, JOURNAL_DIR, LEGACY_JOURNAL_NAME
+from src.game.save_history import SaveHistory, HISTORY_DIR
+from src.game.leaderboard import Leaderboard, LEADERBOARD_DIR, LEVEL
+from src.game import save_export
+
+
+SAVE_DB_NAME = "saves.db"
+
+
+def _total_experience(record: Dict[str, Any]) -> int:
+    """All XP a saved character has earned, across its levels."""
+    return Character.from_dict(record).total_experience()
+
+
+def merge_progress(
+    base: Dict[str, Any],
+    ours: Dict[str, Any],
+    theirs: Dict[str, Any],
+    events: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Combine progress two sessions made from the same save.
+
+    Progress only accumulates, so nothing conflicts: our progress since
+    the common base is added to the other session's save, and completed
+    challenges and unlocked areas are united. With our events since the
+    base, they are replayed on the other save, leaving out the XP and
+    skill gains of challenges the other session completed too, so a
+    challenge both sessions completed counts once. Without them, the XP
+    and skill levels gained since the base are added instead.
+
+    Args:
+        base: The save both sessions started from
+        ours: What this session is saving
+        theirs: What the other session saved meanwhile
+        events: Our progress events since the base, if known
+
+    Returns:
+        Save record with both sessions' progress and our timestamp
+    """
+    merged = Character.from_dict(theirs)
+
+    if events is not None:
+        # Gains of these completions are already in their save
+        completed_by_them = set(theirs["completed_challenges"]) - set(base["completed_challenges"])
+        for event in events:
+            if event.get("challenge") not in completed_by_them:
+                merged.apply(event)
+        # Together the sessions may have reached a level neither did alone
+        merged._check_area_unlocks()
+    else:
+        gained = _total_experience(ours) - _total_experience(base)
+        if gained > 0:
+            merged.add_experience(gained)
+        for skill, level in ours["skills"].items():
+            gain = level - base["skills"].get(skill, level)
+            if gain > 0 and skill in merged.skills:
+                merged.skills[skill] += gain
+    for challenge in ours["completed_challenges"]:
+        merged.apply({"type": CHALLENGE_COMPLETED, "challenge": challenge})
+    for area in ours["unlocked_areas"]:
+        merged.apply({"type": AREA_UNLOCKED, "area": area})
+
+    record = merged.to_dict()
+    record["timestamp"] = ours["timestamp"]
+    return record
 
 
 class SaveManager:
     """Manages saving and loading game state."""
 
-    def __init__(self, save_dir: str = "saves"):
-        """Initialize the save manager."""
+    def __init__(self, save_dir: str = "saves", store=None):
+        """
+        Initialize the save manager.
+
+        Args:
+            save_dir: Directory holding the saves
+            store: Storage backend (SqliteSaveStore or JsonSaveStore); defaults
+                to a SQLite database in save_dir, into which any JSON saves
+                found there are imported
+        """
         self.save_dir = save_dir
 
         # Create the save directory if it doesn't exist
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
+        imported = 0
+        if store is None:
+            store = SqliteSaveStore(os.path.join(save_dir, SAVE_DB_NAME))
+            imported = store.migrate_json(save_dir)
+        self.store = store
+        # Every character's progress events; saves are snapshots of them
+        self.journal = SaveJournal(os.path.join(save_dir, JOURNAL_DIR))
+        self.journal.import_legacy(os.path.join(save_dir, LEGACY_JOURNAL_NAME))
+        # Earlier versions of every save, for rolling back
+        self.history = SaveHistory(os.path.join(save_dir, HISTORY_DIR))
+        # Serialize writers of a save, across processes sharing save_dir
+        self.locks = SaveLocks(os.path.join(save_dir, LOCK_DIR))
+        # Rankings of all saved characters, updated on every save
+        self.leaderboard = Leaderboard(os.path.join(save_dir, LEADERBOARD_DIR))
+        if imported or not self.leaderboard.exists():
+            self.leaderboard.rebuild(self.store.records())
+        # save slug -> (revision, record as this session last read or wrote
+        # it, whether the stored save is exactly that record)
+        self._bases = {}
+        # save slug -> progress events on top of the base not yet written,
+        # from writes that failed or replayed when loading
+        self._unwritten = {}
+        self._clock_lock = threading.Lock()
+        self._last_time = None
+
     def save_game(self, character: Character) -> bool:
         """
         Save the game state.
@@ -26,30 +127,101 @@ class SaveManager:
         Returns:
             True if save was successful, False otherwise
         """
+        events = self.take_events(character)
+        saved = self.write_record(character.to_dict(), events=events)
+        if saved:
+            # Part of the save, so loading doesn't replay them
+            for event in events:
+                event["saved"] = True
         try:
-            save_data = {
-                "name": character.name,
-                "class": character.character_class.value,
-                "level": character.level,
-                "experience": character.experience,
-                "challenges_completed": character.challenges_completed,
-                "skills": {skill.name: level for skill, level in character.skills.items()},
-                "inventory": character.inventory,
-                "unlocked_areas": character.unlocked_areas,
-                "timestamp": datetime.datetime.now().isoformat()
-            }
-
-            filename = f"{character.name.lower().replace(' ', '_')}.json"
-            filepath = os.path.join(self.save_dir, filename)
-
-            with open(filepath, 'w') as f:
-                json.dump(save_data, f, indent=2)
-
-            return True
+            self.journal.append(events)
+        except OSError as e:
+            print(f"Could not journal progress: {e}")
+        return saved
 
+    def take_events(self, character: Character) -> List[Dict[str, Any]]:
+        """
+        Take a character's new progress events, ready for the journal.
+
+        Args:
+            character: The player's character
+
+        Returns:
+            The events, each with the character's name and a timestamp
+        """
+        events = character.take_events()
+        for event in events:
+            event["character"] = character.name
+            event["at"] = self.timestamp()
+        return events
+
+    def write_record(self, record: Dict[str, Any], merge: bool = True,
+                     events: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Write a save record produced by Character.to_dict.
+
+        The record is timestamped when it is written. Every write bumps the
+        save's revision. If the save was written by another session since
+        this one last read or wrote it, the two sessions' progress is
+        merged instead of one overwriting the other.
+
+        Args:
+            record: Save record
+            merge: Merge with progress saved by other sessions; False
+                replaces the save as is, e.g. for a rollback
+            events: The progress events the record adds to what this
+                session last wrote, so a merge can replay them
+
+        Returns:
+            True if save was successful, False otherwise
+        """
+        slug = save_slug(record["name"])
+        if events is not None:
+            # Including those of writes that failed
+            events = self._unwritten.pop(slug, []) + list(events)
+        try:
+            with self.locks.hold(record["name"]):
+                # Journaled events from before the timestamp are all before
+                # this offset, so loading needn't read the log before it
+                offset = self.journal.size(record["name"])
+                record = dict(record, timestamp=self.timestamp())
+                current = self.store.read(record["name"])
+                revision = current.get("revision", 0) if current is not None else 0
+
+                written = record
+                base = self._bases.get(slug)
+                if merge and current is not None and base is not None:
+                    base_revision, base_record, in_sync = base
+                    if revision != base_revision or not in_sync:
+                        written = merge_progress(base_record, record, current, events)
+
+                written = dict(written, revision=revision + 1)
+                self.store.write(written)
+                self._bases[slug] = (revision + 1, record, written == dict(record, revision=revision + 1))
+                self._unwritten.pop(slug, None)
+                try:
+                    self.journal.checkpoint(record["name"], record["timestamp"], offset)
+                except OSError as e:
+                    # Loading reads more of the journal until the next save
+                    print(f"Could not checkpoint journal: {e}")
+
+                # Still under the save's lock, so the history and the
+                # leaderboard see this character's saves in order
+                try:
+                    self.history.record(written)
+                except (OSError, ValueError) as e:
+                    # The save itself succeeded, only this version can't be rolled back to
+                    print(f"Could not record save history: {e}")
+                try:
+                    self.leaderboard.update(written)
+                except (OSError, ValueError) as e:
+                    print(f"Could not update leaderboard: {e}")
         except Exception as e:
             print(f"Error saving game: {e}")
+            if events:
+                self._unwritten[slug] = events
             return False
+        return True
 
     def load_game(self, character_name: str) -> Optional[Character]:
         """
@@ -62,30 +234,20 @@ class SaveManager:
             Loaded Character object, or None if load failed
         """
         try:
-            filename = f"{character_name.lower().replace(' ', '_')}.json"
-            filepath = os.path.join(self.save_dir, filename)
-
-            if not os.path.exists(filepath):
+            record = self.store.read(character_name)
+            if record is None:
                 return None
+            slug = save_slug(record["name"])
+            self._bases[slug] = (record.get("revision", 0), record, True)
 
-            with open(filepath, 'r') as f:
-                save_data = json.load(f)
-
-            # Create character from save data
-            character = Character(
-                name=save_data["name"],
-                character_class=CharacterClass(save_data["class"]),
-                level=save_data["level"],
-                experience=save_data["experience"],
-                challenges_completed=save_data["challenges_completed"],
-                inventory=save_data["inventory"],
-                unlocked_areas=save_data["unlocked_areas"]
-            )
-
-            # Load skills
-            character.skills = {
-                Skill[skill_name]: level for skill_name, level in save_data["skills"].items()}
-
+            # Replay progress made after the save was written
+            character = Character.from_dict(record)
+            replayed = [event for event in self.journal.since_save(character_name, record["timestamp"])
+                        if not event.get("saved")]
+            for event in replayed:
+                character.apply(event)
+            # Progress on top of the save, for merging the next write
+            self._unwritten[slug] = replayed
             return character
 
         except Exception as e:
@@ -99,18 +261,174 @@ class SaveManager:
         Returns:
             Dict mapping character names to timestamps
         """
-        saved_games = {}
+        return self.store.list_saves()
 
-        for filename in os.listdir(self.save_dir):
-            if filename.endswith(".json"):
-                try:
-                    with open(os.path.join(self.save_dir, filename), 'r') as f:
-                        save_data = json.load(f)
+    def get_save_history(self, character_name: str) -> List[Tuple[int, str]]:
+        """
+        List the kept versions of a character's save.
+
+        Args:
+            character_name: Name of the character
+
+        Returns:
+            (version, timestamp) pairs, oldest first
+        """
+        return self.history.versions(character_name)
+
+    def load_version(self, character_name: str, version: int) -> Optional[Character]:
+        """
+        Load an earlier version of a save.
+
+        Args:
+            character_name: Name of the character
+            version: Version number from get_save_history
+
+        Returns:
+            The character as saved in that version, or None if it isn't kept
+        """
+        record = self.history.get(character_name, version)
+        return Character.from_dict(record) if record is not None else None
+
+    def rollback(self, character_name: str, version: int) -> Optional[Character]:
+        """
+        Restore an earlier version of a save as the current one.
+
+        The restored state is saved as a new version, so the rollback
+        itself can be undone.
+
+        Args:
+            character_name: Name of the character
+            version: Version number from get_save_history
+
+        Returns:
+            The restored character, or None if the version isn't kept or
+            couldn't be saved
+        """
+        character = self.load_version(character_name, version)
+        if character is None:
+            return None
+
+        if not self.write_record(character.to_dict(), merge=False):
+            return None
+        return character
+
+    def export_saves(self, path: str) -> Optional[int]:
+        """
+        Export every save to an NDJSON file, one save record per line.
+
+        Saves are streamed from the store, so memory use doesn't depend on
+        how many there are. Progress still only in the journal isn't
+        included; progress_events() streams the journal itself.
+
+        Args:
+            path: File to write
+
+        Returns:
+            Number of saves exported, or None if the export failed
+        """
+        try:
+            return save_export.write_ndjson(self.store.records(), path)
+        except Exception as e:
+            print(f"Error exporting saves: {e}")
+            return None
 
-                    saved_games[save_data["name"]] = save_data["timestamp"]
+    def export_columns(self, path: str) -> Optional[int]:
+        """
+        Export every save as columns of a NumPy ``.npz`` archive, for analysis.
+
+        See save_export.write_columns for the columns. Needs numpy.
+
+        Args:
+            path: Archive to write
+
+        Returns:
+            Number of saves exported, or None if the export failed
+        """
+        try:
+            return save_export.write_columns(self.store.records(), path)
+        except Exception as e:
+            print(f"Error exporting saves: {e}")
+            return None
+
+    def import_saves(self, path: str) -> Optional[int]:
+        """
+        Import the saves in an NDJSON file written by export_saves.
 
-                except Exception:
-                    # Skip corrupted save files
-                    continue
+        Imported saves replace existing saves of the same characters as
+        they are, without merging or adding to their history, so don't
+        import while the characters are being played. They are timestamped
+        with the time of the import, so journaled progress from before it
+        isn't replayed on top of them.
 
-        return saved_games
+        Args:
+            path: File to read
+
+        Returns:
+            Number of saves imported, or None if the import failed
+        """
+        try:
+            count = self.store.write_many(
+                dict(record, timestamp=self.timestamp()) for record in save_export.read_ndjson(path))
+        except Exception as e:
+            print(f"Error importing saves: {e}")
+            return None
+
+        self.leaderboard.rebuild(self.store.records())
+        return count
+
+    def progress_events(self, character_name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every progress event journaled for a character.
+
+        Args:
+            character_name: Name of the character
+
+        Returns:
+            Iterator over the events, oldest first; each has a "type", the
+            "character", an "at" timestamp and the type's fields
+        """
+        return self.journal.iter_events(character_name)
+
+    def get_leaderboard(self, category: str = LEVEL, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the best saved characters.
+
+        Args:
+            category: "level", "experience" (all XP earned) or "completions"
+            count: Number of characters
+
+        Returns:
+            Best first, dicts with the character's "rank", "name", "level",
+            "experience", "total_experience" and "completions"
+        """
+        return self.leaderboard.top(category, count)
+
+    def get_rank(self, character_name: str, category: str = LEVEL) -> Optional[int]:
+        """
+        Get a saved character's leaderboard rank.
+
+        Args:
+            character_name: Name of the character
+            category: "level", "experience" or "completions"
+
+        Returns:
+            1 for the best character, or None if the character isn't saved
+        """
+        return self.leaderboard.rank(character_name, category)
+
+    def timestamp(self) -> str:
+        """
+        Get the current time for a save or journal event.
+
+        Timestamps are strictly increasing, so events and the saves that
+        include them can be ordered by comparing their timestamps.
+
+        Returns:
+            ISO 8601 timestamp with microseconds
+        """
+        with self._clock_lock:
+            now = datetime.datetime.now()
+            if self._last_time is not None and now <= self._last_time:
+                now = self._last_time + datetime.timedelta(microseconds=1)
+            self._last_time = now
+        return now.isoformat(timespec="microseconds")
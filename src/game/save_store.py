@@ -0,0 +1,485 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from src.game import save_codec
+
+
+def save_slug(name: str) -> str:
+    """The file-system friendly key a character is saved under."""
+    return name.lower().replace(' ', '_')
+
+
+# Save headers are indexed in a subdirectory, so rewriting the index
+# doesn't touch the save directory's mtime
+INDEX_DIR = ".meta"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+
+class FileSaveStore:
+    """
+    One file per character, encoded with save_codec.
+
+    Saves are compact binary ``.sav`` files, or with ``debug`` the codec's
+    indented JSON in ``.json`` files. A header index (name, class, level,
+    timestamp and file size of every save) is kept in ``.meta/index.json``
+    and updated on each write under ``.meta/index.json.lock``, so listing
+    saves reads one small file and concurrent writers don't drop each
+    other's headers. It is rebuilt from the save files when it is missing
+    or older than the save directory, i.e. after saves were added or
+    removed behind the store's back.
+    """
+
+    def __init__(self, save_dir: str, debug: bool = False):
+        """
+        Initialize the store.
+
+        Args:
+            save_dir: Directory holding the save files
+            debug: Write human-readable JSON instead of the binary format
+        """
+        self.save_dir = save_dir
+        self.debug = debug
+        self.suffix = ".json" if debug else ".sav"
+        self.index_path = os.path.join(save_dir, INDEX_DIR, INDEX_NAME)
+
+    def path_for(self, name: str) -> str:
+        """Path of a character's save file."""
+        return os.path.join(self.save_dir, save_slug(name) + self.suffix)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write a character's save record and its header."""
+        with self._index_lock():
+            # Read the index first: creating a new save file makes it look stale
+            headers = self._current_headers()
+            headers[save_slug(record["name"])] = self._write_file(record)
+            self._save_index(headers)
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write many save records, updating the header index once at the end.
+
+        Args:
+            records: Save records, consumed one at a time
+
+        Returns:
+            Number of records written
+        """
+        count = 0
+        with self._index_lock():
+            headers = self._current_headers()
+            try:
+                for record in records:
+                    headers[save_slug(record["name"])] = self._write_file(record)
+                    count += 1
+            finally:
+                self._save_index(headers)
+        return count
+
+    def _write_file(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a record's save file and return its header."""
+        # Write a new file and rename it over the old save, so a crash
+        # leaves either the old or the new save, never half of one
+        data = save_codec.encode(record, self.debug)
+        path = self.path_for(record["name"])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return self._header(record, os.path.getsize(path))
+
+    def read(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a character's save record, or None if there is none."""
+        try:
+            with open(self.path_for(name), 'rb') as f:
+                return save_codec.decode(f.read())
+        except FileNotFoundError:
+            return None
+
+    def list_saves(self) -> Dict[str, str]:
+        """Map the saved characters' names to their save timestamps."""
+        return {header["name"]: header["timestamp"] for header in self.headers().values()}
+
+    def headers(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the header of every save, rebuilding the index if it is stale.
+
+        Returns:
+            Save slug -> {"name", "class", "level", "timestamp", "size"}
+        """
+        headers = self._load_index()
+        if headers is None:
+            with self._index_lock():
+                headers = self._current_headers()
+        return headers
+
+    def _current_headers(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index, or rebuild and save it if it is stale; the index lock must be held."""
+        headers = self._load_index()
+        if headers is None:
+            headers = {}
+            for filename, record in self._scan():
+                size = os.path.getsize(os.path.join(self.save_dir, filename))
+                headers[filename[:-len(self.suffix)]] = self._header(record, size)
+            self._save_index(headers)
+        return headers
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every readable save record."""
+        for _, record in self._scan():
+            yield record
+
+    def _scan(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, record) for every readable save file."""
+        for filename in sorted(os.listdir(self.save_dir)):
+            if not filename.endswith(self.suffix):
+                continue
+            try:
+                with open(os.path.join(self.save_dir, filename), 'rb') as f:
+                    record = save_codec.decode(f.read())
+            except (OSError, ValueError, KeyError):
+                # Skip corrupted save files
+                continue
+            if "timestamp" in record:
+                yield filename, record
+
+    @staticmethod
+    def _header(record: Dict[str, Any], size: int) -> Dict[str, Any]:
+        """The part of a record the load screen needs."""
+        return {
+            "name": record["name"],
+            "class": record.get("class"),
+            "level": record.get("level"),
+            "timestamp": record["timestamp"],
+            "size": size
+        }
+
+    def _index_lock(self):
+        """
+        Lock the header index against writers in this and other processes.
+
+        Every save's header shares the one index, so updating it is a
+        read-modify-write that per-character save locks don't cover.
+        """
+        # Imported here: save_lock imports this module
+        from src.game.save_lock import file_lock
+
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        return file_lock(self.index_path + ".lock")
+
+    def _load_index(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Load the header index, or None if it is missing or stale."""
+        try:
+            if os.path.getmtime(self.save_dir) > os.path.getmtime(self.index_path):
+                return None
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        return data["saves"]
+
+    def _save_index(self, headers: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically replace the header index."""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": INDEX_VERSION, "saves": headers}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # Listing still works, the index is just rebuilt next time
+            print(f"Could not write save index: {e}")
+
+
+class JsonSaveStore(FileSaveStore):
+    """One indented JSON file per character, the original save format."""
+
+    def __init__(self, save_dir: str):
+        """
+        Initialize the store.
+
+        Args:
+            save_dir: Directory holding the save files
+        """
+        super().__init__(save_dir, debug=True)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    experience INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS characters_listing ON characters (name, timestamp);
+CREATE TABLE IF NOT EXISTS skills (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (character_id, skill)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS completions (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    challenge TEXT NOT NULL,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS unlocked_areas (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    area TEXT NOT NULL,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS migrated_files (
+    filename TEXT PRIMARY KEY
+);
+"""
+
+# The statements are fixed strings, so sqlite3's statement cache prepares
+# each of them once per connection
+_UPSERT_CHARACTER = """
+INSERT INTO characters (slug, name, class, level, experience, timestamp, revision)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (slug) DO UPDATE SET
+    name = excluded.name, class = excluded.class, level = excluded.level,
+    experience = excluded.experience, timestamp = excluded.timestamp,
+    revision = excluded.revision
+"""
+_SELECT_ID = "SELECT id FROM characters WHERE slug = ?"
+_SELECT_CHARACTER = ("SELECT id, name, class, level, experience, timestamp, revision "
+                     "FROM characters WHERE slug = ?")
+_DELETE_SKILLS = "DELETE FROM skills WHERE character_id = ?"
+_DELETE_COMPLETIONS = "DELETE FROM completions WHERE character_id = ?"
+_DELETE_AREAS = "DELETE FROM unlocked_areas WHERE character_id = ?"
+_INSERT_SKILL = "INSERT INTO skills (character_id, skill, level) VALUES (?, ?, ?)"
+_INSERT_COMPLETION = "INSERT INTO completions (character_id, position, challenge) VALUES (?, ?, ?)"
+_INSERT_AREA = "INSERT INTO unlocked_areas (character_id, position, area) VALUES (?, ?, ?)"
+_SELECT_SKILLS = "SELECT skill, level FROM skills WHERE character_id = ?"
+_SELECT_COMPLETIONS = "SELECT challenge FROM completions WHERE character_id = ? ORDER BY position"
+_SELECT_AREAS = "SELECT area FROM unlocked_areas WHERE character_id = ? ORDER BY position"
+# Answered from the characters_listing index alone
+_LIST_SAVES = "SELECT name, timestamp FROM characters"
+# Characters in id order, a page at a time, with their rows from the other tables
+_PAGE_CHARACTERS = ("SELECT id, name, class, level, experience, timestamp, revision "
+                    "FROM characters WHERE id > ? ORDER BY id LIMIT ?")
+_PAGE_SKILLS = "SELECT character_id, skill, level FROM skills WHERE character_id BETWEEN ? AND ?"
+_PAGE_COMPLETIONS = ("SELECT character_id, challenge FROM completions "
+                     "WHERE character_id BETWEEN ? AND ? ORDER BY character_id, position")
+_PAGE_AREAS = ("SELECT character_id, area FROM unlocked_areas "
+               "WHERE character_id BETWEEN ? AND ? ORDER BY character_id, position")
+
+# Characters read or written per transaction by records() and write_many()
+PAGE_SIZE = 500
+
+
+class SqliteSaveStore:
+    """
+    All characters in one SQLite database.
+
+    Characters, skills, completions and unlocked areas live in indexed
+    tables, so listing saves reads one covering index instead of every
+    character. The database runs in WAL mode: a save is one short
+    transaction and readers never wait for it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            path: Path of the database file
+        """
+        self.path = path
+        # The connection is shared with background savers, guarded by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(characters)")}
+            if "revision" not in columns:
+                # Databases created before save revisions
+                self._conn.execute("ALTER TABLE characters ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write a character's save record in one transaction."""
+        with self._lock, self._conn:
+            self._write(record)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Write a record inside the caller's transaction."""
+        slug = save_slug(record["name"])
+        conn = self._conn
+        conn.execute(_UPSERT_CHARACTER, (
+            slug, record["name"], record["class"], record["level"],
+            record["experience"], record["timestamp"], record.get("revision", 0)
+        ))
+        character_id = self._one(_SELECT_ID, (slug,))[0]
+
+        conn.execute(_DELETE_SKILLS, (character_id,))
+        conn.execute(_DELETE_COMPLETIONS, (character_id,))
+        conn.execute(_DELETE_AREAS, (character_id,))
+        conn.executemany(_INSERT_SKILL, [
+            (character_id, skill, level) for skill, level in record["skills"].items()])
+        conn.executemany(_INSERT_COMPLETION, [
+            (character_id, position, challenge)
+            for position, challenge in enumerate(record["completed_challenges"])])
+        conn.executemany(_INSERT_AREA, [
+            (character_id, position, area) for position, area in enumerate(record["unlocked_areas"])])
+
+    def read(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a character's save record, or None if there is none."""
+        with self._lock:
+            row = self._one(_SELECT_CHARACTER, (save_slug(name),))
+            if row is None:
+                return None
+
+            character_id = row[0]
+            return {
+                "name": row[1],
+                "class": row[2],
+                "level": row[3],
+                "experience": row[4],
+                "timestamp": row[5],
+                "revision": row[6],
+                "skills": dict(self._conn.execute(_SELECT_SKILLS, (character_id,))),
+                "completed_challenges": [
+                    challenge for (challenge,) in self._conn.execute(_SELECT_COMPLETIONS, (character_id,))],
+                "unlocked_areas": [
+                    area for (area,) in self._conn.execute(_SELECT_AREAS, (character_id,))]
+            }
+
+    def list_saves(self) -> Dict[str, str]:
+        """Map the saved characters' names to their save timestamps."""
+        with self._lock:
+            return dict(self._conn.execute(_LIST_SAVES))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every save record, reading the database a page at a time.
+
+        Each page is read in one transaction and the lock is released
+        between pages, so saves made during a long export aren't held up.
+        """
+        last_id = 0
+        while True:
+            with self._lock, self._conn:
+                # One read snapshot for the page's queries
+                self._conn.execute("BEGIN")
+                rows = self._conn.execute(_PAGE_CHARACTERS, (last_id, PAGE_SIZE)).fetchall()
+                if not rows:
+                    return
+                first_id, last_id = rows[0][0], rows[-1][0]
+                records = {}
+                for row in rows:
+                    records[row[0]] = {
+                        "name": row[1],
+                        "class": row[2],
+                        "level": row[3],
+                        "experience": row[4],
+                        "timestamp": row[5],
+                        "revision": row[6],
+                        "skills": {},
+                        "completed_challenges": [],
+                        "unlocked_areas": []
+                    }
+                for character_id, skill, level in self._conn.execute(_PAGE_SKILLS, (first_id, last_id)):
+                    records[character_id]["skills"][skill] = level
+                for character_id, challenge in self._conn.execute(_PAGE_COMPLETIONS, (first_id, last_id)):
+                    records[character_id]["completed_challenges"].append(challenge)
+                for character_id, area in self._conn.execute(_PAGE_AREAS, (first_id, last_id)):
+                    records[character_id]["unlocked_areas"].append(area)
+            yield from records.values()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write many save records, committing a page of them at a time.
+
+        Args:
+            records: Save records, consumed one at a time
+
+        Returns:
+            Number of records written
+        """
+        count = 0
+        page: List[Dict[str, Any]] = []
+        for record in records:
+            page.append(record)
+            if len(page) == PAGE_SIZE:
+                count += self._write_page(page)
+                page = []
+        if page:
+            count += self._write_page(page)
+        return count
+
+    def _write_page(self, records: List[Dict[str, Any]]) -> int:
+        """Write records in one transaction."""
+        with self._lock, self._conn:
+            for record in records:
+                self._write(record)
+        return len(records)
+
+    def migrate_json(self, save_dir: str) -> int:
+        """
+        Import the JSON saves in a directory that haven't been imported yet.
+
+        A JSON save never overwrites a character already in the database,
+        and each file is imported at most once. The files are left in place.
+
+        Args:
+            save_dir: Directory with ``<name>.json`` saves
+
+        Returns:
+            Number of characters imported
+        """
+        with self._lock:
+            migrated = {filename for (filename,) in self._conn.execute("SELECT filename FROM migrated_files")}
+            pending = [filename for filename in os.listdir(save_dir)
+                       if filename.endswith(".json") and filename not in migrated]
+            if not pending:
+                return 0
+
+            imported = 0
+            with self._conn:
+                for filename in sorted(pending):
+                    try:
+                        with open(os.path.join(save_dir, filename), 'rb') as f:
+                            record = save_codec.decode(f.read())
+                        record.setdefault("timestamp", "")
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        print(f"Skipping save file {filename}: {e}")
+                        continue
+
+                    if self._one(_SELECT_ID, (save_slug(record["name"]),)) is None:
+                        self._write(record)
+                        imported += 1
+                    self._conn.execute("INSERT INTO migrated_files (filename) VALUES (?)", (filename,))
+            return imported
+
+    def _one(self, sql: str, parameters: tuple) -> Optional[tuple]:
+        """
+        Run a query for at most one row.
+
+        The result is read to the end: a statement left mid-result keeps
+        its read transaction open, and with it a stale view of the database.
+        """
+        rows = self._conn.execute(sql, parameters).fetchall()
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
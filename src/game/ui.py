@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Optional
 import pyfiglet
 from colorama import Fore, Style, init
 
+from src.ai.evaluation_result import EvaluationResult
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -134,33 +136,35 @@ class UI:
         self.print_section("Description")
         print(challenge['description'])
 
-    def display_challenge_results(self, results: Dict[str, Any]):
+    def display_challenge_results(self, results: EvaluationResult):
         """Display the results of a challenge attempt."""
-        if results['success']:
+        results = EvaluationResult.coerce(results)
+
+        if results.success:
             self.print_success("Challenge Completed Successfully!")
-            print(f"Time taken: {results['time_taken']:.2f} seconds")
+            print(f"Time taken: {results.time_taken:.2f} seconds")
 
-            if 'test_cases' in results:
+            if results.test_cases:
                 self.print_section("Test Cases")
-                for i, case in enumerate(results['test_cases'], 1):
+                for i, case in enumerate(results.test_cases, 1):
                     status = Fore.GREEN + \
-                        "✓ Passed" if case['passed'] else Fore.RED + "✗ Failed"
+                        "✓ Passed" if case.passed else Fore.RED + "✗ Failed"
                     print(f"Test {i}: {status}")
-                    if not case['passed'] and 'error' in case:
-                        print(f"  Error: {case['error']}")
+                    if not case.passed and case.error is not None:
+                        print(f"  Error: {case.error}")
         else:
             self.print_error("Challenge Failed")
-            if 'error' in results:
-                print(f"Error: {results['error']}")
+            if results.error is not None:
+                print(f"Error: {results.error}")
 
-            if 'test_cases' in results:
+            if results.test_cases:
                 self.print_section("Test Cases")
-                for i, case in enumerate(results['test_cases'], 1):
+                for i, case in enumerate(results.test_cases, 1):
                     status = Fore.GREEN + \
-                        "✓ Passed" if case['passed'] else Fore.RED + "✗ Failed"
+                        "✓ Passed" if case.passed else Fore.RED + "✗ Failed"
                     print(f"Test {i}: {status}")
-                    if not case['passed'] and 'error' in case:
-                        print(f"  Error: {case['error']}")
+                    if not case.passed and case.error is not None:
+                        print(f"  Error: {case.error}")
 
     def code_editor(self, initial_code: str = "") -> str:
         """
@@ -194,42 +198,66 @@ class UI:
 
         sys.stdout.write(f"\r{message} Done!{' ' * 10}\n")
 
-    def display_solution_results(self, results: Dict[str, Any]):
+    def display_solution_results(self, results: EvaluationResult):
         """
         Display solution evaluation results.
 
         Args:
-            results: Dictionary with solution results
+            results: EvaluationResult (or legacy results dict)
         """
+        results = EvaluationResult.coerce(results)
+
         self.clear_screen()
         self.print_subtitle("Challenge Results")
 
-        if results["success"]:
+        if results.success:
             self.print_success("SUCCESS! Your solution passed all test cases.")
         else:
             self.print_error("Your solution didn't pass all test cases.")
 
-        if "time_taken" in results:
-            self.print_info(f"Time taken: {results['time_taken']:.2f} seconds")
+        self.print_info(f"Time taken: {results.time_taken:.2f} seconds")
 
-        if "feedback" in results:
+        if results.feedback:
             self.print_subtitle("Feedback")
-            for feedback in results.get("feedback", []):
+            for feedback in results.feedback:
                 self.print_info(feedback)
 
         # Show test case results if available
-        if "test_cases" in results:
+        if results.test_cases:
             self.print_subtitle("Test Cases")
-            for i, test_case in enumerate(results["test_cases"]):
-                status = "✓ Passed" if test_case.get(
-                    "passed", False) else "✗ Failed"
-                if test_case.get("passed", False):
+            for i, test_case in enumerate(results.test_cases):
+                status = "✓ Passed" if test_case.passed else "✗ Failed"
+                if test_case.passed:
                     self.print_success(f"Test {i+1}: {status}")
                 else:
                     self.print_error(f"Test {i+1}: {status}")
 
-                    if "error" in test_case:
-                        self.print_error(f"  Error: {test_case['error']}")
+                    if test_case.error is not None:
+                        self.print_error(f"  Error: {test_case.error}")
+
+    def display_captured_output(self, results: EvaluationResult):
+        """
+        Display what the solution printed during each test case.
+
+        Args:
+            results: EvaluationResult with captured output
+        """
+        self.print_subtitle("Printed Output")
+
+        for i, test_case in enumerate(results.test_cases):
+            output = test_case.output
+            if output is None:
+                continue
+
+            self.print_section(f"Test {i+1}")
+            for label, text, dropped in (("stdout", output.stdout, output.stdout_dropped),
+                                         ("stderr", output.stderr, output.stderr_dropped)):
+                if not text and not dropped:
+                    continue
+                if dropped:
+                    self.print_warning(
+                        f"{label}: first {dropped} bytes were dropped, showing the rest")
+                print(text)
 
     def code_editor(self, initial_code: str = "") -> str:
         """
@@ -8,7 +8,13 @@ from src.game.character import Character, CharacterClass, Skill
 from src.game.world import World, Area
 from src.game.ui import UI
 from src.game.save_manager import SaveManager
+from src.game.autosaver import Autosaver
 from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_watcher import ChallengeWatcher, hot_reload_enabled
+
+# How many challenges the selection menu shows at once
+CHALLENGES_PER_PAGE = 10
 
 
 class Game:
@@ -21,46 +27,25 @@ class Game:
         self.character = None
         self.save_manager = SaveManager()
 
-        # Load challenges
-        self.challenges = self._load_challenges()
-
-    def _load_challenges(self):
-        """Load all challenges (placeholder for dynamic loading)."""
-        # In a future version, this will use ChallengeLoader to load dynamically
-        from src.challenges.challenges.algorithms.two_sum import TwoSumChallenge
-
-        # For now, manually create and return challenges
-        challenges = {
-            "two-sum": TwoSumChallenge()
-        }
-
-        # Add beginner challenges if they exist
-        try:
-            from src.challenges.challenges.algorithms.hello_world import HelloWorldChallenge
-            challenges["hello-world"] = HelloWorldChallenge()
-        except ImportError:
-            pass
-
-        try:
-            from src.challenges.challenges.algorithms.sum_of_two import SumOfTwoChallenge
-            challenges["sum-of-two"] = SumOfTwoChallenge()
-        except ImportError:
-            pass
+        # Progress is journaled after every challenge and saved in the background
+        self.autosaver = Autosaver(self.save_manager)
+        self.autosaver.start()
 
-        # Try to load data structure challenges
-        try:
-            from src.challenges.challenges.data_structures.linked_list_cycle import LinkedListCycleChallenge
-            challenges["linked-list-cycle"] = LinkedListCycleChallenge()
-        except ImportError:
-            pass
+        # Challenges are listed from the manifest and loaded when selected
+        self.challenge_loader = ChallengeLoader()
 
-        try:
-            from src.challenges.challenges.data_structures.max_stack import MaxStackChallenge
-            challenges["max-stack"] = MaxStackChallenge()
-        except ImportError:
-            pass
+        # Authors can have edited challenges reloaded without restarting
+        self.challenge_watcher = None
+        if hot_reload_enabled():
+            self.challenge_watcher = ChallengeWatcher(self.challenge_loader)
+            self.challenge_watcher.start()
 
-        return challenges
+    def shutdown(self):
+        """Write pending progress and stop the background threads."""
+        self.autosaver.stop()
+        if self.challenge_watcher is not None:
+            self.challenge_watcher.stop()
+            self.challenge_watcher = None
 
     def start(self):
         """Start the game."""
@@ -86,6 +71,7 @@ class Game:
             self._show_tutorial()
             self.start()  # Return to main menu after tutorial
         else:
+            self.shutdown()
             sys.exit(0)
 
     def _create_character(self):
@@ -184,6 +170,8 @@ class Game:
             # Main menu options
             choice = self.ui.menu("What would you like to do?", [
                 "Take on a Challenge",
+                "Recommended Next",
+                "Search Challenges",
                 "View Map",
                 "View Character",
                 "Save Game",
@@ -192,18 +180,25 @@ class Game:
 
             if choice == 0:  # Challenge
                 self._select_challenge()
-            elif choice == 1:  # Map
+            elif choice == 1:  # Recommended
+                self._recommended_challenges()
+            elif choice == 2:  # Search
+                self._search_challenges()
+            elif choice == 3:  # Map
                 self._show_map()
-            elif choice == 2:  # Character
+            elif choice == 4:  # Character
                 self._view_character()
-            elif choice == 3:  # Save
+            elif choice == 5:  # Save
+                # Write pending autosaves first so they can't replace this save
+                self.autosaver.flush()
                 if self.save_manager.save_game(self.character):
                     self.ui.print_success("Game saved successfully!")
                 else:
                     self.ui.print_error("Failed to save game.")
                 input("\nPress Enter to continue...")
             else:
-                if self.ui.confirm("Are you sure you want to exit? Unsaved progress will be lost."):
+                if self.ui.confirm("Are you sure you want to exit?"):
+                    self.shutdown()
                     break
 
     def _show_map(self):
@@ -235,35 +230,120 @@ class Game:
 
     def _select_challenge(self):
         """Select a challenge to attempt."""
-        self.ui.clear_screen()
-        self.ui.print_subtitle("Available Challenges")
-
         # Get current area
         # Default to first area
         current_area = self.character.unlocked_areas[0]
+        page_number = 0
+        hide_completed = False
+
+        while True:
+            self.ui.clear_screen()
+            self.ui.print_subtitle("Available Challenges")
+
+            # Query one page of this area (metadata only, nothing is imported yet)
+            page = self.challenge_loader.query_challenges(
+                area=current_area,
+                exclude_completed=self.character.completed_challenges if hide_completed else None,
+                page=page_number,
+                page_size=CHALLENGES_PER_PAGE
+            )
+
+            if not page.total and not hide_completed:
+                self.ui.print_warning(
+                    f"No challenges available in {current_area} yet.")
+                input("\nPress Enter to return...")
+                return
+
+            # Create a menu of challenges
+            challenge_options = [
+                f"{c.name} - {c.difficulty.value} ({c.xp_reward} XP)" for c in page.items]
+            actions = []
+            if page.has_next:
+                actions.append("next")
+                challenge_options.append("Next Page")
+            if page.has_previous:
+                actions.append("previous")
+                challenge_options.append("Previous Page")
+            actions.append("toggle")
+            challenge_options.append("Show Completed" if hide_completed else "Hide Completed")
+            actions.append("return")
+            challenge_options.append("Return to Main Menu")
+
+            choice = self.ui.menu(
+                f"Select a challenge (page {page.page + 1}/{page.pages}):", challenge_options)
+
+            if choice < len(page.items):
+                break
+
+            action = actions[choice - len(page.items)]
+            if action == "next":
+                page_number += 1
+            elif action == "previous":
+                page_number -= 1
+            elif action == "toggle":
+                hide_completed = not hide_completed
+                page_number = 0
+            else:
+                return  # Return to main menu
+
+        self._open_challenge(page.items[choice].id)
+
+    def _recommended_challenges(self):
+        """Offer the challenges that suit the character best right now."""
+        self.ui.clear_screen()
+        self.ui.print_subtitle("Recommended Next")
 
-        # Get challenges for this area
-        area_challenges = [
-            c for c in self.challenges.values() if c.area == current_area]
+        recommended = self.challenge_loader.recommend_challenges(self.character)
 
-        if not area_challenges:
-            self.ui.print_warning(
-                f"No challenges available in {current_area} yet.")
+        if not recommended:
+            self.ui.print_warning("You've completed every challenge in your unlocked areas!")
             input("\nPress Enter to return...")
             return
 
-        # Create a menu of challenges
-        challenge_options = [
-            f"{c.name} - {c.difficulty.value} ({c.xp_reward} XP)" for c in area_challenges]
-        challenge_options.append("Return to Main Menu")
+        options = []
+        for c in recommended:
+            skill = f" [{Skill[c.primary_skill].value}]" if c.primary_skill in Skill.__members__ else ""
+            options.append(f"{c.name} - {c.area}, {c.difficulty.value} ({c.xp_reward} XP){skill}")
+        options.append("Return to Main Menu")
+
+        choice = self.ui.menu("Select a challenge:", options)
+        if choice < len(recommended):
+            self._open_challenge(recommended[choice].id)
+
+    def _search_challenges(self):
+        """Find challenges by words in their name, description or hints."""
+        self.ui.clear_screen()
+        self.ui.print_subtitle("Search Challenges")
 
-        choice = self.ui.menu("Select a challenge:", challenge_options)
+        query = self.ui.prompt("Search for")
+        results = self.challenge_loader.search_challenges(query)
 
-        if choice >= len(area_challenges):
-            return  # Return to main menu
+        if not results:
+            self.ui.print_warning(f"No challenges match '{query}'.")
+            input("\nPress Enter to return...")
+            return
+
+        options = [f"{c.name} - {c.area}, {c.difficulty.value} ({c.xp_reward} XP)" for c in results]
+        options.append("Return to Main Menu")
+
+        choice = self.ui.menu("Select a challenge:", options)
+        if choice < len(results):
+            self._open_challenge(results[choice].id)
+
+    def _open_challenge(self, challenge_id: str):
+        """
+        Show a challenge and let the player attempt it or ask for a hint.
 
-        # Get the selected challenge
-        selected_challenge = area_challenges[choice]
+        Args:
+            challenge_id: ID of the challenge to open
+        """
+        # Load the selected challenge
+        selected_challenge = self.challenge_loader.get_challenge(challenge_id)
+        if selected_challenge is None:
+            # Removed by a hot reload since the menu was drawn
+            self.ui.print_warning("That challenge is no longer available.")
+            input("\nPress Enter to return...")
+            return
 
         self.ui.display_challenge({
             "name": selected_challenge.name,
@@ -315,103 +395,82 @@ class Game:
             # Show "evaluating" animation
             self.ui.print_info("Evaluating your solution...")
 
-            try:
-                # Create namespace for executing code
-                namespace = {}
-                
-                # Execute user code
-                exec(user_code, namespace)
-                
-                # Get the function name from challenge ID
-                function_name = challenge.id.replace("-", "_")
-                
-                # Try to find the function in namespace
-                if function_name not in namespace:
-                    # Look for any callable that isn't a built-in
-                    for name, obj in namespace.items():
-                        if callable(obj) and not name.startswith("__"):
-                            function_name = name
-                            break
-                
-                if function_name in namespace and callable(namespace[function_name]):
-                    # Get user solution function
-                    user_solution = namespace[function_name]
-                    
-                    # Evaluate solution
-                    result = challenge.attempt_solution(user_solution)
-                    
-                    # Display results
-                    self.ui.clear_screen()
-                    self.ui.print_subtitle("Challenge Results")
-
-                    if result["success"]:
+            # Parse, load and verify the solution through the submission pipeline
+            result = challenge.attempt(user_code)
+            self.challenge_loader.record_attempt(self.character, challenge.id, result.success)
+
+            # Display results
+            self.ui.clear_screen()
+            self.ui.print_subtitle("Challenge Results")
+
+            if result.success:
+                self.ui.print_success(
+                    "Congratulations! Your solution passed all test cases.")
+
+                try:
+                    # Award XP and mark challenge as completed
+                    skill = challenge.primary_skill if hasattr(challenge, 'primary_skill') else None
+                    leveled_up = self.character.complete_challenge(
+                        challenge_name=challenge.name,
+                        skill=skill,
+                        xp_gained=challenge.xp_reward
+                    )
+                    self.autosaver.record(self.character)
+
+                    self.ui.print_success(f"You earned {challenge.xp_reward} XP!")
+
+                    # Show level up message if applicable
+                    if leveled_up:
                         self.ui.print_success(
-                            "Congratulations! Your solution passed all test cases.")
-                        
-                        try:
-                            # Award XP
-                            leveled_up = self.character.add_experience(challenge.xp_reward)
-                            
-                            # Mark challenge as completed
-                            self.character.complete_challenge(
-                                challenge_name=challenge.name,
-                                skill=challenge.primary_skill if hasattr(challenge, 'primary_skill') else None,
-                                xp_gained=challenge.xp_reward
-                            )
-                            
-                            self.ui.print_success(f"You earned {challenge.xp_reward} XP!")
-                            
-                            # Show level up message if applicable
-                            if leveled_up:
-                                self.ui.print_success(
-                                    f"Level up! You are now level {self.character.level}!")
-                                
-                                # Check if new areas were unlocked
-                                if hasattr(self.character, 'unlocked_areas') and len(self.character.unlocked_areas) > 1:
-                                    new_area = self.character.unlocked_areas[-1]
-                                    self.ui.print_success(
-                                        f"You've unlocked a new area: {new_area}!")
-                        except Exception as e:
-                            self.ui.print_error(f"Error updating character progress: {str(e)}")
-                            
-                        # Challenge completed successfully, no need to retry
-                        attempt_again = False
+                            f"Level up! You are now level {self.character.level}!")
+
+                        # Check if new areas were unlocked
+                        if hasattr(self.character, 'unlocked_areas') and len(self.character.unlocked_areas) > 1:
+                            new_area = self.character.unlocked_areas[-1]
+                            self.ui.print_success(
+                                f"You've unlocked a new area: {new_area}!")
+                except Exception as e:
+                    self.ui.print_error(f"Error updating character progress: {str(e)}")
+
+                # Challenge completed successfully, no need to retry
+                attempt_again = False
+            elif result.stage is not None:
+                # The solution never reached the test cases
+                self.ui.print_error(result.error)
+            else:
+                self.ui.print_warning(
+                    "Your solution did not pass all test cases.")
+                if result.error is not None:
+                    self.ui.print_error(result.error)
+
+            # Show feedback
+            if result.feedback:
+                self.ui.print_subtitle("Feedback:")
+                for feedback in result.feedback:
+                    self.ui.print_info(feedback)
+
+            # Show test case results if available
+            if result.test_cases:
+                self.ui.print_subtitle("Test Cases:")
+                for i, tc in enumerate(result.test_cases):
+                    if tc.passed:
+                        self.ui.print_success(f"Test {i+1}: Passed")
                     else:
-                        self.ui.print_warning(
-                            "Your solution did not pass all test cases.")
-                    
-                    # Show feedback
-                    if "feedback" in result and result["feedback"]:
-                        self.ui.print_subtitle("Feedback:")
-                        for feedback in result["feedback"]:
-                            self.ui.print_info(feedback)
-                    
-                    # Show test case results if available
-                    if "test_cases" in result and result["test_cases"]:
-                        self.ui.print_subtitle("Test Cases:")
-                        for i, tc in enumerate(result["test_cases"]):
-                            if tc.get("passed", False):
-                                self.ui.print_success(f"Test {i+1}: Passed")
-                            else:
-                                self.ui.print_error(f"Test {i+1}: Failed")
-                                if "error" in tc:
-                                    self.ui.print_error(f"  Error: {tc['error']}")
-                    
-                    # Ask if the user wants to try again if the solution failed
-                    if not result["success"]:
-                        retry_choice = self.ui.menu("Would you like to try again?", ["Yes", "No"])
-                        attempt_again = (retry_choice == 0)  # Yes is index 0
-                    
-                else:
-                    self.ui.print_error(f"Could not find a solution function in your code. The function should be named '{function_name}'.")
-                    retry_choice = self.ui.menu("Would you like to try again?", ["Yes", "No"])
-                    attempt_again = (retry_choice == 0)  # Yes is index 0
-                    
-            except Exception as e:
-                self.ui.print_error(f"Error evaluating your solution: {str(e)}")
+                        self.ui.print_error(f"Test {i+1}: Failed")
+                        if tc.error is not None:
+                            self.ui.print_error(f"  Error: {tc.error}")
+
+            # Printed output is only rendered if the player asks for it
+            printed = sum(1 for tc in result.test_cases if tc.output is not None)
+            if printed and self.ui.confirm(
+                    f"Your solution printed output in {printed} test case(s). View it?"):
+                self.ui.display_captured_output(result)
+
+            # Ask if the user wants to try again if the solution failed
+            if not result.success:
                 retry_choice = self.ui.menu("Would you like to try again?", ["Yes", "No"])
                 attempt_again = (retry_choice == 0)  # Yes is index 0
-            
+
             if attempt_again:
                 continue
             else:
@@ -504,4 +563,8 @@ class Game:
 
 if __name__ == "__main__":
     game = Game()
-    game.start()
+    try:
+        game.start()
+    finally:
+        # Don't let interpreter exit kill the autosaver mid-write
+        game.shutdown()
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from src.game import save_store
+from src.game.autosaver import Autosaver
+from src.game.character import Character, CharacterClass
+from src.game.save_manager import SaveManager
+from src.game.save_store import JsonSaveStore
+
+
+def win_challenge(autosaver, character, name, xp):
+    """Apply and record a completed challenge the way the game does."""
+    character.add_experience(xp)
+    character.complete_challenge(name, skill="ARRAYS")
+    autosaver.record(character)
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_events_are_journaled_then_saved_after_quiet_period(tmp_path):
+    """Test that events hit the journal at once and a save follows the debounce."""
+    manager = SaveManager(str(tmp_path))
+    autosaver = Autosaver(manager, delay=1.0)
+    autosaver.start()
+    try:
+        character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+        win_challenge(autosaver, character, "Two Sum", 150)
+
+        # XP, the completion and the skill increase
+        wait_for(lambda: len(manager.journal.events("Ada")) == 3)
+        assert manager.get_saved_games() == {}
+
+        wait_for(lambda: "Ada" in manager.get_saved_games())
+        record = manager.store.read("Ada")
+        assert manager.journal.events("Ada", after=record["timestamp"]) == []
+        assert manager.load_game("Ada").to_dict() == character.to_dict()
+        # The journal keeps every event
+        assert [event["type"] for event in manager.progress_events("Ada")] == [
+            "xp_gained", "challenge_completed", "skill_increased"]
+    finally:
+        autosaver.stop()
+
+
+def test_journal_replays_progress_after_crash(tmp_path):
+    """Test that progress newer than the last save is recovered on load."""
+    manager = SaveManager(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+
+    # The save is only due long after the events are journaled
+    autosaver = Autosaver(manager, delay=60)
+    autosaver.start()
+    win_challenge(autosaver, character, "Two Sum", 150)
+    win_challenge(autosaver, character, "Max Stack", 200)
+    wait_for(lambda: len(manager.journal.events("Ada")) == 7)
+    # A crash mid-append leaves a torn line behind
+    with open(manager.journal.path_for("Ada"), 'a') as f:
+        f.write('{"at": "9999", "charac')
+
+    loaded = SaveManager(str(tmp_path)).load_game("Ada")
+    assert loaded.to_dict() == character.to_dict()
+    assert loaded.unlocked_areas == ["Algorithm Forest", "Data Structure Dungeon"]
+    autosaver.stop()
+
+
+def test_stop_flushes_pending_saves(tmp_path):
+    """Test that stopping writes the debounced save right away."""
+    manager = SaveManager(str(tmp_path))
+    autosaver = Autosaver(manager, delay=60)
+    autosaver.start()
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    win_challenge(autosaver, character, "Two Sum", 50)
+
+    autosaver.stop()
+    record = manager.store.read("Ada")
+    assert record["completed_challenges"] == ["Two Sum"]
+    assert manager.journal.events("Ada", after=record["timestamp"]) == []
+
+
+def test_flush_waits_for_a_save_in_progress(tmp_path, monkeypatch):
+    """Test that flush doesn't return while the thread is still writing an older save."""
+    manager = SaveManager(str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+    write_record = manager.write_record
+
+    def slow_write_record(record, **kwargs):
+        started.set()
+        release.wait(5)
+        return write_record(record, **kwargs)
+
+    monkeypatch.setattr(manager, "write_record", slow_write_record)
+    autosaver = Autosaver(manager, delay=0)
+    autosaver.start()
+    try:
+        character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+        win_challenge(autosaver, character, "Two Sum", 50)
+        assert started.wait(5)
+
+        flusher = threading.Thread(target=autosaver.flush)
+        flusher.start()
+        flusher.join(0.2)
+        assert flusher.is_alive()
+
+        release.set()
+        flusher.join(5)
+        assert not flusher.is_alive()
+        assert manager.store.read("Ada")["completed_challenges"] == ["Two Sum"]
+    finally:
+        release.set()
+        autosaver.stop()
+
+
+def test_json_save_is_replaced_atomically(tmp_path, monkeypatch):
+    """Test that a failed write leaves the previous save intact."""
+    manager = SaveManager(str(tmp_path), store=JsonSaveStore(str(tmp_path)))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+
+    def crash(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(save_store.os, "fsync", crash)
+    character.add_experience(500)
+    assert not manager.save_game(character)
+    monkeypatch.undo()
+
+    assert json.loads((tmp_path / "ada.json").read_text())["level"] == 1
+    assert manager.store.read("Ada")["level"] == 1
+
+
+def test_busy_play_is_snapshotted_and_replay_is_bounded(tmp_path, monkeypatch):
+    """Test that steady progress still gets saved and loads read only the log's tail."""
+    manager = SaveManager(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+
+    autosaver = Autosaver(manager, delay=60, snapshot_events=10)
+    autosaver.start()
+    try:
+        for step in range(6):
+            win_challenge(autosaver, character, f"Challenge {step}", 10)
+        # 3 events per challenge: saved from the fourth on, long before the delay
+        wait_for(lambda: len(manager.store.read("Ada")["completed_challenges"]) >= 4)
+    finally:
+        autosaver.stop()
+
+    starts = []
+    iter_events = manager.journal.iter_events
+    monkeypatch.setattr(manager.journal, "iter_events",
+                        lambda name, start=0: starts.append(start) or iter_events(name, start))
+    assert manager.load_game("Ada").to_dict() == character.to_dict()
+    assert starts[0] > 0
+    assert len(list(manager.progress_events("Ada"))) == 18
+
+
+def test_old_journal_is_moved_into_the_event_logs(tmp_path):
+    """Test that progress journaled by older versions is still replayed."""
+    manager = SaveManager(str(tmp_path))
+    manager.save_game(Character("Ada", CharacterClass.ALGORITHM_WIZARD))
+    event = {"at": "9999-01-01T00:00:00", "character": "Ada", "type": "challenge_completed",
+             "challenge": "Two Sum", "skill": "ARRAYS"}
+    (tmp_path / "journal.ndjson").write_text(json.dumps(event) + "\n")
+
+    loaded = SaveManager(str(tmp_path)).load_game("Ada")
+    assert loaded.completed_challenges == ["Two Sum"]
+    assert loaded.skills["ARRAYS"] == 2
+    assert not (tmp_path / "journal.ndjson").exists()
+
+
+def test_events_logged_after_a_save_are_replayed_whatever_their_timestamp(tmp_path):
+    """Test that progress from a process whose clock lags behind isn't lost on load."""
+    manager = SaveManager(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+
+    # Another process stamped this before the save but logged it after
+    event = {"at": "2000-01-01T00:00:00", "character": "Ada", "type": "challenge_completed",
+             "challenge": "Two Sum"}
+    manager.journal.append([event])
+
+    assert SaveManager(str(tmp_path)).load_game("Ada").completed_challenges == ["Two Sum"]
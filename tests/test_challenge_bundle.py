@@ -0,0 +1,89 @@
+import json
+import zipfile
+from src.challenges.challenge_bundle import ChallengeBundle
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_pack import DeclarativeChallenge
+from src.challenges.challenge_registry import ChallengeRegistry
+
+
+TRIPLE_MODULE = '''
+from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+
+
+class TripleChallenge(Challenge):
+    def __init__(self):
+        super().__init__(
+            id="zipped-triple",
+            name="The Tripling Charm",
+            description="Triple a number.",
+            difficulty=DifficultyLevel.EASY,
+            challenge_type=ChallengeType.ALGORITHM,
+            xp_reward=5,
+            test_cases=[{"input": [2], "expected": 6}],
+            entry_point="triple"
+        )
+
+    def verify_solution(self, user_solution):
+        from src.ai.solution_evaluator import SolutionEvaluator
+        return SolutionEvaluator().evaluate(user_solution, plan=self.get_test_plan())
+'''
+
+
+def make_bundle(path):
+    """Write a bundle with one Python challenge and one pack with external test cases."""
+    pack = {"challenges": [{
+        "id": "zipped-negate", "name": "The Mirror Rune", "description": "Negate.",
+        "difficulty": "Easy", "challenge_type": "Algorithm", "xp_reward": 5,
+        "entry_point": "negate", "test_cases_file": "cases/negate.json"
+    }]}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("zipped_triple_pack/__init__.py", "")
+        zf.writestr("zipped_triple_pack/triple.py", TRIPLE_MODULE)
+        zf.writestr("packs/mirror.pack.json", json.dumps(pack))
+        zf.writestr("packs/cases/negate.json", json.dumps([{"input": [3], "expected": -3}]))
+
+
+def test_bundle_reads_members_lazily(tmp_path, monkeypatch):
+    """Test that a bundle only decompresses the members that are read."""
+    path = str(tmp_path / "bundle.zip")
+    make_bundle(path)
+
+    bundle = ChallengeBundle(path)
+    assert bundle.module_members() == ["zipped_triple_pack/triple.py"]
+
+    reads = []
+    original = zipfile.ZipFile.read
+
+    def counting_read(zf, info, *args):
+        reads.append(info.filename)
+        return original(zf, info, *args)
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", counting_read)
+    assert json.loads(bundle.reader("packs")("cases/negate.json")) == [{"input": [3], "expected": -3}]
+    assert reads == ["packs/cases/negate.json"]
+    bundle.close()
+
+
+def test_loader_mounts_bundle(tmp_path):
+    """Test that mounted bundles serve both Python and declarative challenges."""
+    path = str(tmp_path / "bundle.zip")
+    make_bundle(path)
+
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json"), [str(tmp_path / "empty")]))
+    loader.mount(path)
+
+    meta = loader.registry.get_metadata("zipped-negate")
+    assert meta.bundle == path and meta.pack == "packs/mirror.pack.json"
+
+    negate = loader.get_challenge("zipped-negate")
+    assert isinstance(negate, DeclarativeChallenge)
+    assert negate.attempt("def negate(x):\n    return -x\n").success
+    loader.registry._close_bundle(path)
+
+    # A warm start imports the zipped module through zipimport only when it's requested
+    registry = ChallengeRegistry(str(tmp_path / "manifest.json"), [path])
+    registry.refresh()
+    assert registry._instances == {}
+    triple = registry.get("zipped-triple")
+    assert triple.attempt("def triple(x):\n    return 3 * x\n").success
+    registry._close_bundle(path)
@@ -0,0 +1,117 @@
+from src.challenges.challenge_base import DifficultyLevel, ChallengeType
+from src.challenges.challenge_index import ChallengeIndex
+from src.challenges.challenge_registry import ChallengeMetadata
+
+
+def make_metadata(count):
+    """Build synthetic metadata spread over a few areas, difficulties and skills."""
+    areas = ["Algorithm Forest", "Data Structure Mountains", "Function Fields"]
+    difficulties = list(DifficultyLevel)
+    skills = ["ARRAYS", "SEARCHING", None]
+    return [
+        ChallengeMetadata(
+            id=f"challenge-{i}",
+            name=f"Challenge {i:05d}",
+            area=areas[i % len(areas)],
+            difficulty=difficulties[i % len(difficulties)],
+            challenge_type=ChallengeType.ALGORITHM if i % 2 else ChallengeType.DATA_STRUCTURE,
+            xp_reward=10 * (i % 20),
+            primary_skill=skills[i % len(skills)],
+            module="synthetic",
+            class_name="SyntheticChallenge",
+            mtime=0.0
+        )
+        for i in range(count)
+    ]
+
+
+def test_index_combined_query_matches_linear_scan():
+    """Test that combined filters, sorting and pagination agree with a brute-force scan."""
+    metadata = make_metadata(2000)
+    index = ChallengeIndex(metadata)
+
+    completed = [f"Challenge {i:05d}" for i in range(0, 2000, 7)]
+    page = index.query(
+        area="Algorithm Forest",
+        difficulty=DifficultyLevel.MEDIUM,
+        primary_skill="ARRAYS",
+        min_xp=50,
+        max_xp=150,
+        exclude_completed=completed,
+        sort_by="xp",
+        page=1,
+        page_size=5
+    )
+
+    expected = sorted(
+        (m for m in metadata
+         if m.area == "Algorithm Forest" and m.difficulty == DifficultyLevel.MEDIUM
+         and m.primary_skill == "ARRAYS" and 50 <= m.xp_reward <= 150
+         and m.name not in completed),
+        key=lambda m: (m.xp_reward, m.name)
+    )
+    assert page.total == len(expected)
+    assert [m.id for m in page.items] == [m.id for m in expected[5:10]]
+    assert page.has_previous
+
+
+def test_index_sorts_by_difficulty_and_updates():
+    """Test default ordering and that add/remove keep buckets consistent."""
+    metadata = make_metadata(8)
+    index = ChallengeIndex(metadata)
+
+    page = index.query(page_size=100)
+    ranks = [list(DifficultyLevel).index(m.difficulty) for m in page.items]
+    assert ranks == sorted(ranks)
+    assert page.pages == 1 and not page.has_next
+
+    index.remove("challenge-0")
+    assert "challenge-0" not in {m.id for m in index.query(area="Algorithm Forest").items}
+
+    index.add(metadata[0])
+    assert index.query(challenge_type=ChallengeType.DATA_STRUCTURE, page_size=100).total == 4
+    # Completed challenges can be given by ID as well as by name
+    assert index.query(exclude_completed=["challenge-0"], page_size=100).total == 7
+
+
+def test_page_query_stops_at_the_end_of_the_page(monkeypatch):
+    """Test that totals stay exact while a query reads only up to its page."""
+    metadata = make_metadata(3000)
+    index = ChallengeIndex(metadata)
+    completed = [f"Challenge {i:05d}" for i in range(0, 3000, 5)] + ["challenge-1", "Not A Challenge"]
+
+    read = []
+    sorted_bucket = index._sorted_bucket
+
+    def counting_bucket(*args):
+        for meta in sorted_bucket(*args):
+            read.append(meta)
+            yield meta
+
+    monkeypatch.setattr(index, "_sorted_bucket", counting_bucket)
+    page = index.query(area="Function Fields", challenge_type=ChallengeType.ALGORITHM,
+                       exclude_completed=completed, sort_by="name", page=2, page_size=10)
+
+    expected = sorted(
+        (m for m in metadata
+         if m.area == "Function Fields" and m.challenge_type == ChallengeType.ALGORITHM
+         and m.name not in completed and m.id not in completed),
+        key=lambda m: m.name
+    )
+    assert page.total == len(expected)
+    assert [m.id for m in page.items] == [m.id for m in expected[20:30]]
+    assert len(read) < 100
+
+
+def test_challenges_sharing_a_name_are_both_indexed():
+    """Test that a name shared by two challenges maps to both of them."""
+    pack, module = make_metadata(2)
+    module.name = pack.name
+    index = ChallengeIndex([pack, module])
+
+    assert index.query(exclude_completed=[pack.name]).total == 0
+
+    index.remove(pack.id)
+    page = index.query(exclude_completed=["Someone else's challenge"])
+    assert [meta.id for meta in page.items] == [module.id]
+    assert index.query(exclude_completed=[pack.name]).total == 0
@@ -0,0 +1,103 @@
+import json
+import pytest
+from src.challenges.challenge_base import DifficultyLevel, ChallengeType
+from src.challenges.challenge_pack import (
+    DeclarativeChallenge, PackError, parse_pack, tomllib
+)
+from src.challenges.challenge_registry import ChallengeRegistry
+
+
+SQUARE_PACK = {
+    "pack": {"area": "Function Fields", "primary_skill": "RECURSION"},
+    "challenges": [
+        {
+            "id": "square",
+            "name": "The Squaring Stone",
+            "description": ["Write a function 'square'", "that squares a number."],
+            "difficulty": "Easy",
+            "challenge_type": "ALGORITHM",
+            "xp_reward": 15,
+            "test_cases_file": "square_cases.json",
+            "success_feedback": ["The stone glows."]
+        }
+    ]
+}
+
+
+def test_parse_pack_applies_defaults_and_enums():
+    """Test that pack defaults, enum names and line lists are normalized."""
+    spec = parse_pack(json.dumps(SQUARE_PACK).encode(), "square.pack.json")[0]
+
+    assert spec["area"] == "Function Fields"
+    assert spec["difficulty"] == DifficultyLevel.EASY
+    assert spec["challenge_type"] == ChallengeType.ALGORITHM
+    assert spec["description"] == "Write a function 'square'\nthat squares a number."
+
+    with pytest.raises(PackError):
+        parse_pack(b'{"challenges": [{"id": "broken"}]}', "broken.pack.json")
+
+
+def test_declarative_challenge_reads_test_cases_lazily():
+    """Test that external test cases are only read when the challenge is evaluated."""
+    reads = []
+
+    def read_file(name):
+        reads.append(name)
+        return json.dumps([{"input": [3], "expected": 9}, {"input": [-2], "expected": 4}]).encode()
+
+    spec = parse_pack(json.dumps(SQUARE_PACK).encode(), "square.pack.json")[0]
+    challenge = DeclarativeChallenge(spec, read_file)
+    assert reads == []
+
+    results = challenge.attempt("def square(x):\n    return x * x\n")
+    assert results.success
+    assert results.feedback[-1] == "The stone glows."
+    assert reads == ["square_cases.json"]
+
+
+@pytest.mark.skipif(tomllib is None, reason="needs tomllib or tomli")
+def test_parse_toml_pack():
+    """Test that TOML packs parse into the same specs as JSON ones."""
+    data = b'''
+[[challenges]]
+id = "double"
+name = "The Doubling Rune"
+description = "Double it."
+difficulty = "Medium"
+challenge_type = "Algorithm"
+xp_reward = 20
+
+[[challenges.test_cases]]
+input = [2]
+expected = 4
+'''
+    spec = parse_pack(data, "double.pack.toml")[0]
+    assert spec["difficulty"] == DifficultyLevel.MEDIUM
+    assert DeclarativeChallenge(spec).attempt("def double(x):\n    return 2 * x\n").success
+
+
+def test_registry_loads_packs(tmp_path):
+    """Test that the registry indexes large packs without building challenges."""
+    pack_dir = tmp_path / "packs"
+    pack_dir.mkdir()
+    pack = {"challenges": [
+        {"id": f"add-{i}", "name": f"Add {i}", "description": "Add.", "difficulty": "Easy",
+         "challenge_type": "Algorithm", "xp_reward": i, "entry_point": "add",
+         "test_cases": [{"input": [1, i], "expected": 1 + i}]}
+        for i in range(2000)
+    ]}
+    (pack_dir / "adders.pack.json").write_text(json.dumps(pack))
+    # Test case files next to packs aren't mistaken for packs
+    (pack_dir / "square_cases.json").write_text("[]")
+
+    manifest_path = str(tmp_path / "manifest.json")
+    ChallengeRegistry(manifest_path, [str(pack_dir)]).refresh()
+
+    registry = ChallengeRegistry(manifest_path, [str(pack_dir)])
+    registry.refresh()
+    assert len(registry.list_metadata()) == 2000
+    assert registry._instances == {} and registry._packs == {}
+
+    challenge = registry.get("add-7")
+    assert isinstance(challenge, DeclarativeChallenge)
+    assert challenge.attempt("def add(a, b):\n    return a + b\n").success
@@ -0,0 +1,75 @@
+import sys
+from src.challenges import challenge_plugins
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_registry import ChallengeRegistry
+
+
+DRAGON_MODULE = '''
+from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+
+
+class DragonChallenge(Challenge):
+    def __init__(self):
+        super().__init__(
+            id="plugin-dragon",
+            name="The Dragon's Riddle",
+            description="Count the dragon's heads.",
+            difficulty=DifficultyLevel.HARD,
+            challenge_type=ChallengeType.ALGORITHM,
+            xp_reward=150,
+            test_cases=[{"input": [3], "expected": 3}],
+            entry_point="heads"
+        )
+
+    def verify_solution(self, user_solution):
+        from src.ai.solution_evaluator import SolutionEvaluator
+        return SolutionEvaluator().evaluate(user_solution, plan=self.get_test_plan())
+'''
+
+
+class FakeEntryPoint:
+    """Just the entry point attributes discover_packs reads."""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+        self.dist = None
+
+
+def test_plugin_packs_import_on_first_use(tmp_path, monkeypatch):
+    """Test that installed packs are listed from the manifest and imported only when opened."""
+    package = tmp_path / "site" / "dragon_plugin_pack" / "challenges"
+    package.mkdir(parents=True)
+    (package.parent / "__init__.py").write_text("")
+    (package / "__init__.py").write_text("")
+    (package / "dragon.py").write_text(DRAGON_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    monkeypatch.setattr(challenge_plugins, "_entry_points",
+                        lambda group: [FakeEntryPoint("dragons", "dragon_plugin_pack.challenges")])
+
+    manifest_path = str(tmp_path / "manifest.json")
+    module_name = "dragon_plugin_pack.challenges.dragon"
+    try:
+        loader = ChallengeLoader(ChallengeRegistry(manifest_path, [str(tmp_path / "empty")]))
+        assert [pack.name for pack in loader.plugin_packs] == ["dragons"]
+        assert loader.registry.get_metadata("plugin-dragon").module == module_name
+
+        del sys.modules[module_name]
+        warm = ChallengeLoader(ChallengeRegistry(manifest_path, [str(tmp_path / "empty")]))
+        assert warm.query_challenges(min_xp=150).items[0].id == "plugin-dragon"
+        assert module_name not in sys.modules
+
+        challenge = warm.get_challenge("plugin-dragon")
+        assert module_name in sys.modules
+        assert challenge.attempt("def heads(n):\n    return n\n").success
+    finally:
+        for name in [m for m in sys.modules if m.startswith("dragon_plugin_pack")]:
+            del sys.modules[name]
+
+
+def test_discover_packs_skips_missing_packages(monkeypatch, capsys):
+    """Test that a broken entry point is reported instead of stopping the game."""
+    monkeypatch.setattr(challenge_plugins, "_entry_points",
+                        lambda group: [FakeEntryPoint("ghost", "no_such_fantasy_pack")])
+    assert challenge_plugins.discover_packs() == []
+    assert "ghost" in capsys.readouterr().out
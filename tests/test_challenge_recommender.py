@@ -0,0 +1,85 @@
+from src.challenges.challenge_base import DifficultyLevel, ChallengeType
+from src.challenges.challenge_index import ChallengeIndex
+from src.challenges.challenge_recommender import ChallengeRecommender
+from src.challenges.challenge_registry import ChallengeMetadata
+from src.game.character import Character, CharacterClass
+
+
+def make_meta(challenge_id, skill, difficulty=DifficultyLevel.EASY, area="Algorithm Forest", xp=10):
+    """Build metadata for a synthetic challenge."""
+    return ChallengeMetadata(
+        id=challenge_id, name=challenge_id.title(), area=area, difficulty=difficulty,
+        challenge_type=ChallengeType.ALGORITHM, xp_reward=xp, primary_skill=skill,
+        module="synthetic", class_name="SyntheticChallenge", mtime=0.0
+    )
+
+
+def make_index():
+    """A small catalog across skills, difficulties and areas."""
+    return ChallengeIndex([
+        make_meta("arrays-1", "ARRAYS"),
+        make_meta("arrays-2", "ARRAYS", xp=20),
+        make_meta("search-1", "SEARCHING"),
+        make_meta("search-hard", "SEARCHING", DifficultyLevel.HARD),
+        make_meta("graphs-locked", "GRAPHS", area="Recursive Ruins"),
+    ])
+
+
+def test_recommends_weakest_skill_at_fitting_difficulty():
+    """Test ranking by skill level, difficulty fit and reward."""
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    character.skills["SEARCHING"] = 4
+
+    ids = [meta.id for meta in ChallengeRecommender(make_index()).recommend(character)]
+    assert ids == ["arrays-2", "arrays-1", "search-1", "search-hard"]
+
+
+def test_completion_updates_heap_incrementally():
+    """Test that completions and skill gains re-rank without a rebuild."""
+    index = make_index()
+    recommender = ChallengeRecommender(index)
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    character.skills["SEARCHING"] = 2
+    recommender.recommend(character)
+
+    rebuilds = []
+    original = recommender._rebuild
+    recommender._rebuild = lambda state, c: rebuilds.append(c) or original(state, c)
+
+    for _ in range(2):
+        character.complete_challenge("Arrays-2", skill="ARRAYS")
+        character.skills["ARRAYS"] += 2
+    recommender.record_attempt(character, "arrays-2", True)
+
+    ids = [meta.id for meta in recommender.recommend(character)]
+    assert rebuilds == []
+    assert ids == [meta.id for meta in ChallengeRecommender(index).recommend(character)]
+    assert ids[0] == "search-1" and "arrays-2" not in ids
+
+
+def test_failed_attempts_adjust_priority():
+    """Test that one failure promotes a retry and repeated failures push it back."""
+    recommender = ChallengeRecommender(make_index())
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+
+    recommender.record_attempt(character, "search-1", False)
+    assert recommender.recommend(character, 1)[0].id == "search-1"
+
+    for _ in range(3):
+        recommender.record_attempt(character, "search-1", False)
+    assert recommender.recommend(character)[-2].id == "search-1"
+
+
+def test_completed_name_retires_every_challenge_with_it():
+    """Test that two challenges sharing a name are both retired when it is completed."""
+    index = make_index()
+    twin = make_meta("arrays-pack", "ARRAYS")
+    twin.name = "Arrays-1"
+    index.add(twin)
+    recommender = ChallengeRecommender(index)
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    assert "arrays-pack" in [meta.id for meta in recommender.recommend(character)]
+
+    character.complete_challenge("Arrays-1", skill="ARRAYS")
+    ids = [meta.id for meta in recommender.recommend(character)]
+    assert "arrays-1" not in ids and "arrays-pack" not in ids
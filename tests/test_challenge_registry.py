@@ -0,0 +1,95 @@
+import json
+import pytest
+from src.challenges.challenge_base import DifficultyLevel
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_registry import ChallengeRegistry
+
+
+def test_registry_builds_manifest(tmp_path):
+    """Test that the first refresh writes a manifest covering every challenge."""
+    manifest_path = tmp_path / "manifest.json"
+    registry = ChallengeRegistry(str(manifest_path))
+    registry.refresh()
+
+    ids = {meta.id for meta in registry.list_metadata()}
+    assert {"two-sum", "hello-world", "sum-of-two", "binary-search",
+            "linked-list-cycle", "max-stack"} <= ids
+
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["version"] == ChallengeRegistry.MANIFEST_VERSION
+
+
+def test_registry_loads_lazily_from_manifest(tmp_path):
+    """Test that a warm start lists challenges without instantiating any."""
+    manifest_path = str(tmp_path / "manifest.json")
+    ChallengeRegistry(manifest_path).refresh()
+
+    registry = ChallengeRegistry(manifest_path)
+    registry.refresh()
+    assert registry._instances == {}
+
+    meta = registry.get_metadata("two-sum")
+    assert meta.difficulty == DifficultyLevel.EASY
+    assert meta.xp_reward == 50
+
+    challenge = registry.get("two-sum")
+    assert challenge.name == meta.name
+    assert registry.get("two-sum") is challenge
+    assert list(registry._instances) == ["two-sum"]
+
+
+def test_loader_lists_areas_from_metadata(tmp_path):
+    """Test that the loader serves area menus from metadata."""
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json")))
+
+    forest = loader.get_metadata_by_area("Algorithm Forest")
+    mountains = loader.get_challenges_by_area("Data Structure Mountains")
+
+    assert "two-sum" in {meta.id for meta in forest}
+    assert {c.id for c in mountains} == {"linked-list-cycle", "max-stack"}
+    assert loader.get_challenge("missing") is None
+
+
+def test_registry_rescans_only_changed_files(tmp_path):
+    """Test that only files whose mtime or size changed are re-imported."""
+    manifest_path = tmp_path / "manifest.json"
+    ChallengeRegistry(str(manifest_path)).refresh()
+
+    manifest = json.loads(manifest_path.read_text())
+    paths = [path for path in manifest["files"] if path.endswith("two_sum.py")]
+    assert len(paths) == 1
+    manifest["files"][paths[0]]["size"] += 1
+    manifest_path.write_text(json.dumps(manifest))
+
+    registry = ChallengeRegistry(str(manifest_path))
+    registry.refresh()
+
+    # Only the changed module was imported and instantiated again
+    assert list(registry._instances) == ["two-sum"]
+    assert "binary-search" in {meta.id for meta in registry.list_metadata()}
+
+
+def test_validate_skips_modules_without_challenges(tmp_path):
+    """Test that broken or helper-only modules are never imported."""
+    broken = tmp_path / "broken.py"
+    broken.write_text("class Oops(Challenge:\n")
+    helpers = tmp_path / "helpers.py"
+    helpers.write_text("def make_list(values):\n    return list(values)\n")
+    challenge = tmp_path / "new_challenge.py"
+    challenge.write_text("class NewChallenge(Challenge):\n    pass\n\nclass Helper:\n    pass\n")
+
+    registry = ChallengeRegistry(str(tmp_path / "manifest.json"), [str(tmp_path)])
+    results = registry._validate_all([str(broken), str(helpers), str(challenge)])
+
+    assert results == [[], [], ["NewChallenge"]]
+
+
+def test_loader_queries_index(tmp_path):
+    """Test that the loader answers menu queries from its index."""
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json")))
+
+    page = loader.query_challenges(area="Algorithm Forest", primary_skill="SEARCHING")
+    assert [meta.id for meta in page.items] == ["binary-search"]
+
+    remaining = loader.query_challenges(area="Algorithm Forest", exclude_completed=["The Twin Sum Riddle"])
+    assert "two-sum" not in {meta.id for meta in remaining.items}
@@ -0,0 +1,61 @@
+import random
+import string
+import time
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_registry import ChallengeRegistry
+from src.challenges.challenge_search import ChallengeSearch, tokenize
+
+
+def test_tokenize_splits_identifiers_and_drops_stopwords():
+    """Test that identifiers are split and filler words are ignored."""
+    assert tokenize("Write get_max for THE linked-list") == ["write", "get", "max", "linked", "list"]
+
+
+def test_search_ranks_by_tf_idf_and_prefix():
+    """Test exact matches, name weighting and prefix matching."""
+    search = ChallengeSearch()
+    search.add("dragon", {"name": "Dragon Sort", "description": "Sort the hoard of gold."})
+    search.add("gold", {"name": "Gold Counter", "description": "Count the gold in the sorted vault."})
+    search.add("tree", {"name": "Ancient Tree", "description": "Walk a binary tree."})
+
+    assert [doc for doc, _ in search.search("gold")] == ["gold", "dragon"]
+    # "sort" matches "sort" exactly and "sorted" as a prefix
+    assert [doc for doc, _ in search.search("sort")] == ["dragon", "gold"]
+    assert [doc for doc, _ in search.search("bin")] == ["tree"]
+
+    search.remove("tree")
+    assert search.search("binary") == []
+
+
+def test_search_is_fast_on_large_catalogs():
+    """Test that a query over 10k challenges stays under a millisecond on average."""
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                  for _ in range(5000)]
+    search = ChallengeSearch()
+    for i in range(10000):
+        search.add(f"c{i}", {
+            "name": " ".join(rng.sample(vocabulary, 3)),
+            "description": " ".join(rng.choices(vocabulary, k=60)),
+            "hints": " ".join(rng.choices(vocabulary, k=20))
+        })
+
+    queries = [vocabulary[0], vocabulary[1][:3], f"{vocabulary[2]} {vocabulary[3]}"]
+    search.search(queries[0])
+    start = time.perf_counter()
+    for _ in range(100):
+        for query in queries:
+            search.search(query)
+    assert (time.perf_counter() - start) / 300 < 0.001
+
+
+def test_loader_persists_search_index(tmp_path):
+    """Test that the loader searches real challenges and reuses the persisted index."""
+    manifest_path = str(tmp_path / "manifest.json")
+    loader = ChallengeLoader(ChallengeRegistry(manifest_path))
+    assert loader.search_challenges("twin sum")[0].id == "two-sum"
+    assert (tmp_path / "search_index.json").exists()
+
+    warm = ChallengeLoader(ChallengeRegistry(manifest_path))
+    assert warm.registry._instances == {}
+    assert warm.search_challenges("tome")[0].id == "binary-search"
@@ -0,0 +1,71 @@
+import gc
+import os
+import pytest
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_registry import ChallengeRegistry
+from src.challenges.challenge_stats import get_stats_store
+from src.challenges.challenges.algorithms.two_sum import TwoSumChallenge
+
+
+SOLUTION = """
+def two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+"""
+
+
+def test_attempt_counters_stay_off_the_challenge():
+    """Test that attempts update the stats store, not the shared instance."""
+    challenge = TwoSumChallenge()
+    challenge.get_test_plan()
+    challenge.get_suite_hash()
+    before = dict(vars(challenge))
+
+    challenge.attempt(SOLUTION)
+
+    assert vars(challenge) == before
+    assert challenge.times_attempted == 1
+    assert challenge.times_completed == 1
+    assert challenge.best_time < float('inf')
+    assert TwoSumChallenge().times_attempted == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_worker_starts_with_fresh_stats():
+    """Test that a forked child doesn't inherit its parent's counters."""
+    challenge = TwoSumChallenge()
+    challenge.times_attempted = 3
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, str(challenge.times_attempted).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    child_count = os.read(read_fd, 16).decode()
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert child_count == "0"
+    assert challenge.times_attempted == 3
+    assert get_stats_store().get(challenge._stats_key).attempted == 3
+
+
+def test_prepare_for_fork_loads_and_freezes_catalog(tmp_path):
+    """Test that everything workers read is built before the heap is frozen."""
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json")))
+    try:
+        count = loader.prepare_for_fork()
+
+        assert count == len(loader.registry.entries)
+        assert len(loader.registry._instances) == count
+        assert loader.registry._instances["two-sum"]._test_plan is not None
+        assert loader.search._terms is not None
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
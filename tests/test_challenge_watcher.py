@@ -0,0 +1,135 @@
+import json
+import threading
+from src.challenges import challenge_registry
+from src.challenges.challenge_loader import ChallengeLoader
+from src.challenges.challenge_registry import ChallengeRegistry
+from src.challenges.challenge_stats import get_stats_store
+from src.challenges.challenge_watcher import ChallengeWatcher
+
+
+MODULE_TEMPLATE = '''
+from src.challenges.challenge_base import Challenge, DifficultyLevel, ChallengeType
+
+
+class HotChallenge(Challenge):
+    def __init__(self):
+        super().__init__(
+            id="hot-scale",
+            name="The Shifting Rune",
+            description="Scale a number.",
+            difficulty=DifficultyLevel.EASY,
+            challenge_type=ChallengeType.ALGORITHM,
+            xp_reward={xp},
+            test_cases=[{{"input": [2], "expected": {expected}}}],
+            entry_point="scale"
+        )
+
+    def verify_solution(self, user_solution):
+        from src.ai.solution_evaluator import SolutionEvaluator
+        return SolutionEvaluator().evaluate(user_solution, plan=self.get_test_plan())
+'''
+
+DOUBLE = "def scale(x):\n    return 2 * x\n"
+
+
+def test_watcher_reloads_edited_module(tmp_path, monkeypatch):
+    """Test that an edited module is reloaded and stale results are dropped."""
+    monkeypatch.setattr(challenge_registry, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "hot_reload_challenges"
+    package.mkdir()
+    module = package / "hot_scale.py"
+    module.write_text(MODULE_TEMPLATE.format(xp=5, expected=4))
+
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json"), [str(package)]))
+    watcher = ChallengeWatcher(loader)
+    old = loader.get_challenge("hot-scale")
+    assert old.attempt(DOUBLE).success
+    assert watcher.poll() == []
+
+    module.write_text(MODULE_TEMPLATE.format(xp=40, expected=6))
+    assert watcher.poll() == ["hot-scale"]
+
+    new = loader.get_challenge("hot-scale")
+    assert new is not old
+    assert loader.query_challenges(min_xp=40).items[0].id == "hot-scale"
+    assert not new.attempt(DOUBLE).success
+
+
+def test_removed_challenge_leaves_registry_and_index_together(tmp_path, monkeypatch):
+    """Test that a challenge deleted during a session is gone from menus and lookups alike."""
+    monkeypatch.setattr(challenge_registry, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "hot_remove_challenges"
+    package.mkdir()
+    module = package / "hot_scale.py"
+    module.write_text(MODULE_TEMPLATE.format(xp=5, expected=4))
+
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json"), [str(package)]))
+    assert loader.query_challenges().total == 1
+
+    module.unlink()
+    assert ChallengeWatcher(loader).poll() == ["hot-scale"]
+    assert loader.query_challenges().total == 0
+    assert loader.get_challenge("hot-scale") is None
+
+
+def test_reloaded_and_removed_challenges_drop_their_stats(tmp_path, monkeypatch):
+    """Test that the stats store doesn't keep counters for instances the registry let go of."""
+    monkeypatch.setattr(challenge_registry, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "hot_stats_challenges"
+    package.mkdir()
+    module = package / "hot_scale.py"
+    module.write_text(MODULE_TEMPLATE.format(xp=5, expected=4))
+
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json"), [str(package)]))
+    watcher = ChallengeWatcher(loader)
+    old = loader.get_challenge("hot-scale")
+    old.attempt(DOUBLE)
+    assert old._stats_key in get_stats_store().snapshot()
+
+    module.write_text(MODULE_TEMPLATE.format(xp=40, expected=6))
+    assert watcher.poll() == ["hot-scale"]
+    assert old._stats_key not in get_stats_store().snapshot()
+
+    new = loader.get_challenge("hot-scale")
+    new.attempt(DOUBLE)
+    module.unlink()
+    assert watcher.poll() == ["hot-scale"]
+    assert new._stats_key not in get_stats_store().snapshot()
+
+
+def test_watcher_thread_picks_up_pack_edits(tmp_path):
+    """Test that the polling thread reports edited packs."""
+    pack_path = tmp_path / "live.pack.json"
+
+    def write_pack(xp):
+        pack_path.write_text(json.dumps({"challenges": [{
+            "id": "live-echo", "name": "Echo", "description": "Echo.", "difficulty": "Easy",
+            "challenge_type": "Algorithm", "xp_reward": xp, "test_cases": []
+        }]}))
+
+    write_pack(5)
+    loader = ChallengeLoader(ChallengeRegistry(str(tmp_path / "manifest.json"), [str(tmp_path)]))
+
+    reloaded = threading.Event()
+    watcher = ChallengeWatcher(loader, interval=0.01, on_change=lambda ids: reloaded.set())
+    watcher.start()
+    try:
+        write_pack(500)
+        assert reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert loader.get_challenge("live-echo").xp_reward == 500
+
+
+def test_warm_start_reports_manifest_entries(tmp_path):
+    """Test that a loader started from an existing manifest still indexes every challenge."""
+    manifest_path = str(tmp_path / "manifest.json")
+    ChallengeLoader(ChallengeRegistry(manifest_path))
+
+    loader = ChallengeLoader(ChallengeRegistry(manifest_path))
+    assert loader.registry._instances == {}
+    assert "two-sum" in {meta.id for meta in loader.get_metadata_by_area("Algorithm Forest")}
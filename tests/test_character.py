@@ -86,3 +86,56 @@ def test_area_unlocking():
 
     assert character.level == 5
     assert len(character.unlocked_areas) == 2
+
+
+def test_progress_is_rebuilt_from_events():
+    """Test that replaying a character's events on its snapshot rebuilds its state."""
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    snapshot = character.to_dict()
+
+    character.add_experience(350)
+    character.complete_challenge("Two Sum", skill="ARRAYS")
+    character.complete_challenge("Two Sum", skill="ARRAYS")
+    events = character.take_events()
+
+    assert [event["type"] for event in events] == [
+        "xp_gained", "area_unlocked", "challenge_completed", "skill_increased"]
+    assert character.take_events() == []
+
+    replayed = Character.from_dict(snapshot)
+    for event in events:
+        replayed.apply(event)
+    assert replayed.to_dict() == character.to_dict()
+    assert replayed.take_events() == []
+
+
+def test_compact_progress():
+    """Test the slotted character's skill, completion and area bookkeeping."""
+    character = Character("Ada", CharacterClass.DEBUGGING_ROGUE)
+    with pytest.raises(AttributeError):
+        character.nickname = "Ace"
+
+    for number in range(200):
+        character.complete_challenge(f"Challenge {number}", skill=Skill.TREES)
+    character.complete_challenge("Challenge 7", skill="TREES")
+    assert character.has_completed("Challenge 199") and not character.has_completed("Challenge 200")
+    assert "Challenge 0" in character.completed_challenges
+    assert character.completed_challenges[:2] == ["Challenge 0", "Challenge 1"]
+    assert character.skills["TREES"] == character.skills[Skill.TREES] == 201
+
+    character.add_experience(2000)
+    assert character.unlocked_areas == ["Algorithm Forest", "Data Structure Dungeon", "Function Fields"]
+    stats = character.get_stats()
+    assert stats["class"] == "Debugging Rogue" and stats["challenges_completed"] == 200
+    assert list(stats["unlocked_areas"]) == character.unlocked_areas
+    # Stats are a read-only view
+    with pytest.raises(TypeError):
+        stats["skills"]["TREES"] = 0
+    with pytest.raises(AttributeError):
+        stats["unlocked_areas"].append("Nowhere")
+    assert character.skills["TREES"] == 201 and "Nowhere" not in character.unlocked_areas
+    assert dict(stats)["skills"] == dict(character.skills)
+    assert Character.from_dict(character.to_dict()).to_dict() == character.to_dict()
+    # Levels are as wide as the save format's
+    record = dict(character.to_dict(), skills={"TREES": 70000})
+    assert Character.from_dict(record).skills["TREES"] == 70000
@@ -0,0 +1,104 @@
+import io
+import pytest
+from src.ai.evaluation_result import (
+    EvaluationResult, TestCaseResult, read_binary, read_jsonl, write_binary, write_jsonl
+)
+from src.ai.solution_evaluator import SolutionEvaluator
+from src.challenges.challenges.data_structures.max_stack import MaxStackChallenge
+
+
+def make_result():
+    return EvaluationResult(
+        success=False,
+        test_cases=[
+            TestCaseResult(True, {"a": 1, "b": 2}, 3, 3, 0.001),
+            TestCaseResult(False, {"a": 1, "b": 1}, 3, 2, 0.002, error="Expected 3, but got 2"),
+            TestCaseResult(False, [1], [2], error="boom", traceback="Traceback...")
+        ],
+        feedback=["Your solution passed 1 out of 3 test cases."],
+        time_taken=0.25,
+        expected_time_complexity="O(1)",
+        stage_timings={"parse": 0.1, "verify": 0.2},
+        cached_stages=["parse"]
+    )
+
+
+def test_result_supports_dict_style_access():
+    """Test that legacy dict-style callers keep working."""
+    result = make_result()
+
+    assert result["success"] is False
+    assert "error" not in result
+    assert "error" in result["test_cases"][1]
+    assert result.get("stage", "none") == "none"
+
+    result["error"] = "Time limit exceeded."
+    assert result.error == "Time limit exceeded."
+
+    with pytest.raises(KeyError):
+        result["unknown_field"] = 1
+
+
+def test_dict_style_access_returns_none_fields():
+    """Test that indexing a field set to None returns None, like the old result dicts."""
+    result = make_result()
+    returned_none = TestCaseResult(False, {"a": 1}, 1, None)
+
+    assert returned_none["actual"] is None
+    assert returned_none["error"] is None
+    assert result["error"] is None
+
+    with pytest.raises(KeyError):
+        result["unknown_field"]
+
+
+def test_jsonl_round_trip():
+    """Test that results survive a JSON lines round trip."""
+    buffer = io.StringIO()
+    assert write_jsonl([make_result(), EvaluationResult()], buffer) == 2
+
+    buffer.seek(0)
+    loaded = list(read_jsonl(buffer))
+
+    assert [r.to_dict() for r in loaded] == [make_result().to_dict(), EvaluationResult().to_dict()]
+
+
+def test_binary_round_trip():
+    """Test that results survive a binary round trip and stay compact."""
+    result = make_result()
+    buffer = io.BytesIO()
+    write_binary([result, result], buffer)
+
+    buffer.seek(0)
+    loaded = list(read_binary(buffer))
+
+    assert len(loaded) == 2
+    assert loaded[0].to_dict() == result.to_dict()
+    assert len(result.to_bytes()) < len(result.to_json())
+
+
+def test_verifiers_return_result_objects():
+    """Test that both evaluator-backed and custom verifiers use the result model."""
+    results = SolutionEvaluator().evaluate(lambda a, b: a + b, [{"input": {"a": 1, "b": 2}, "expected": 3}])
+    assert isinstance(results, EvaluationResult)
+    assert isinstance(results.test_cases[0], TestCaseResult)
+
+    challenge = MaxStackChallenge()
+    results = challenge.verify_solution(lambda: None)
+    assert isinstance(results, EvaluationResult)
+    assert results.success is False
+    assert results.passed_count == 0
+
+
+def test_captured_output_round_trips():
+    """Test that captured output survives both serialization formats."""
+    from src.ai.output_capture import CapturedOutput
+
+    result = make_result()
+    result.test_cases[0].output = CapturedOutput("hello\n", "", 42, 0)
+
+    for loaded in (EvaluationResult.from_bytes(result.to_bytes()), EvaluationResult.from_json(result.to_json())):
+        output = loaded.test_cases[0].output
+        assert output.stdout == "hello\n"
+        assert output.stdout_dropped == 42
+        assert loaded.test_cases[1].output is None
@@ -0,0 +1,86 @@
+import random
+import pytest
+from src.game.character import Character, CharacterClass
+from src.game.leaderboard import Leaderboard, make_entry
+from src.game.save_manager import SaveManager
+from src.game.save_store import save_slug
+
+
+def make_record(name, level, experience, completions):
+    """A save record with the given progress."""
+    return {"name": name, "class": "Algorithm Wizard", "level": level, "experience": experience,
+            "skills": {}, "completed_challenges": [f"Challenge {n}" for n in range(completions)],
+            "unlocked_areas": ["Algorithm Forest"], "timestamp": "2025-01-01T00:00:00"}
+
+
+def test_saves_update_rankings(tmp_path):
+    """Test that every save moves the character on the leaderboard."""
+    manager = SaveManager(str(tmp_path))
+    ada, bob = Character("Ada", CharacterClass.ALGORITHM_WIZARD), Character("Bob", CharacterClass.DEBUGGING_ROGUE)
+    ada.add_experience(150)
+    bob.add_experience(50)
+    for step in range(3):
+        bob.complete_challenge(f"Challenge {step}")
+    manager.save_game(ada)
+    manager.save_game(bob)
+
+    assert [entry["name"] for entry in manager.get_leaderboard()] == ["Ada", "Bob"]
+    assert manager.get_rank("Bob", "completions") == 1
+    assert manager.get_rank("Nobody") is None
+
+    bob.add_experience(400)
+    manager.save_game(bob)
+    top = manager.get_leaderboard("experience", count=1)
+    assert [(entry["rank"], entry["name"], entry["total_experience"]) for entry in top] == [(1, "Bob", 450)]
+    assert manager.get_rank("Ada", "level") == 2
+
+    with pytest.raises(ValueError):
+        manager.get_leaderboard("style")
+
+
+def test_leaderboard_persists_without_rescanning(tmp_path, monkeypatch, capsys):
+    """Test that a new session loads the rankings instead of reading every save."""
+    manager = SaveManager(str(tmp_path))
+    for number in range(5):
+        character = Character(f"Hero {number}", CharacterClass.FULLSTACK_BARD)
+        character.add_experience(number * 100)
+        manager.save_game(character)
+
+    monkeypatch.setattr(Leaderboard, "rebuild", lambda self, records: pytest.fail("rescanned the saves"))
+    reopened = SaveManager(str(tmp_path))
+    # The leaderboard's files aren't mistaken for saves to import
+    assert capsys.readouterr().out == ""
+    assert [entry["name"] for entry in reopened.get_leaderboard(count=3)] == ["Hero 4", "Hero 3", "Hero 2"]
+
+
+def test_other_processes_updates_are_seen(tmp_path):
+    """Test two leaderboards on the same directory, through log compactions."""
+    first = Leaderboard(str(tmp_path), compact_slack=2)
+    second = Leaderboard(str(tmp_path), compact_slack=2)
+    for step in range(10):
+        first.update(make_record("Ada", 1 + step, 0, 0))
+        second.update(make_record("Bob", 2 + step, 0, 0))
+        assert first.rank("Bob") == second.rank("Bob") == 1
+        assert second.top()[1]["level"] == 1 + step
+
+    assert len(Leaderboard(str(tmp_path))) == 2
+
+
+def test_ranks_match_sorting(tmp_path):
+    """Test the incremental ranks against sorting every entry."""
+    rng = random.Random(5)
+    leaderboard = Leaderboard(str(tmp_path))
+    leaderboard.rebuild(make_record(f"Hero {n}", rng.randint(1, 20), rng.randint(0, 99), 0) for n in range(500))
+    records = {}
+    for _ in range(300):
+        record = make_record(f"Hero {rng.randrange(500)}", rng.randint(1, 20), rng.randint(0, 99),
+                             rng.randint(0, 30))
+        records[record["name"]] = record
+        leaderboard.update(record)
+
+    entries = {entry["name"]: entry for entry in leaderboard.top("experience", count=1000)}
+    assert len(entries) == 500
+    ordered = sorted(entries, key=lambda name: (-entries[name]["total_experience"], save_slug(name)))
+    for name, record in records.items():
+        assert entries[name] == dict(make_entry(record), rank=entries[name]["rank"])
+        assert leaderboard.rank(name, "experience") == ordered.index(name) + 1
@@ -0,0 +1,100 @@
+import pytest
+import os
+from src.ai.regrader import GradeStore, Regrader, hash_test_case
+from src.challenges.challenges.algorithms.two_sum import TwoSumChallenge
+
+
+def two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+    return []
+
+
+def test_hash_test_case_is_stable():
+    """Test that equal test cases hash equally regardless of key order."""
+    a = {"input": {"nums": [1, 2], "target": 3}, "expected": [0, 1]}
+    b = {"expected": [0, 1], "input": {"target": 3, "nums": [1, 2]}}
+
+    assert hash_test_case(a) == hash_test_case(b)
+    assert hash_test_case(a) != hash_test_case({"input": a["input"], "expected": [1, 0]})
+
+
+def test_regrade_only_runs_new_test_cases(tmp_path):
+    """Test that adding a test case only runs that test case on regrade."""
+    store = GradeStore(str(tmp_path / "verdicts.json"))
+    regrader = Regrader(store)
+    challenge = TwoSumChallenge()
+
+    result = regrader.regrade(challenge, "submission-1", two_sum)
+    assert result["success"] is True
+    assert result["executed"] == len(challenge.test_cases)
+
+    # A hidden test case is added to the suite
+    challenge.test_cases.append({
+        "input": {"nums": [0, 4, 3, 0], "target": 0},
+        "expected": [0, 3]
+    })
+
+    result = Regrader(GradeStore(str(tmp_path / "verdicts.json"))).regrade(
+        challenge, "submission-1", two_sum)
+    assert result["success"] is True
+    assert result["executed"] == 1
+    assert result["reused"] == len(challenge.test_cases) - 1
+
+
+def test_regrade_drops_verdicts_for_removed_test_cases(tmp_path):
+    """Test that verdicts for edited test cases are not reused."""
+    store = GradeStore(str(tmp_path / "verdicts.json"))
+    regrader = Regrader(store)
+    challenge = TwoSumChallenge()
+
+    regrader.regrade_all(challenge, {"a": two_sum, "b": lambda nums, target: []})
+    assert store.get_submissions(challenge.id) == ["a", "b"]
+
+    challenge.test_cases[0] = {
+        "input": {"nums": [2, 7, 11, 15], "target": 26},
+        "expected": [2, 3]
+    }
+    results = regrader.regrade_all(challenge, {"a": two_sum, "b": lambda nums, target: []})
+
+    assert results["a"]["executed"] == 1
+    assert results["b"]["success"] is False
+    assert len(store.get_verdicts(challenge.id, "a")) == len(challenge.test_cases)
+
+
+TWO_SUM_SOURCE = """
+def two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+    return []
+"""
+
+
+def test_edited_submission_is_regraded_in_full(tmp_path):
+    """Test that verdicts for a submission's old source are not reused."""
+    store = GradeStore(str(tmp_path / "verdicts.json"))
+    regrader = Regrader(store)
+    challenge = TwoSumChallenge()
+
+    result = regrader.regrade_code(challenge, "submission-1", TWO_SUM_SOURCE)
+    assert result["success"] is True
+
+    # The same submission is edited into a broken solution
+    broken = "def two_sum(nums, target):\n    return []\n"
+    result = regrader.regrade_code(challenge, "submission-1", broken)
+    assert result["success"] is False
+    assert result["executed"] == len(challenge.test_cases)
+    assert result["reused"] == 0
+
+
+def test_default_grade_store_is_in_the_project(tmp_path, monkeypatch):
+    """Test that the default verdicts file doesn't depend on the working directory."""
+    monkeypatch.chdir(tmp_path)
+
+    assert os.path.isabs(GradeStore().path)
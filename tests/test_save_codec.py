@@ -0,0 +1,152 @@
+import json
+import random
+import threading
+import pytest
+from src.game import save_codec
+from src.game.save_codec import SaveFormatError
+from src.game.save_manager import SaveManager
+from src.game.save_store import FileSaveStore
+from src.game.character import Character, CharacterClass, Skill
+
+# The save written by the game before format versions existed
+LEGACY_SAVE = {
+    "name": "Wrek", "class": "Algorithm Wizard", "level": 1, "experience": 0,
+    "challenges_completed": 0, "skills": {skill.name: 1 for skill in Skill},
+    "inventory": [], "unlocked_areas": ["Algorithm Forest"],
+    "timestamp": "2025-03-11T00:33:01.942370"
+}
+
+
+def random_text(rng):
+    """A short string, sometimes empty or non-ASCII."""
+    alphabet = "abcXYZ _-'éß龍🐉"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def random_record(rng):
+    """A save record with arbitrary, possibly unusual, contents."""
+    record = {
+        "name": random_text(rng) or "x",
+        "class": rng.choice(list(CharacterClass)).value,
+        "level": rng.randint(1, 2 ** 32 - 1),
+        "experience": rng.randint(-2 ** 63, 2 ** 63 - 1),
+        "skills": {random_text(rng): rng.randint(0, 65535) for _ in range(rng.randint(0, 12))},
+        "completed_challenges": [random_text(rng) for _ in range(rng.randint(0, 30))],
+        "unlocked_areas": [random_text(rng) for _ in range(rng.randint(0, 7))],
+        "revision": rng.randint(0, 2 ** 32 - 1)
+    }
+    if rng.random() < 0.8:
+        record["timestamp"] = random_text(rng) or "2025-01-01T00:00:00"
+    return record
+
+
+def test_random_records_round_trip():
+    """Test that any record survives the binary and debug encodings."""
+    rng = random.Random(1234)
+    for _ in range(500):
+        record = random_record(rng)
+        assert save_codec.decode(save_codec.encode(record)) == record
+        assert save_codec.decode(save_codec.encode(record, debug=True)) == record
+
+
+def test_character_round_trip_is_compact():
+    """Test a real character through the codec and against the old format."""
+    character = Character("Ada", CharacterClass.DEBUGGING_ROGUE)
+    character.add_experience(900)
+    character.complete_challenge("Two Sum", skill="ARRAYS")
+    record = character.to_dict()
+
+    data = save_codec.encode(record)
+    assert data.startswith(save_codec.MAGIC)
+    assert len(data) < len(json.dumps(record, indent=2)) / 1.5
+    assert Character.from_dict(save_codec.decode(data)).to_dict() == record
+
+
+def test_legacy_json_save_is_migrated():
+    """Test that original saves decode into the current record format."""
+    record = save_codec.decode(json.dumps(LEGACY_SAVE, indent=2).encode())
+
+    assert record["completed_challenges"] == []
+    assert "challenges_completed" not in record and "inventory" not in record
+    assert Character.from_dict(record).skills == LEGACY_SAVE["skills"]
+
+
+def test_version_2_binary_save_is_migrated():
+    """Test that binary saves from before revisions decode with revision 0."""
+    record = {"name": "Ada", "class": "Fullstack Bard", "level": 4, "experience": 12,
+              "skills": {"ARRAYS": 3}, "completed_challenges": ["Two Sum"],
+              "unlocked_areas": ["Algorithm Forest"], "timestamp": "2025-01-01T00:00:00"}
+    text = "\x00".join(["Ada", "Fullstack Bard", "2025-01-01T00:00:00", "ARRAYS", "Two Sum", "Algorithm Forest"])
+    data = (save_codec._HEADER.pack(save_codec.MAGIC, 2) + save_codec._COUNTS_V2.pack(4, 12, 1, 1, 1)
+            + save_codec._levels_to_bytes([3], 2) + text.encode())
+
+    assert save_codec.decode(data) == dict(record, revision=0)
+
+
+def test_counts_and_levels_past_16_bits():
+    """Test records at and past the limits of the older binary versions."""
+    record = {"name": "Ada", "class": "Fullstack Bard", "level": 7, "experience": 0, "revision": 2,
+              "skills": {"ARRAYS": 65535, "TREES": 65536},
+              "completed_challenges": [f"Challenge {n}" for n in range(65536)],
+              "unlocked_areas": ["Algorithm Forest"]}
+    data = save_codec.encode(record)
+    assert data.startswith(save_codec.MAGIC)
+    assert save_codec.decode(data) == record
+
+    # Too large even for 32 bits: kept as JSON rather than failing the save
+    huge = dict(record, skills={"ARRAYS": 2 ** 32})
+    assert save_codec.decode(save_codec.encode(huge)) == huge
+
+    # Version 3 saves still decode
+    text = "\x00".join(["Ada", "Fullstack Bard", "", "ARRAYS", "Algorithm Forest"])
+    data = (save_codec._HEADER.pack(save_codec.MAGIC, 3) + save_codec._COUNTS_V3.pack(7, 0, 2, 1, 0, 1)
+            + save_codec._levels_to_bytes([65535], 3) + text.encode())
+    assert save_codec.decode(data)["skills"] == {"ARRAYS": 65535}
+
+
+def test_rejects_unknown_and_corrupt_data():
+    """Test that newer versions and damaged data raise SaveFormatError."""
+    record = random_record(random.Random(7))
+    data = save_codec.encode(record)
+
+    with pytest.raises(SaveFormatError):
+        save_codec.decode(json.dumps({"format_version": 99, "name": "x"}).encode())
+    with pytest.raises(SaveFormatError):
+        save_codec.decode(data[:4] + b"\x09\x00" + data[6:])
+    with pytest.raises(SaveFormatError):
+        save_codec.decode(data[:12])
+    with pytest.raises(SaveFormatError):
+        save_codec.encode(dict(record, name="a\x00b"))
+
+
+def test_binary_file_store(tmp_path):
+    """Test saving and listing through the binary file store."""
+    (tmp_path / "wrek.json").write_text(json.dumps(LEGACY_SAVE))
+    manager = SaveManager(str(tmp_path), store=FileSaveStore(str(tmp_path)))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    character.add_experience(400)
+
+    assert manager.save_game(character)
+    assert (tmp_path / "ada.sav").exists()
+    assert manager.load_game("Ada").to_dict() == character.to_dict()
+    assert list(manager.get_saved_games()) == ["Ada"]
+
+
+def test_concurrent_writers_keep_every_header(tmp_path):
+    """Test that stores saving different characters don't drop each other's index entries."""
+    def save_many(prefix):
+        # A store of its own, like another game process
+        store = FileSaveStore(str(tmp_path))
+        for i in range(20):
+            record = Character(f"{prefix} {i}", CharacterClass.ALGORITHM_WIZARD).to_dict()
+            record["timestamp"] = "2024-01-01T00:00:00"
+            store.write(record)
+
+    threads = [threading.Thread(target=save_many, args=(prefix,)) for prefix in ("Ada", "Bob")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = FileSaveStore(str(tmp_path))
+    assert len(store._load_index()) == 40
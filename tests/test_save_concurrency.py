@@ -0,0 +1,170 @@
+import gc
+import multiprocessing
+import threading
+import pytest
+from src.game import save_lock
+from src.game.character import Character, CharacterClass
+from src.game.save_manager import SaveManager, merge_progress
+
+
+def new_save(tmp_path):
+    """Save a fresh character and return its name."""
+    SaveManager(str(tmp_path)).save_game(Character("Ada", CharacterClass.ALGORITHM_WIZARD))
+    return "Ada"
+
+
+def test_concurrent_sessions_merge_progress(tmp_path):
+    """Test that two sessions saving the same character keep each other's progress."""
+    name = new_save(tmp_path)
+    first, second = SaveManager(str(tmp_path)), SaveManager(str(tmp_path))
+    ours, theirs = first.load_game(name), second.load_game(name)
+
+    ours.add_experience(150)
+    ours.complete_challenge("Two Sum", skill="ARRAYS")
+    assert first.save_game(ours)
+
+    theirs.add_experience(100)
+    theirs.complete_challenge("Binary Search", skill="SEARCHING")
+    assert second.save_game(theirs)
+
+    merged = SaveManager(str(tmp_path)).load_game(name)
+    assert merged.completed_challenges == ["Two Sum", "Binary Search"]
+    assert merged.skills["ARRAYS"] == 2 and merged.skills["SEARCHING"] == 2
+    # 250 XP in total: level 2 after 100, then 150 of the 200 needed for level 3
+    assert (merged.level, merged.experience) == (2, 150)
+    assert first.store.read(name)["revision"] == 3
+
+    # Later saves from either session keep merging, without double counting
+    theirs.complete_challenge("Max Stack", skill="ARRAYS")
+    second.save_game(theirs)
+    ours.add_experience(50)
+    first.save_game(ours)
+
+    merged = SaveManager(str(tmp_path)).load_game(name)
+    assert merged.completed_challenges == ["Two Sum", "Binary Search", "Max Stack"]
+    assert merged.skills["ARRAYS"] == 3
+    assert (merged.level, merged.experience) == (3, 0)
+
+
+def test_challenge_completed_in_both_sessions_counts_once(tmp_path):
+    """Test that a challenge both sessions completed adds its XP and skill once."""
+    name = new_save(tmp_path)
+    first, second = SaveManager(str(tmp_path)), SaveManager(str(tmp_path))
+    ours, theirs = first.load_game(name), second.load_game(name)
+
+    theirs.complete_challenge("Two Sum", skill="ARRAYS", xp_gained=50)
+    assert second.save_game(theirs)
+    ours.complete_challenge("Two Sum", skill="ARRAYS", xp_gained=50)
+    ours.complete_challenge("Binary Search", skill="SEARCHING", xp_gained=30)
+    ours.add_experience(5)
+    assert first.save_game(ours)
+
+    merged = SaveManager(str(tmp_path)).load_game(name)
+    assert merged.completed_challenges == ["Two Sum", "Binary Search"]
+    assert (merged.level, merged.experience) == (1, 85)
+    assert merged.skills["ARRAYS"] == 2 and merged.skills["SEARCHING"] == 2
+
+
+def test_merge_keeps_their_progress_when_ours_is_older():
+    """Test the merge rules on plain records."""
+    base = Character("Ada", CharacterClass.ALGORITHM_WIZARD).to_dict()
+    theirs = dict(base, completed_challenges=["A"], unlocked_areas=["Algorithm Forest", "Function Fields"])
+    ours = dict(base, completed_challenges=["B"], timestamp="t2")
+
+    merged = merge_progress(base, ours, theirs)
+    assert merged["completed_challenges"] == ["A", "B"]
+    assert merged["unlocked_areas"] == ["Algorithm Forest", "Function Fields"]
+    assert merged["timestamp"] == "t2"
+
+
+def test_rollback_replaces_instead_of_merging(tmp_path):
+    """Test that a rollback isn't undone by merging the newer progress back in."""
+    manager = SaveManager(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+    character.complete_challenge("Two Sum")
+    manager.save_game(character)
+
+    manager.rollback("Ada", 1)
+    assert manager.load_game("Ada").completed_challenges == []
+
+
+def test_readers_do_not_wait_for_writers(tmp_path):
+    """Test that loading works while another writer holds the save lock."""
+    name = new_save(tmp_path)
+    writer = SaveManager(str(tmp_path))
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with writer.locks.hold(name):
+            locked.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    try:
+        locked.wait(5)
+        assert SaveManager(str(tmp_path)).load_game(name) is not None
+    finally:
+        release.set()
+        thread.join()
+
+
+def play_session(save_dir, name, session):
+    """Load a character in a separate process and save progress repeatedly."""
+    manager = SaveManager(save_dir)
+    character = manager.load_game(name)
+    for step in range(5):
+        character.add_experience(10)
+        character.complete_challenge(f"Session {session} challenge {step}")
+        assert manager.save_game(character)
+
+
+@pytest.mark.skipif(save_lock.fcntl is None or "fork" not in multiprocessing.get_all_start_methods(),
+                    reason="needs fcntl and fork")
+def test_processes_sharing_saves_lose_no_updates(tmp_path):
+    """Test concurrent game processes saving one character."""
+    name = new_save(tmp_path)
+    # SQLite connections must not cross a fork: close any the parent holds
+    gc.collect()
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=play_session, args=(str(tmp_path), name, session))
+                 for session in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    manager = SaveManager(str(tmp_path))
+    character = manager.load_game(name)
+    assert len(character.completed_challenges) == 20
+    # 200 XP in total: level 2 after 100, plus 100 more
+    assert (character.level, character.experience) == (2, 100)
+    assert manager.store.read(name)["revision"] == 21
+    assert len(manager.get_save_history(name)) == 21
+
+
+@pytest.mark.skipif(save_lock.fcntl is None, reason="needs fcntl")
+def test_history_versions_follow_the_saves(tmp_path):
+    """Test that two writers sharing a save directory keep one contiguous history."""
+    name = new_save(tmp_path)
+
+    def play(session):
+        manager = SaveManager(str(tmp_path))
+        character = manager.load_game(name)
+        for step in range(10):
+            character.complete_challenge(f"Session {session} challenge {step}")
+            assert manager.save_game(character)
+
+    threads = [threading.Thread(target=play, args=(session,)) for session in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    manager = SaveManager(str(tmp_path))
+    assert [version for version, _ in manager.get_save_history(name)] == list(range(1, 22))
+    # Each version is the save it was recorded for, not a delta on another writer's
+    assert [manager.history.get(name, version)["revision"] for version in range(1, 22)] == list(range(1, 22))
+    assert manager.history.get(name, 21) == manager.store.read(name)
@@ -0,0 +1,98 @@
+import json
+import tracemalloc
+import pytest
+from src.game import save_codec, save_export, save_store
+from src.game.character import Character, CharacterClass
+from src.game.save_manager import SaveManager
+from src.game.save_store import FileSaveStore
+
+
+def make_characters(count):
+    """Characters with a little progress each."""
+    characters = []
+    for number in range(count):
+        character = Character(f"Hero {number}", list(CharacterClass)[number % len(CharacterClass)])
+        character.add_experience(number * 10)
+        for step in range(number % 4):
+            character.complete_challenge(f"Challenge {step}", skill="ARRAYS")
+        characters.append(character)
+    return characters
+
+
+def synthetic_records(count):
+    """Yield save records without keeping them around."""
+    for number in range(count):
+        yield {"name": f"Hero {number}", "class": "Algorithm Wizard", "level": 1 + number % 50,
+               "experience": number, "skills": {"ARRAYS": 2, "TREES": 3},
+               "completed_challenges": [f"Challenge {step}" for step in range(number % 10)],
+               "unlocked_areas": ["Algorithm Forest"], "timestamp": "2025-01-01T00:00:00", "revision": 1}
+
+
+def test_export_and_import_round_trip(tmp_path, monkeypatch):
+    """Test moving every save to another store through an NDJSON export."""
+    monkeypatch.setattr(save_store, "PAGE_SIZE", 7)
+    source = SaveManager(str(tmp_path / "source"))
+    characters = make_characters(30)
+    for character in characters:
+        source.save_game(character)
+
+    path = str(tmp_path / "saves.ndjson")
+    assert source.export_saves(path) == 30
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["name"] for line in lines] == [character.name for character in characters]
+    assert all(line["format_version"] == save_codec.FORMAT_VERSION for line in lines)
+
+    target = SaveManager(str(tmp_path / "target"), store=FileSaveStore(str(tmp_path / "target")))
+    assert target.import_saves(path) == 30
+    assert len(target.get_saved_games()) == 30
+    for character in characters:
+        assert target.load_game(character.name).to_dict() == character.to_dict()
+
+
+def test_import_skips_bad_lines(tmp_path, capsys):
+    """Test that damaged lines are reported and the rest is imported."""
+    path = tmp_path / "saves.ndjson"
+    record = dict(make_characters(1)[0].to_dict(), timestamp="2025-01-01T00:00:00")
+    path.write_text(json.dumps(record) + "\n{not json\n\n")
+
+    manager = SaveManager(str(tmp_path / "saves"))
+    assert manager.import_saves(str(path)) == 1
+    assert "Skipping line 2" in capsys.readouterr().out
+    assert manager.load_game("Hero 0").level == 1
+
+
+def test_columnar_export(tmp_path):
+    """Test that the archive loads into one NumPy array per column."""
+    np = pytest.importorskip("numpy")
+    manager = SaveManager(str(tmp_path))
+    characters = make_characters(5)
+    for character in characters:
+        manager.save_game(character)
+
+    path = str(tmp_path / "saves.npz")
+    assert manager.export_columns(path) == 5
+    with np.load(path) as columns:
+        assert list(columns["name"]) == [character.name for character in characters]
+        assert list(columns["class"]) == [character.character_class.value for character in characters]
+        assert list(columns["level"]) == [character.level for character in characters]
+        assert list(columns["experience"]) == [character.experience for character in characters]
+        assert list(columns["completed_challenges"]) == [0, 1, 2, 3, 0]
+        assert list(columns["skill_ARRAYS"]) == [1, 2, 3, 4, 1]
+        assert columns["level"].dtype == np.int64
+
+
+def test_exports_use_constant_memory(tmp_path):
+    """Test that exporting many saves doesn't hold them all in memory."""
+    writers = [(save_export.write_ndjson, "saves.ndjson")]
+    if save_export.np is not None:
+        writers.append((save_export.write_columns, "saves.npz"))
+    for write, name in writers:
+        tracemalloc.start()
+        try:
+            assert write(synthetic_records(5000), str(tmp_path / name)) == 5000
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # 5000 records are several MB as Python objects
+        assert peak < 1024 * 1024
@@ -0,0 +1,108 @@
+import os
+from src.game import save_history
+from src.game.character import Character, CharacterClass
+from src.game.save_history import SaveHistory, make_delta, apply_delta
+from src.game.save_manager import SaveManager
+
+
+def play(character, step):
+    """Make some progress, as between two saves."""
+    character.add_experience(40)
+    character.complete_challenge(f"Challenge {step}", skill="ARRAYS" if step % 2 else "TREES")
+
+
+def test_delta_round_trip():
+    """Test that deltas store only what changed and rebuild the new record."""
+    old = {"name": "Ada", "level": 2, "skills": {"ARRAYS": 1, "TREES": 1},
+           "completed_challenges": ["A"], "unlocked_areas": ["Forest"], "timestamp": "t1"}
+    new = {"name": "Ada", "level": 3, "skills": {"ARRAYS": 2, "TREES": 1},
+           "completed_challenges": ["A", "B"], "unlocked_areas": ["Desert"], "timestamp": "t2"}
+
+    delta = make_delta(old, new)
+    assert delta == {
+        "set": {"level": 3, "unlocked_areas": ["Desert"], "timestamp": "t2"},
+        "update": {"skills": {"ARRAYS": 2}},
+        "extend": {"completed_challenges": ["B"]}
+    }
+    assert apply_delta(old, delta) == new
+    assert old["completed_challenges"] == ["A"]
+
+
+def test_every_version_is_rebuilt_from_a_nearby_snapshot(tmp_path, monkeypatch):
+    """Test that any version loads and replays fewer deltas than the snapshot interval."""
+    history = SaveHistory(str(tmp_path), snapshot_interval=5)
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    saved = []
+    for step in range(23):
+        play(character, step)
+        record = dict(character.to_dict(), timestamp=f"t{step:02}")
+        saved.append(record)
+        assert history.record(record) == step + 1
+
+    applied = []
+    monkeypatch.setattr(save_history, "apply_delta",
+                        lambda record, delta: applied.append(delta) or apply_delta(record, delta))
+    fresh = SaveHistory(str(tmp_path), snapshot_interval=5)
+    for version, record in enumerate(saved, start=1):
+        applied.clear()
+        assert fresh.get("Ada", version) == record
+        assert len(applied) < 5
+
+    assert [version for version, _ in fresh.versions("Ada")] == list(range(1, 24))
+
+
+def test_retention_compacts_old_versions(tmp_path):
+    """Test that chains are trimmed to the retention limit and stay readable."""
+    history = SaveHistory(str(tmp_path), snapshot_interval=4, max_versions=6)
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    saved = {}
+    for step in range(30):
+        play(character, step)
+        record = dict(character.to_dict(), timestamp=f"t{step:02}")
+        saved[history.record(record)] = record
+
+    history.compact("Ada")
+    versions = [version for version, _ in history.versions("Ada")]
+    assert versions == list(range(25, 31))
+    for version in versions:
+        assert history.get("Ada", version) == saved[version]
+    assert history.get("Ada", 3) is None
+
+    # Appending continues the compacted chain
+    play(character, 30)
+    assert SaveHistory(str(tmp_path), snapshot_interval=4, max_versions=6).record(character.to_dict()) == 31
+
+
+def test_deltas_are_smaller_than_snapshots(tmp_path):
+    """Test that a long history costs much less than a copy per version."""
+    history = SaveHistory(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    full_copies = 0
+    for step in range(50):
+        play(character, step)
+        record = dict(character.to_dict(), timestamp=f"t{step:02}")
+        full_copies += len(str(record))
+        history.record(record)
+
+    assert os.path.getsize(history.path_for("Ada")) < full_copies / 3
+
+
+def test_save_manager_rollback(tmp_path):
+    """Test listing, loading and restoring earlier saves."""
+    manager = SaveManager(str(tmp_path))
+    character = Character("Ada", CharacterClass.ALGORITHM_WIZARD)
+    manager.save_game(character)
+    play(character, 1)
+    manager.save_game(character)
+    play(character, 2)
+    manager.save_game(character)
+
+    versions = manager.get_save_history("Ada")
+    assert [version for version, _ in versions] == [1, 2, 3]
+    assert manager.load_version("Ada", 2).completed_challenges == ["Challenge 1"]
+
+    restored = manager.rollback("Ada", 1)
+    assert restored.completed_challenges == []
+    assert manager.load_game("Ada").completed_challenges == []
+    assert len(manager.get_save_history("Ada")) == 4
+    assert manager.rollback("Ada", 99) is None
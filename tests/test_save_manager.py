@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import pytest
+from src.game.character import Character, CharacterClass
+from src.game.save_manager import SaveManager
+from src.game.save_store import JsonSaveStore, SqliteSaveStore
+
+
+def make_character(name="Ada Lovelace"):
+    """A character with some progress."""
+    character = Character(name, CharacterClass.ALGORITHM_WIZARD)
+    character.add_experience(320)
+    character.complete_challenge("Two Sum", skill="ARRAYS")
+    character.complete_challenge("Binary Search", skill="SEARCHING")
+    return character
+
+
+def assert_same_progress(loaded, character):
+    """Check that a loaded character matches the saved one."""
+    assert loaded.to_dict() == character.to_dict()
+    assert loaded.xp_to_next_level == character.xp_to_next_level
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that a saved character loads back with all of its progress."""
+    manager = SaveManager(str(tmp_path))
+    character = make_character()
+
+    assert manager.save_game(character)
+    assert_same_progress(manager.load_game("ada lovelace"), character)
+    assert list(manager.get_saved_games()) == ["Ada Lovelace"]
+    assert manager.load_game("Nobody") is None
+
+
+def test_resaving_replaces_progress(tmp_path):
+    """Test that saving again overwrites skills, completions and areas."""
+    manager = SaveManager(str(tmp_path))
+    character = make_character()
+    manager.save_game(character)
+
+    character.add_experience(2000)
+    character.complete_challenge("Max Stack", skill="ARRAYS")
+    manager.save_game(character)
+
+    loaded = SaveManager(str(tmp_path)).load_game(character.name)
+    assert_same_progress(loaded, character)
+    assert loaded.skills["ARRAYS"] == 3
+
+
+def test_json_saves_are_migrated_once(tmp_path):
+    """Test that existing JSON saves are imported into the database."""
+    character = make_character()
+    record = character.to_dict()
+    record["timestamp"] = "2024-01-01T00:00:00"
+    JsonSaveStore(str(tmp_path)).write(record)
+    # Saves written before completions were stored only kept a count
+    (tmp_path / "old.json").write_text(json.dumps({
+        "name": "Old", "class": "Debugging Rogue", "level": 2, "experience": 10,
+        "challenges_completed": 3, "skills": {"ARRAYS": 2}, "inventory": [],
+        "unlocked_areas": ["Algorithm Forest"], "timestamp": "2023-01-01T00:00:00"
+    }))
+    (tmp_path / "broken.json").write_text("{")
+
+    manager = SaveManager(str(tmp_path))
+    assert manager.get_saved_games() == {"Ada Lovelace": "2024-01-01T00:00:00", "Old": "2023-01-01T00:00:00"}
+    assert_same_progress(manager.load_game("Ada Lovelace"), character)
+    assert manager.load_game("Old").skills["ARRAYS"] == 2
+
+    # A newer save in the database isn't overwritten by the old file
+    character.add_experience(500)
+    manager.save_game(character)
+    assert SaveManager(str(tmp_path)).load_game("Ada Lovelace").level == character.level
+
+
+def test_json_store_still_supported(tmp_path):
+    """Test the one-file-per-character backend."""
+    manager = SaveManager(str(tmp_path), store=JsonSaveStore(str(tmp_path)))
+    character = make_character()
+
+    assert manager.save_game(character)
+    assert_same_progress(manager.load_game(character.name), character)
+    assert list(manager.get_saved_games()) == [character.name]
+
+
+def test_listing_many_saves_is_fast(tmp_path):
+    """Test that listing reads only the index, not every character."""
+    store = SqliteSaveStore(str(tmp_path / "saves.db"))
+    with store._conn:
+        store._conn.executemany(
+            "INSERT INTO characters (slug, name, class, level, experience, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"hero_{i}", f"Hero {i}", "Fullstack Bard", 1, 0, "2024-01-01T00:00:00") for i in range(100000)]
+        )
+
+    start = time.perf_counter()
+    saves = store.list_saves()
+    elapsed = time.perf_counter() - start
+
+    assert len(saves) == 100000
+    assert elapsed < 0.5
+
+
+def test_json_store_lists_from_header_index(tmp_path, monkeypatch):
+    """Test that listing reads the header index instead of the save files."""
+    store = JsonSaveStore(str(tmp_path))
+    manager = SaveManager(str(tmp_path), store=store)
+    manager.save_game(make_character("Ada"))
+    manager.save_game(make_character("Grace"))
+
+    header = store.headers()["ada"]
+    assert header["class"] == "Algorithm Wizard" and header["level"] == 3
+    assert header["size"] == (tmp_path / "ada.json").stat().st_size
+
+    monkeypatch.setattr(store, "_scan", lambda: pytest.fail("save files were parsed"))
+    assert sorted(manager.get_saved_games()) == ["Ada", "Grace"]
+
+
+def test_json_store_rebuilds_stale_index(tmp_path):
+    """Test that saves added behind the store's back are picked up."""
+    store = JsonSaveStore(str(tmp_path))
+    SaveManager(str(tmp_path), store=store).save_game(make_character("Ada"))
+
+    record = make_character("Grace").to_dict()
+    record["timestamp"] = "2024-01-01T00:00:00"
+    (tmp_path / "grace.json").write_text(json.dumps(record))
+    index = tmp_path / ".meta" / "index.json"
+    os.utime(index, (0, 0))
+
+    assert sorted(store.list_saves()) == ["Ada", "Grace"]
+    assert "grace" in json.loads(index.read_text())["saves"]
+
+    index.unlink()
+    assert sorted(store.list_saves()) == ["Ada", "Grace"]
@@ -0,0 +1,117 @@
+import threading
+import pytest
+from src.ai.solution_evaluator import SolutionEvaluator
+from src.challenges.challenges.algorithms.sum_of_two import SumOfTwoChallenge
+
+
+def test_compile_plan_binds_arguments():
+    """Test that dict, list and scalar inputs are pre-bound correctly."""
+    plan = SolutionEvaluator.compile_plan([
+        {"input": {"a": 1, "b": 2}, "expected": 3},
+        {"input": [4, 5], "expected": 9},
+        {"input": 7, "expected": 7}
+    ])
+
+    assert plan.cases[0].kwargs == {"a": 1, "b": 2}
+    assert plan.cases[1].args == (4, 5)
+    assert plan.cases[2].args == (7,)
+
+
+def test_plan_comparators_match_list_semantics():
+    """Test that list outputs are compared regardless of order."""
+    plan = SolutionEvaluator.compile_plan([
+        {"input": [], "expected": [1, 0]},
+        {"input": [], "expected": [[1], "a"]}
+    ])
+
+    assert plan.cases[0].matches([0, 1]) is True
+    assert plan.cases[0].matches([0, 1, 1]) is False
+    assert plan.cases[0].matches((0, 1)) is False
+    assert plan.cases[1].matches([[1], "a"]) is True
+
+
+def test_evaluate_with_plan():
+    """Test that evaluating a plan reports per-case results."""
+    evaluator = SolutionEvaluator()
+    plan = SolutionEvaluator.compile_plan([
+        {"input": {"a": 1, "b": 2}, "expected": 3},
+        {"input": {"a": 1, "b": 1}, "expected": 3}
+    ])
+
+    results = evaluator.evaluate(lambda a, b: a + b, plan=plan)
+
+    assert results["success"] is False
+    assert [tc["passed"] for tc in results["test_cases"]] == [True, False]
+    assert results["test_cases"][1]["actual"] == 2
+
+
+def test_challenge_test_plan_is_cached():
+    """Test that a challenge's plan is reused until its test cases change."""
+    challenge = SumOfTwoChallenge()
+
+    plan = challenge.get_test_plan()
+    assert challenge.get_test_plan() is plan
+
+    challenge.test_cases.append({"input": {"a": 2, "b": 2}, "expected": 4})
+    assert challenge.get_test_plan() is not plan
+    assert len(challenge.get_test_plan().cases) == 4
+
+
+def test_challenge_test_plan_follows_edited_test_cases():
+    """Test that editing or replacing test cases recompiles the plan."""
+    challenge = SumOfTwoChallenge()
+    plan = challenge.get_test_plan()
+
+    challenge.test_cases[0]["expected"] = -1
+    assert challenge.get_test_plan() is not plan
+    assert challenge.verify_solution(lambda a, b: a + b)["success"] is False
+
+    # A new suite of equal length, whose dicts may reuse freed ids
+    challenge.test_cases = [dict(tc, expected=tc["input"]["a"] + tc["input"]["b"]) for tc in challenge.test_cases]
+    assert challenge.verify_solution(lambda a, b: a + b)["success"] is True
+
+
+def test_evaluate_captures_printed_output():
+    """Test that printing is captured per test case and capped."""
+    evaluator = SolutionEvaluator(max_output_bytes=10)
+
+    def chatty(a, b):
+        for i in range(100):
+            print(i)
+        return a + b
+
+    results = evaluator.evaluate(chatty, [
+        {"input": {"a": 1, "b": 2}, "expected": 3},
+        {"input": {"a": 2, "b": 2}, "expected": 4}
+    ])
+
+    assert results.success is True
+    output = results.test_cases[0].output
+    assert output.stdout == "\n97\n98\n99\n"
+    assert output.stdout_dropped == len("".join(f"{i}\n" for i in range(100))) - 10
+    assert output.stderr == ""
+
+
+def test_quiet_solution_has_no_output():
+    """Test that solutions that don't print carry no captured output."""
+    results = SolutionEvaluator().evaluate(lambda a, b: a + b, [{"input": {"a": 1, "b": 2}, "expected": 3}])
+
+    assert results.test_cases[0].output is None
+
+
+def test_other_threads_output_is_not_captured(capsys):
+    """Test that a background thread printing during an evaluation keeps its output."""
+    def background():
+        print("Autosaved.")
+
+    def solution(a, b):
+        thread = threading.Thread(target=background)
+        thread.start()
+        thread.join()
+        print("thinking")
+        return a + b
+
+    results = SolutionEvaluator().evaluate(solution, [{"input": {"a": 1, "b": 2}, "expected": 3}])
+
+    assert results.test_cases[0].output.stdout == "thinking\n"
+    assert capsys.readouterr().out == "Autosaved.\n"
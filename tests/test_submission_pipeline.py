@@ -0,0 +1,116 @@
+import pytest
+from src.challenges.submission_pipeline import SubmissionPipeline
+from src.challenges.challenges.algorithms.two_sum import TwoSumChallenge
+from src.challenges.challenges.data_structures.max_stack import MaxStackChallenge
+
+
+HELPER_FIRST = """
+import math
+
+def complement(target, num):
+    return target - num
+
+def two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if complement(target, num) in seen:
+            return [seen[complement(target, num)], i]
+        seen[num] = i
+    return []
+"""
+
+RENAMED = """
+def pair_finder(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+    return []
+
+def unused(x):
+    return pair_finder(x, 0)
+"""
+
+
+def test_pipeline_resolves_entry_point_from_ast():
+    """Test that the expected name, or a lone definition, is the entry point."""
+    pipeline = SubmissionPipeline()
+
+    result = pipeline.run(TwoSumChallenge(), HELPER_FIRST)
+    assert result["success"] is True
+    assert result["entry_point"] == "two_sum"
+
+    result = pipeline.run(TwoSumChallenge(), RENAMED.split("def unused")[0])
+    assert result["success"] is True
+    assert result["entry_point"] == "pair_finder"
+
+
+def test_pipeline_rejects_ambiguous_entry_point():
+    """Test that several definitions without the expected name are not guessed at."""
+    result = SubmissionPipeline().run(TwoSumChallenge(), RENAMED)
+
+    assert result["success"] is False
+    assert result["stage"] == "resolve"
+    assert "pair_finder, unused" in result["error"]
+    assert "two_sum" in result["error"]
+
+
+def test_pipeline_reports_failing_stage():
+    """Test that errors name the stage that failed."""
+    pipeline = SubmissionPipeline()
+
+    result = pipeline.run(TwoSumChallenge(), "def two_sum(nums, target)\n    return []")
+    assert result["success"] is False
+    assert result["stage"] == "parse"
+
+    result = pipeline.run(TwoSumChallenge(), "x = 1")
+    assert result["stage"] == "resolve"
+
+    result = pipeline.run(TwoSumChallenge(), "raise ValueError('boom')\ndef two_sum(nums, target):\n    return []")
+    assert result["stage"] == "load"
+
+
+def test_pipeline_caches_stages():
+    """Test that resubmitting the same code skips the cached stages."""
+    pipeline = SubmissionPipeline()
+    challenge = TwoSumChallenge()
+
+    first = pipeline.run(challenge, HELPER_FIRST)
+    assert first["cached_stages"] == []
+    assert set(first["stage_timings"]) == set(SubmissionPipeline.STAGES)
+
+    second = pipeline.run(challenge, HELPER_FIRST)
+    assert "compile" in second["cached_stages"]
+    assert "verify" in second["cached_stages"]
+    assert second["success"] is True
+
+    # Changing the test suite must not reuse the old result
+    challenge.test_cases.append({"input": {"nums": [1, 1], "target": 2}, "expected": [0, 1]})
+    third = pipeline.run(challenge, HELPER_FIRST)
+    assert "verify" not in third["cached_stages"]
+
+    pipeline.invalidate(challenge.id)
+    assert "verify" not in pipeline.run(challenge, HELPER_FIRST)["cached_stages"]
+
+
+def test_challenge_attempt_uses_pipeline():
+    """Test that Challenge.attempt loads class entry points and tracks stats."""
+    challenge = MaxStackChallenge()
+
+    result = challenge.attempt(challenge.solution)
+    assert result["success"] is True
+    assert result["entry_point"] == "MaxStack"
+    assert challenge.times_attempted == 1
+    assert challenge.times_completed == 1
+
+
+def test_suite_hash_is_reused_until_the_suite_changes():
+    """Test that the result cache key isn't rehashed on every run."""
+    challenge = TwoSumChallenge()
+
+    suite_hash = challenge.get_suite_hash()
+    assert challenge.get_suite_hash() is suite_hash
+
+    challenge.test_cases[0]["expected"] = [1, 0]
+    assert challenge.get_suite_hash() != suite_hash